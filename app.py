@@ -1,4 +1,4 @@
-from flask import Flask
+from flask import Flask, request
 from routes.auth import auth_bp
 from routes.user import user_bp
 from routes.project import project_bp
@@ -19,6 +19,14 @@ from routes.qc_rework import qc_rework_bp
 from routes.qc_history_user_based import qc_history_user_bp
 
 from scheduler import start_scheduler
+from config import get_db_connection, get_db_pool_stats, release_request_db_connection
+from utils.response import api_response
+from utils.api_log_utils import get_api_log_stats
+from utils.dropdown_cache import get_dropdown_cache_stats
+from utils.visibility import get_visibility_stats
+from utils.schema_registry import get_schema, reload_schema
+from utils.json_provider import init_json_provider
+from utils.compression import init_compression
 
 
 from flask_cors import CORS
@@ -27,6 +35,8 @@ import os
 
 
 app = Flask(__name__)
+app.teardown_appcontext(release_request_db_connection)
+JSON_PROVIDER_NAME = init_json_provider(app)
 
 BASE_URL =  ""
 # os.getenv("BASE_URL", "/")
@@ -58,7 +68,7 @@ app.register_blueprint(qc_history_user_bp, url_prefix="/qc_history_user")
 
 # CORS(app, supports_credentials=True)
 CORS(app, resources={r"/*": {"origins": "*"}})
-
+init_compression(app)
 
 @app.route("/")
 def home():
@@ -68,6 +78,57 @@ def home():
 def health():
     return "OK", 200
 
+@app.route("/health/db_pool")
+def health_db_pool():
+    return api_response(200, "DB pool stats", get_db_pool_stats())
+
+@app.route("/health/api_log")
+def health_api_log():
+    return api_response(200, "API log writer stats", get_api_log_stats())
+
+@app.route("/health/visibility_cache")
+def health_visibility_cache():
+    return api_response(200, "Visibility cache stats", get_visibility_stats())
+
+@app.route("/health/dropdown_cache")
+def health_dropdown_cache():
+    return api_response(200, "Dropdown cache stats", get_dropdown_cache_stats())
+
+@app.route("/health/schema")
+def health_schema():
+    # counts only: table / column names are not published
+    return api_response(200, "Schema capabilities", get_schema().counts())
+
+@app.route("/health/schema/reload", methods=["POST"])
+def health_schema_reload():
+    # run after applying a migration so schema-dependent code sees the new columns (admins only)
+    data = request.get_json(silent=True) or {}
+    logged_in_user_id = data.get("logged_in_user_id")
+    if not logged_in_user_id:
+        return api_response(400, "logged_in_user_id is required")
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT r.role_name
+            FROM tfs_user u
+            JOIN user_role r ON r.role_id = u.role_id
+            WHERE u.user_id = %s AND u.is_active = 1 AND u.is_delete = 1
+        """, (logged_in_user_id,))
+        role_row = cursor.fetchone()
+    finally:
+        cursor.close()
+        conn.close()
+
+    if not role_row:
+        return api_response(404, "User not found")
+    if (role_row["role_name"] or "").strip().lower() not in ("admin", "super admin"):
+        return api_response(403, "Only admins can reload the schema")
+
+    caps = reload_schema()
+    return api_response(200, "Schema capabilities reloaded", caps.counts())
+
 if __name__ == "__main__":
     # Start the scheduler
     start_scheduler()
@@ -0,0 +1,35 @@
+"""
+One-off / repair job: rebuild user_reporting_edge from tfs_user.project_manager_id,
+asst_manager_id and qa_id.
+
+    python backfill_user_reporting_edge.py
+
+Safe to re-run; the table is rebuilt inside a single transaction.
+"""
+from datetime import datetime
+
+from config import get_db_connection
+from utils.reporting_edges import rebuild_all_edges
+
+
+def run():
+    print(f"[{datetime.now()}] Rebuilding user_reporting_edge ...")
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        conn.start_transaction()
+        count = rebuild_all_edges(cursor)
+        conn.commit()
+        print(f"[{datetime.now()}] Done: {count} edges written")
+    except Exception as e:
+        conn.rollback()
+        print("Error:", str(e))
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,30 @@
+import statistics
+import time
+
+
+def timed(fn, repeat: int = 5) -> dict:
+    """Run fn() `repeat` times, return min / median / max in ms."""
+    samples = []
+    for _ in range(max(int(repeat), 1)):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        "min_ms": round(min(samples), 2),
+        "median_ms": round(statistics.median(samples), 2),
+        "max_ms": round(max(samples), 2),
+    }
+
+
+def explain(cursor, sql: str, params=()) -> list:
+    cursor.execute("EXPLAIN " + sql, params)
+    cols = [c[0] for c in cursor.description]
+    return [dict(zip(cols, row)) for row in cursor.fetchall()]
+
+
+def print_table(rows: list, columns: list) -> None:
+    widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    print("  ".join("-" * widths[c] for c in columns))
+    for r in rows:
+        print("  ".join(str(r.get(c, "")).ljust(widths[c]) for c in columns))
@@ -0,0 +1,166 @@
+"""
+/dashboard/filter: six passes vs. one pass over the tracker slice.
+
+Runs against the configured database (read-only). Builds the same WHERE
+clause dashboard_filter builds for --user (the logged-in user) and the
+given filters, then times:
+
+  before  DISTINCT users, top-500 trackers, summary, per-project billable,
+          QC summary, QC per user                  (the slice scanned 4x, QC days 2x)
+  after   grouped slice pass, user lookup by id, top-500 trackers,
+          QC days WITH ROLLUP                      (routes.dashboard helpers)
+
+    python -m benchmarks.dashboard_filter --user 1 --date-from 2026-09-01 --date-to 2026-09-30
+"""
+import argparse
+
+from config import get_db_connection
+from benchmarks.common import print_table, timed
+from routes.dashboard import (
+    DASHBOARD_BASE_FROM,
+    TRACKER_DT,
+    apply_qc_filters,
+    apply_tracker_filters,
+    build_in_clause_int,
+    get_dashboard_users,
+    get_subordinate_user_ids,
+    qc_aggregates,
+    tracker_slice_aggregates,
+)
+from utils.visibility import get_visibility
+
+
+class CountingCursor:
+    """Counts execute() calls on a wrapped cursor."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.queries = 0
+
+    def execute(self, *args, **kwargs):
+        self.queries += 1
+        return self._cursor.execute(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def build_filters(cursor, logged_in_user_id: int, data: dict):
+    vis = get_visibility(cursor, logged_in_user_id)
+    if not vis:
+        raise SystemExit(f"user {logged_in_user_id} not found")
+    visible = get_subordinate_user_ids(cursor, vis.role, logged_in_user_id)
+
+    where_sql = """
+        WHERE u.is_active=1 AND u.is_delete=1
+          AND twt.is_active=1
+          AND p.is_active=1
+    """
+    params: list = []
+    if visible is not None:
+        where_sql += f" AND twt.user_id {build_in_clause_int(visible, params)}"
+    where_sql, params = apply_tracker_filters(data, where_sql, params)
+
+    qc_where = "WHERE 1=1"
+    qc_params: list = []
+    if visible is not None:
+        qc_where += f" AND q.user_id {build_in_clause_int(visible, qc_params)}"
+    qc_where, qc_params = apply_qc_filters(data, qc_where, qc_params)
+    return vis.role, where_sql, params, qc_where, qc_params
+
+
+def top_trackers(cursor, where_sql, params):
+    cursor.execute(f"""
+        SELECT twt.tracker_id, twt.user_id, twt.actual_target, twt.tenure_target, u.user_name,
+               twt.project_id, p.project_name, twt.task_id, twt.production, twt.billable_hours,
+               twt.date_time, twt.tracker_file
+        {DASHBOARD_BASE_FROM}
+        {where_sql}
+        ORDER BY {TRACKER_DT} DESC
+        LIMIT 500
+    """, tuple(params))
+    return cursor.fetchall()
+
+
+def before(cursor, where_sql, params, qc_where, qc_params):
+    cursor.execute(f"""
+        SELECT DISTINCT u.user_id, u.user_name, u.user_email, u.user_number, u.user_address,
+               u.user_tenure, r.role_name AS role, d.designation, tm.team_name
+        {DASHBOARD_BASE_FROM}
+        LEFT JOIN user_role r ON r.role_id = u.role_id
+        LEFT JOIN user_designation d ON d.designation_id = u.designation_id
+        LEFT JOIN team tm ON tm.team_id = u.team_id
+        {where_sql}
+        ORDER BY u.user_id DESC
+    """, tuple(params))
+    cursor.fetchall()
+    top_trackers(cursor, where_sql, params)
+    cursor.execute(f"""
+        SELECT COUNT(DISTINCT twt.user_id), COUNT(DISTINCT twt.project_id), COUNT(DISTINCT twt.task_id),
+               COUNT(*), COALESCE(SUM(twt.production), 0), COALESCE(SUM(twt.billable_hours), 0)
+        {DASHBOARD_BASE_FROM}
+        {where_sql}
+    """, tuple(params))
+    cursor.fetchall()
+    cursor.execute(f"""
+        SELECT p.project_id, COALESCE(SUM(twt.billable_hours), 0)
+        {DASHBOARD_BASE_FROM}
+        {where_sql}
+        GROUP BY p.project_id
+    """, tuple(params))
+    cursor.fetchall()
+    cursor.execute(f"""
+        SELECT ROUND(SUM(q.qc_score) / NULLIF(COUNT(*), 0), 2), COUNT(*)
+        FROM temp_qc q {qc_where} AND q.qc_score IS NOT NULL
+    """, tuple(qc_params))
+    cursor.fetchall()
+    cursor.execute(f"""
+        SELECT q.user_id, ROUND(SUM(q.qc_score) / NULLIF(COUNT(*), 0), 2), COUNT(*)
+        FROM temp_qc q {qc_where} AND q.qc_score IS NOT NULL
+        GROUP BY q.user_id
+    """, tuple(qc_params))
+    cursor.fetchall()
+
+
+def after(cursor, where_sql, params, qc_where, qc_params):
+    _, user_ids, _ = tracker_slice_aggregates(cursor, where_sql, params)
+    get_dashboard_users(cursor, user_ids)
+    top_trackers(cursor, where_sql, params)
+    qc_aggregates(cursor, qc_where, qc_params)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user", type=int, required=True, help="logged_in_user_id")
+    parser.add_argument("--date-from")
+    parser.add_argument("--date-to")
+    parser.add_argument("--project-id", type=int)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = {"date_from": args.date_from, "date_to": args.date_to, "project_id": args.project_id}
+
+    conn = get_db_connection()
+    raw = conn.cursor(dictionary=True)
+    try:
+        role, where_sql, params, qc_where, qc_params = build_filters(raw, args.user, data)
+        print(f"user {args.user} ({role}), filters {data}")
+
+        results = []
+        for label, fn in (("before", before), ("after", after)):
+            counter = CountingCursor(raw)
+            fn(counter, where_sql, params, qc_where, qc_params)
+            results.append({
+                "case": label,
+                "queries": counter.queries,
+                **timed(lambda fn=fn: fn(raw, where_sql, params, qc_where, qc_params), args.repeat),
+            })
+
+        print_table(results, ["case", "queries", "min_ms", "median_ms", "max_ms"])
+    finally:
+        raw.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+stdlib vs. orjson: encoding api_response payloads.
+
+Builds /tracker/view-shaped rows (ints, strings, Decimal, datetime, None)
+and times both JSON providers on the same Flask app, checking that they
+decode to identical data. No database needed.
+
+    python -m benchmarks.json_encode --rows 20000
+"""
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from benchmarks.common import print_table, timed
+from utils.json_provider import OrjsonProvider, orjson
+
+
+def tracker_rows(n: int) -> list[dict]:
+    start = datetime(2026, 1, 1)
+    rows = []
+    for i in range(n):
+        production = Decimal(f"{random.uniform(0, 400):.2f}")
+        tenure_target = Decimal(f"{random.choice([50, 80, 100, 120]):.2f}")
+        dt = start + timedelta(minutes=random.randint(0, 500_000))
+        rows.append({
+            "tracker_id": i + 1,
+            "user_id": random.randint(1, 500),
+            "agent_id": random.randint(1, 500),
+            "project_id": random.randint(1, 50),
+            "task_id": random.randint(1, 400),
+            "user_name": f"Agent {i % 500}",
+            "user_email": f"agent{i % 500}@example.com",
+            "user_tenure": random.choice(["0-3", "3-6", "6+"]),
+            "project_name": f"Project {i % 50}",
+            "task_name": f"Task {i % 400}",
+            "team_name": random.choice(["Alpha", "Beta", None]),
+            "shift": random.choice(["day", "night", None]),
+            "production": production,
+            "tenure_target": tenure_target,
+            "billable_hours": production / tenure_target,
+            "qc_percentage": Decimal("10.00"),
+            "date_time": dt.strftime("%Y-%m-%d %H:%M:%S"),
+            "created_date": dt,
+            "updated_date": dt + timedelta(hours=1),
+            "tracker_file": None if i % 3 else f"https://files.example.com/{i}.xlsx",
+            "is_active": 1,
+            "assistant_manager_name": "Manager A,Manager B",
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("orjson is not installed; nothing to compare")
+        return
+
+    app = Flask(__name__)
+    payload = {"status": 200, "message": "Trackers fetched successfully", "data": {"trackers": tracker_rows(args.rows)}}
+    providers = [("stdlib", DefaultJSONProvider(app)), ("orjson", OrjsonProvider(app))]
+
+    results = []
+    decoded = {}
+    with app.app_context():
+        for name, provider in providers:
+            app.json = provider
+            body = provider.response(payload).get_data()
+            decoded[name] = json.loads(body)
+            results.append({
+                "provider": name,
+                "bytes": len(body),
+                **timed(lambda: provider.response(payload).get_data(), args.repeat),
+            })
+
+    print(f"{args.rows:,} tracker rows, identical output: {decoded['stdlib'] == decoded['orjson']}")
+    print_table(results, ["provider", "bytes", "min_ms", "median_ms", "max_ms"])
+
+
+if __name__ == "__main__":
+    main()
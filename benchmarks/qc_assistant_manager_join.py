@@ -0,0 +1,195 @@
+"""
+LIKE join vs. edge lookup: assistant managers on the QC history page.
+
+Builds synthetic tfs_user / user_reporting_edge / qc_records copies, then
+compares the old
+
+    LEFT JOIN tfs_user am ON u.asst_manager_id LIKE CONCAT('%', am.user_id, '%')
+
+(a scan of tfs_user per QC row, which also fans out: user 1 matches 11, 12 ...)
+with what view_qc_history_user_based does now - one page of qc_records, then
+one indexed user_reporting_edge lookup for the page's agents.
+
+    python -m benchmarks.qc_assistant_manager_join --users 5000 --qc-rows 200000
+"""
+import argparse
+import json
+import random
+
+from config import get_db_connection
+from benchmarks.common import explain, print_table, timed
+
+USER_TABLE = "bench_tfs_user"
+EDGE_TABLE = "bench_user_reporting_edge"
+QC_TABLE = "bench_qc_records"
+
+CREATE_SQL = [
+    f"""
+    CREATE TABLE {USER_TABLE} (
+        user_id INT PRIMARY KEY,
+        user_name VARCHAR(100) NOT NULL,
+        asst_manager_id TEXT NULL
+    )
+    """,
+    f"""
+    CREATE TABLE {EDGE_TABLE} (
+        manager_id INT NOT NULL,
+        user_id INT NOT NULL,
+        relation ENUM('project_manager','asst_manager','qa') NOT NULL,
+        PRIMARY KEY (manager_id, relation, user_id),
+        KEY idx_ure_user (user_id, relation)
+    )
+    """,
+    f"""
+    CREATE TABLE {QC_TABLE} (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT NOT NULL,
+        qc_score DECIMAL(5,2) NULL,
+        KEY idx_bqr_user (user_id)
+    )
+    """,
+]
+
+
+def populate(conn, users: int, managers: int, qc_rows: int, batch: int = 5000) -> None:
+    cursor = conn.cursor()
+    user_rows, edge_rows = [], []
+    for uid in range(1, users + 1):
+        ams = random.sample(range(1, managers + 1), k=random.randint(1, 2)) if uid > managers else []
+        user_rows.append((uid, f"user_{uid}", json.dumps(ams) if ams else None))
+        edge_rows.extend((am, uid, "asst_manager") for am in ams)
+
+    for i in range(0, len(user_rows), batch):
+        cursor.executemany(
+            f"INSERT INTO {USER_TABLE} (user_id, user_name, asst_manager_id) VALUES (%s, %s, %s)",
+            user_rows[i:i + batch],
+        )
+    for i in range(0, len(edge_rows), batch):
+        cursor.executemany(
+            f"INSERT INTO {EDGE_TABLE} (manager_id, user_id, relation) VALUES (%s, %s, %s)",
+            edge_rows[i:i + batch],
+        )
+
+    done = 0
+    while done < qc_rows:
+        n = min(batch, qc_rows - done)
+        cursor.executemany(
+            f"INSERT INTO {QC_TABLE} (user_id, qc_score) VALUES (%s, %s)",
+            [(random.randint(managers + 1, users), round(random.uniform(60, 100), 2)) for _ in range(n)],
+        )
+        done += n
+    conn.commit()
+
+    for table in (USER_TABLE, EDGE_TABLE, QC_TABLE):
+        cursor.execute(f"ANALYZE TABLE {table}")
+        cursor.fetchall()
+    cursor.close()
+
+
+def like_join_sql(page_size: int) -> tuple[str, list]:
+    return f"""
+        SELECT qr.*, u.user_name AS agent_name, am.user_name AS assistant_manager_name
+        FROM {QC_TABLE} qr
+        LEFT JOIN {USER_TABLE} u ON u.user_id = qr.user_id
+        LEFT JOIN {USER_TABLE} am ON u.asst_manager_id LIKE CONCAT('%', am.user_id, '%')
+        ORDER BY qr.id DESC
+        LIMIT %s
+    """, [page_size]
+
+
+def page_sql(page_size: int) -> tuple[str, list]:
+    return f"""
+        SELECT qr.*, u.user_id AS agent_id, u.user_name AS agent_name
+        FROM {QC_TABLE} qr
+        LEFT JOIN {USER_TABLE} u ON u.user_id = qr.user_id
+        ORDER BY qr.id DESC
+        LIMIT %s
+    """, [page_size]
+
+
+def edge_lookup_sql(agent_ids: list) -> tuple[str, list]:
+    """Same shape as utils.reporting_edges.get_manager_map, on the bench tables."""
+    placeholders = ",".join(["%s"] * len(agent_ids)) or "NULL"
+    return f"""
+        SELECT ure.user_id AS subordinate_id, m.user_id, m.user_name
+        FROM {EDGE_TABLE} ure
+        JOIN {USER_TABLE} m ON m.user_id = ure.manager_id
+        WHERE ure.relation = %s AND ure.user_id IN ({placeholders})
+        ORDER BY ure.user_id, m.user_id
+    """, ["asst_manager", *agent_ids]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--managers", type=int, default=60)
+    parser.add_argument("--qc-rows", type=int, default=200_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic tables afterwards")
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        for table in (QC_TABLE, EDGE_TABLE, USER_TABLE):
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        for sql in CREATE_SQL:
+            cursor.execute(sql)
+        print(f"Populating {args.users:,} users / {args.qc_rows:,} QC rows ...")
+        populate(conn, args.users, args.managers, args.qc_rows)
+
+        results = []
+
+        sql, params = like_join_sql(args.page_size)
+        plan = explain(cursor, sql, params)
+
+        def run_like():
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+        distinct_qc = len({r[0] for r in run_like()})
+        results.append({
+            "case": "LIKE join",
+            "am_access": next((p.get("type") for p in plan if p.get("table") == "am"), None),
+            "am_key": next((p.get("key") for p in plan if p.get("table") == "am"), None),
+            "rows_returned": len(run_like()),
+            "qc_records": distinct_qc,
+            **timed(run_like, args.repeat),
+        })
+
+        page, page_params = page_sql(args.page_size)
+
+        def run_edges():
+            cursor.execute(page, page_params)
+            rows = cursor.fetchall()
+            agent_ids = sorted({r[-2] for r in rows if r[-2] is not None})
+            lookup, lookup_params = edge_lookup_sql(agent_ids)
+            cursor.execute(lookup, lookup_params)
+            cursor.fetchall()
+            return rows, agent_ids
+
+        rows, agent_ids = run_edges()
+        lookup, lookup_params = edge_lookup_sql(agent_ids)
+        plan = explain(cursor, lookup, lookup_params)
+        results.append({
+            "case": "page + edge lookup",
+            "am_access": next((p.get("type") for p in plan if p.get("table") == "ure"), None),
+            "am_key": next((p.get("key") for p in plan if p.get("table") == "ure"), None),
+            "rows_returned": len(rows),
+            "qc_records": len(rows),
+            **timed(run_edges, args.repeat),
+        })
+
+        print_table(results, ["case", "am_access", "am_key", "rows_returned", "qc_records",
+                              "min_ms", "median_ms", "max_ms"])
+    finally:
+        if not args.keep:
+            for table in (QC_TABLE, EDGE_TABLE, USER_TABLE):
+                cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Scan vs. range: task_work_tracker date filters.
+
+Builds a synthetic copy of the tracker date layout (TEXT date_time + stored
+DATETIME date_time_dt + composite indexes), then compares the old
+function-wrapped predicates with the half-open ranges from utils.tracker_dates.
+
+    python -m benchmarks.tracker_date_filters --rows 1000000
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+
+from config import get_db_connection
+from benchmarks.common import explain, print_table, timed
+from utils.tracker_dates import tracker_day_sql, tracker_month_sql, tracker_range_sql
+
+TABLE = "bench_task_work_tracker"
+
+CREATE_SQL = f"""
+    CREATE TABLE {TABLE} (
+        tracker_id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT NOT NULL,
+        project_id INT NOT NULL,
+        production DECIMAL(10,2) NOT NULL DEFAULT 0,
+        date_time TEXT NOT NULL,
+        date_time_dt DATETIME AS (CAST(date_time AS DATETIME)) STORED,
+        KEY idx_twt_user_dt (user_id, date_time_dt),
+        KEY idx_twt_project_dt (project_id, date_time_dt),
+        KEY idx_twt_dt (date_time_dt)
+    )
+"""
+
+
+def populate(conn, rows: int, users: int, projects: int, days: int, batch: int = 5000) -> None:
+    cursor = conn.cursor()
+    start = datetime.now() - timedelta(days=days)
+    span = days * 86400
+    insert_sql = f"INSERT INTO {TABLE} (user_id, project_id, production, date_time) VALUES (%s, %s, %s, %s)"
+    done = 0
+    while done < rows:
+        n = min(batch, rows - done)
+        chunk = [
+            (
+                random.randint(1, users),
+                random.randint(1, projects),
+                round(random.uniform(0, 50), 2),
+                (start + timedelta(seconds=random.randint(0, span))).strftime("%Y-%m-%d %H:%M:%S"),
+            )
+            for _ in range(n)
+        ]
+        cursor.executemany(insert_sql, chunk)
+        conn.commit()
+        done += n
+    cursor.execute(f"ANALYZE TABLE {TABLE}")
+    cursor.fetchall()
+    cursor.close()
+
+
+def cases(today: datetime) -> list:
+    day = today.strftime("%Y-%m-%d")
+    week_from = (today - timedelta(days=7)).strftime("%Y-%m-%d")
+    base = f"SELECT COUNT(*), SUM(production) FROM {TABLE} twt WHERE twt.user_id = %s"
+
+    out = []
+
+    out.append(("day / DATE(CAST())", base + " AND DATE(CAST(twt.date_time AS DATETIME)) = %s", [7, day]))
+    p = [7]
+    out.append(("day / range", base + tracker_day_sql(p, day), p))
+
+    out.append((
+        "month / YEAR*100+MONTH",
+        base + " AND YEAR(CAST(twt.date_time AS DATETIME))*100 + MONTH(CAST(twt.date_time AS DATETIME)) = %s",
+        [7, today.year * 100 + today.month],
+    ))
+    out.append((
+        "month / DATE_FORMAT",
+        base + " AND DATE_FORMAT(twt.date_time, '%b%Y') = %s",
+        [7, today.strftime("%b%Y")],
+    ))
+    p = [7]
+    out.append(("month / range", base + tracker_month_sql(p, today.year, today.month), p))
+
+    out.append((
+        "7 days / CAST >= <=",
+        base + " AND CAST(twt.date_time AS DATETIME) >= %s AND CAST(twt.date_time AS DATETIME) <= %s",
+        [7, week_from + " 00:00:00", day + " 23:59:59"],
+    ))
+    p = [7]
+    out.append(("7 days / range", base + tracker_range_sql(p, week_from, day), p))
+
+    project_base = f"SELECT COUNT(*) FROM {TABLE} twt WHERE twt.project_id = %s"
+    out.append((
+        "project month / DATE_FORMAT",
+        project_base + " AND DATE_FORMAT(twt.date_time, '%b%Y') = %s",
+        [3, today.strftime("%b%Y")],
+    ))
+    p = [3]
+    out.append(("project month / range", project_base + tracker_month_sql(p, today.year, today.month), p))
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic table afterwards")
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        cursor.execute(CREATE_SQL)
+        print(f"Populating {TABLE} with {args.rows:,} rows ...")
+        populate(conn, args.rows, args.users, args.projects, args.days)
+
+        results = []
+        for label, sql, params in cases(datetime.now()):
+            plan = explain(cursor, sql, params)[0]
+
+            def run(sql=sql, params=params):
+                cursor.execute(sql, params)
+                cursor.fetchall()
+
+            results.append({
+                "case": label,
+                "type": plan.get("type"),
+                "key": plan.get("key"),
+                "rows_examined": plan.get("rows"),
+                **timed(run, args.repeat),
+            })
+
+        print_table(results, ["case", "type", "key", "rows_examined", "min_ms", "median_ms", "max_ms"])
+    finally:
+        if not args.keep:
+            cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
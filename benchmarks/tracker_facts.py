@@ -0,0 +1,95 @@
+"""
+Monthly aggregates: task_work_tracker vs. tracker_daily_fact.
+
+Runs against the configured database (read-only; fill the fact table first
+with rebuild_tracker_daily_fact.py). For one month, times the per-user and
+per-project totals the dashboard and the monthly tracker lists read, from
+the raw trackers and from the fact table, and checks both give the same
+numbers.
+
+    python -m benchmarks.tracker_facts --month 2026-09
+"""
+import argparse
+from datetime import datetime
+
+from config import get_db_connection
+from benchmarks.common import print_table, timed
+from utils.tracker_dates import tracker_month_sql
+from utils.tracker_facts import FACT_TABLE, fact_month_sql
+
+QUERIES = {
+    "per user": (
+        """
+        SELECT twt.user_id AS k,
+               SUM(COALESCE(twt.production, 0) / NULLIF(twt.tenure_target, 0)) AS v,
+               COUNT(*) AS n
+        FROM task_work_tracker twt
+        WHERE twt.is_active = 1 {raw_month}
+        GROUP BY twt.user_id
+        """,
+        f"""
+        SELECT f.user_id AS k, SUM(f.tenure_billable_hours) AS v, SUM(f.tracker_count) AS n
+        FROM {FACT_TABLE} f
+        WHERE 1=1 {{fact_month}}
+        GROUP BY f.user_id
+        """,
+    ),
+    "per project": (
+        """
+        SELECT twt.project_id AS k,
+               SUM(CASE WHEN twt.billable_hours REGEXP '^[0-9]+(\\\\.[0-9]+)?$'
+                        THEN CAST(twt.billable_hours AS DECIMAL(12,2)) ELSE 0 END) AS v,
+               COUNT(*) AS n
+        FROM task_work_tracker twt
+        WHERE twt.is_active = 1 {raw_month}
+        GROUP BY twt.project_id
+        """,
+        f"""
+        SELECT f.project_id AS k, SUM(f.billable_hours) AS v, SUM(f.tracker_count) AS n
+        FROM {FACT_TABLE} f
+        WHERE 1=1 {{fact_month}}
+        GROUP BY f.project_id
+        """,
+    ),
+}
+
+
+def run_query(cursor, sql, params):
+    cursor.execute(sql, tuple(params))
+    return {r["k"]: (round(float(r["v"] or 0), 2), int(r["n"])) for r in cursor.fetchall()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--month", required=True, help="YYYY-MM")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    month = datetime.strptime(args.month, "%Y-%m")
+
+    raw_params, fact_params = [], []
+    raw_month = tracker_month_sql(raw_params, month.year, month.month)
+    fact_month = fact_month_sql(fact_params, month.year, month.month)
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        results = []
+        for label, (raw_sql, fact_sql) in QUERIES.items():
+            raw_sql = raw_sql.format(raw_month=raw_month)
+            fact_sql = fact_sql.format(fact_month=fact_month)
+            same = run_query(cursor, raw_sql, raw_params) == run_query(cursor, fact_sql, fact_params)
+            for source, sql, params in (("trackers", raw_sql, raw_params), ("facts", fact_sql, fact_params)):
+                results.append({
+                    "query": label,
+                    "source": source,
+                    "same": same,
+                    **timed(lambda sql=sql, params=params: run_query(cursor, sql, params), args.repeat),
+                })
+        print_table(results, ["query", "source", "same", "min_ms", "median_ms", "max_ms"])
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
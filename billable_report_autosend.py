@@ -11,6 +11,9 @@ from email.mime.multipart import MIMEMultipart
 import logging
 from collections import defaultdict
 
+from utils.fanout import run_parallel
+from utils.tracker_dates import month_key
+
 
 # -------------------------------
 # CONFIG
@@ -37,6 +40,10 @@ CC_RECIPIENTS = [
 ]
 
 
+# seconds the parallel report queries may take together (a cron job, so generous)
+REPORT_QUERY_DEADLINE = float(os.getenv("REPORT_QUERY_DEADLINE", "300"))
+
+
 LOG_FILE = Path(__file__).resolve().parent / "daily_tracker_report.log"
 
 logging.basicConfig(
@@ -77,7 +84,7 @@ def fetch_data():
         # TEST DATE
         # report_date = datetime.strptime("2026-03-21", "%Y-%m-%d").date()
         
-        report_month = report_date.strftime("%b%Y").upper()
+        report_month = month_key(report_date)  # yyyymm, user_monthly_tracker.month_key
 
         logging.info(f"Fetching data for report date {report_date}")
 
@@ -109,7 +116,7 @@ def fetch_data():
             LEFT JOIN user_monthly_tracker umt
                 ON umt.user_id = u.user_id
                 AND umt.is_active=1
-                AND umt.month_year=%s
+                AND umt.month_key=%s
             WHERE u.is_delete = 1
             AND r.role_name='Agent'
             AND t.team_name IN ('A','B')
@@ -142,55 +149,60 @@ def fetch_data():
 
         month_start = report_date.replace(day=1)
 
+        # Every query below only needs `users`: run them side by side, each on
+        # its own connection (utils/fanout.py); the report costs the slowest one.
+
         # -------------------------
         # DAILY HOURS
         # -------------------------
 
-        cursor.execute(
-            f"""
-            SELECT user_id,
-            SUM(production / NULLIF(tenure_target,0)) AS worked_hours
-            FROM task_work_tracker
-            WHERE DATE(date_time)=%s
-            AND user_id IN ({in_ph})
-            AND is_active=1
-            GROUP BY user_id
-            """,
-            [report_date] + user_ids,
-        )
+        def load_daily(c):
+            c.execute(
+                f"""
+                SELECT user_id,
+                SUM(production / NULLIF(tenure_target,0)) AS worked_hours
+                FROM task_work_tracker
+                WHERE DATE(date_time)=%s
+                AND user_id IN ({in_ph})
+                AND is_active=1
+                GROUP BY user_id
+                """,
+                [report_date] + user_ids,
+            )
+            return {r["user_id"]: float(r["worked_hours"] or 0) for r in c.fetchall()}
 
-        daily_map = {
-            r["user_id"]: float(r["worked_hours"] or 0) for r in cursor.fetchall()
-        }
-        
         # -------------------------
-        # LATEST QC DATE (GLOBAL) - Fetch before filtering
+        # LATEST QC DATE (GLOBAL) + AVG QC up to it
         # -------------------------
 
-        cursor.execute(
-            """
-            SELECT MAX(DATE(date_of_file_submission)) AS latest_qc_date
-            FROM qc_records
-            WHERE qc_score IS NOT NULL AND DATE(date_of_file_submission) < %s
-            """,
-            (report_date,)
-        )
-
-        row = cursor.fetchone()
-        latest_qc_date = row["latest_qc_date"]
+        def load_avg_qc(c):
+            c.execute(
+                """
+                SELECT DATE(MAX(date_of_file_submission)) AS latest_qc_date
+                FROM qc_records
+                WHERE qc_score IS NOT NULL AND date_of_file_submission < %s
+                """,
+                (report_date,)
+            )
+            latest_qc_date = (c.fetchone() or {}).get("latest_qc_date")
+            if not latest_qc_date:
+                return {}
 
-        qc_user_ids = set()
-        if latest_qc_date:
-            cursor.execute(
+            c.execute(
                 f"""
-                SELECT DISTINCT agent_id AS user_id
-                FROM qc_records
-                WHERE DATE(date_of_file_submission) = %s
-                AND agent_id IN ({in_ph})
+                    SELECT
+                        qr.agent_id AS user_id,
+                        AVG(qr.qc_score) AS avg_qc
+                    FROM qc_records qr
+                    WHERE qr.qc_score IS NOT NULL
+                    AND qr.date_of_file_submission >= %s
+                    AND qr.date_of_file_submission < %s
+                    AND qr.agent_id IN ({in_ph})
+                    GROUP BY qr.agent_id
                 """,
-                [latest_qc_date] + user_ids,
+                [month_start, latest_qc_date + timedelta(days=1)] + user_ids,
             )
-            qc_user_ids = {r["user_id"] for r in cursor.fetchall()}
+            return {r["user_id"]: float(r["avg_qc"] or 0) for r in c.fetchall()}
 
         # Keep all users including absent and exited ones
 
@@ -198,140 +210,119 @@ def fetch_data():
         # MTD HOURS
         # -------------------------
 
-        cursor.execute(
-            f"""
-            SELECT user_id,
-            SUM(production / NULLIF(tenure_target,0)) AS mtd_hours
-            FROM task_work_tracker
-            WHERE DATE(date_time) BETWEEN %s AND %s
-            AND user_id IN ({in_ph})
-            AND is_active=1
-            GROUP BY user_id
-            """,
-            [month_start, report_date] + user_ids,
-        )
-
-        mtd_map = {r["user_id"]: float(r["mtd_hours"] or 0) for r in cursor.fetchall()}
+        def load_mtd(c):
+            c.execute(
+                f"""
+                SELECT user_id,
+                SUM(production / NULLIF(tenure_target,0)) AS mtd_hours
+                FROM task_work_tracker
+                WHERE DATE(date_time) BETWEEN %s AND %s
+                AND user_id IN ({in_ph})
+                AND is_active=1
+                GROUP BY user_id
+                """,
+                [month_start, report_date] + user_ids,
+            )
+            return {r["user_id"]: float(r["mtd_hours"] or 0) for r in c.fetchall()}
 
         # -------------------------
         # DAYS WORKED
         # -------------------------
 
-        cursor.execute(
-            f"""
-            SELECT 
-                user_id,
-                SUM(day_value) AS days_worked
-            FROM (
+        def load_days_worked(c):
+            c.execute(
+                f"""
                 SELECT 
-                    twt.user_id,
-                    DATE(twt.date_time) AS work_date,
-                    CASE
-                        WHEN MAX(tq.assigned_hours) = 4.5 THEN 0.5
-                        WHEN MAX(tq.assigned_hours) > 0 THEN 1
-                        ELSE 0
-                    END AS day_value
-                FROM task_work_tracker twt
-                INNER JOIN temp_qc tq
-                    ON tq.user_id = twt.user_id
-                    AND DATE(tq.date) = DATE(twt.date_time)
-                WHERE DATE(twt.date_time) BETWEEN %s AND %s
-                AND twt.user_id IN ({in_ph})
-                AND twt.is_active = 1
-                GROUP BY twt.user_id, DATE(twt.date_time)
-            ) t
-            GROUP BY user_id
-            """,
-            [month_start, report_date] + user_ids,
-        )
-
-        days_worked_map = {
-            r["user_id"]: float(r["days_worked"]) for r in cursor.fetchall()
-        }
-
-        qc_map = {}
-
-        # Get QC scores for report date
-        cursor.execute(
-            f"""
-            SELECT 
-                dwc.user_id,
-                qr.qc_score,
-                %s AS qc_date
-            FROM (
-                SELECT DISTINCT user_id
-                FROM tfs_user
-                WHERE user_id IN ({in_ph})
-            ) dwc
-            LEFT JOIN (
-                SELECT
-                    agent_id,
-                    ROUND(AVG(qc_score), 2) AS qc_score
-                FROM qc_records
-                WHERE DATE(date_of_file_submission) = %s
-                AND agent_id IN ({in_ph})
-                GROUP BY agent_id
-            ) qr
-                ON qr.agent_id = dwc.user_id
-            """,
-            [report_date] + user_ids + [report_date] + user_ids,
-        )
-
-        qc_map = {r["user_id"]: r for r in cursor.fetchall()}
-
-        avg_qc_map = {}
+                    user_id,
+                    SUM(day_value) AS days_worked
+                FROM (
+                    SELECT 
+                        twt.user_id,
+                        DATE(twt.date_time) AS work_date,
+                        CASE
+                            WHEN MAX(tq.assigned_hours) = 4.5 THEN 0.5
+                            WHEN MAX(tq.assigned_hours) > 0 THEN 1
+                            ELSE 0
+                        END AS day_value
+                    FROM task_work_tracker twt
+                    INNER JOIN temp_qc tq
+                        ON tq.user_id = twt.user_id
+                        AND tq.date = DATE(twt.date_time)
+                    WHERE DATE(twt.date_time) BETWEEN %s AND %s
+                    AND twt.user_id IN ({in_ph})
+                    AND twt.is_active = 1
+                    GROUP BY twt.user_id, DATE(twt.date_time)
+                ) t
+                GROUP BY user_id
+                """,
+                [month_start, report_date] + user_ids,
+            )
+            return {r["user_id"]: float(r["days_worked"]) for r in c.fetchall()}
 
-        if latest_qc_date:
+        # -------------------------
+        # QC SCORES (REPORT DATE)
+        # -------------------------
 
-            cursor.execute(
+        def load_qc(c):
+            c.execute(
                 f"""
-                    SELECT 
-                        dwc.user_id,
-                        AVG(qr.qc_score) AS avg_qc
-                    FROM (
-                        SELECT DISTINCT user_id
-                        FROM tfs_user
-                        WHERE user_id IN ({in_ph})
-                    ) dwc
-                    LEFT JOIN (
-                        SELECT
-                            agent_id,
-                            qc_score
-                        FROM qc_records
-                        WHERE qc_score IS NOT NULL
-                        AND DATE(date_of_file_submission) BETWEEN %s AND %s
-                        AND agent_id IN ({in_ph})
-                    ) qr
-                        ON qr.agent_id = dwc.user_id
-                    WHERE qr.qc_score IS NOT NULL
-                    GROUP BY dwc.user_id
+                SELECT
+                    u.user_id,
+                    qr.qc_score,
+                    %s AS qc_date
+                FROM tfs_user u
+                LEFT JOIN (
+                    SELECT
+                        agent_id,
+                        ROUND(AVG(qc_score), 2) AS qc_score
+                    FROM qc_records
+                    WHERE date_of_file_submission >= %s AND date_of_file_submission < %s
+                    AND agent_id IN ({in_ph})
+                    GROUP BY agent_id
+                ) qr
+                    ON qr.agent_id = u.user_id
+                WHERE u.user_id IN ({in_ph})
                 """,
-                user_ids + [month_start, latest_qc_date] + user_ids,
+                [report_date, report_date, report_date + timedelta(days=1)] + user_ids + user_ids,
             )
+            return {r["user_id"]: r for r in c.fetchall()}
 
-            avg_qc_map = {
-                r["user_id"]: float(r["avg_qc"] or 0)
-                for r in cursor.fetchall()
-            }
-                
         # -------------------------
         # ASSIGNED HOURS (REPORT DATE)
         # -------------------------
 
-        cursor.execute(
-            f"""
-            SELECT user_id, assigned_hours
-            FROM temp_qc
-            WHERE DATE(date) = %s
-            AND user_id IN ({in_ph})
-            """,
-            [report_date] + user_ids,
+        def load_assigned(c):
+            c.execute(
+                f"""
+                SELECT user_id, assigned_hours
+                FROM temp_qc
+                WHERE date = %s
+                AND assigned_hours IS NOT NULL
+                AND user_id IN ({in_ph})
+                """,
+                [report_date] + user_ids,
+            )
+            return {r["user_id"]: float(r["assigned_hours"] or 0) for r in c.fetchall()}
+
+        results = run_parallel(
+            {
+                "daily": load_daily,
+                "avg_qc": load_avg_qc,
+                "mtd": load_mtd,
+                "days_worked": load_days_worked,
+                "qc": load_qc,
+                "assigned": load_assigned,
+            },
+            cursor=cursor,
+            connect=get_db_connection,
+            deadline=REPORT_QUERY_DEADLINE,
         )
-
-        assigned_map = {
-            r["user_id"]: float(r["assigned_hours"] or 0)
-            for r in cursor.fetchall()
-        }
+        daily_map = results["daily"]
+        avg_qc_map = results["avg_qc"]
+        mtd_map = results["mtd"]
+        days_worked_map = results["days_worked"]
+        qc_map = results["qc"]
+        assigned_map = results["assigned"]
 
         # -------------------------
         # CALCULATIONS
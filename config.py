@@ -1,9 +1,12 @@
-import mysql.connector
 import os, uuid
+import threading
+from contextlib import contextmanager
 from dotenv import load_dotenv
 import cloudinary
 from cloudinary.uploader import upload
 from cloudinary.api import resource
+from flask import g, has_app_context
+from utils.db_pool import ConnectionPool, SharedConnection
 
 load_dotenv()
 
@@ -66,8 +69,22 @@ else:
         print("A new key will be generated. Please update your .env file.")
         
         
-def get_db_connection():
-    return mysql.connector.connect(
+# DB connection pool (one pool per gunicorn worker process)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1").lower() in ("1", "true", "yes")
+# One connection per Flask request, shared by routes/helpers/log_api_call
+DB_REQUEST_SCOPED = os.getenv("DB_REQUEST_SCOPED", "1").lower() in ("1", "true", "yes")
+
+_db_pool = None
+_db_pool_pid = None
+_db_pool_lock = threading.Lock()
+
+
+def _db_connect_kwargs():
+    return dict(
         host=os.getenv("DB_HOST"),  # Use env var or default to 'localhost'
         port=int(os.getenv("DB_PORT", 3306)),  # Use env var or default to 3306
         user=os.getenv("DB_USERNAME"),  # Use env var or default to 'root'
@@ -75,8 +92,77 @@ def get_db_connection():
         database=os.getenv(
             "DB_DATABASE", "tfs_hrms"
         ),  # Use env var or default to 'tfs_hrms'
+        # buffered cursors: a helper that reads one row of a multi-row result
+        # must not leave "Unread result found" behind on a shared connection
+        buffered=True,
     )
-    
+
+
+def get_db_pool() -> ConnectionPool:
+    """
+    Lazily builds the pool for the current process.
+    Re-created after fork so gunicorn workers never share sockets with the master.
+    """
+    global _db_pool, _db_pool_pid
+    pid = os.getpid()
+    if _db_pool is not None and _db_pool_pid == pid:
+        return _db_pool
+
+    with _db_pool_lock:
+        if _db_pool is None or _db_pool_pid != pid:
+            _db_pool = ConnectionPool(
+                _db_connect_kwargs(),
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_POOL_MAX_OVERFLOW,
+                timeout=DB_POOL_TIMEOUT,
+                recycle=DB_POOL_RECYCLE,
+                pre_ping=DB_POOL_PRE_PING,
+            )
+            _db_pool_pid = pid
+    return _db_pool
+
+
+def get_db_connection():
+    """
+    Returns a pooled connection. Same API as before: callers use cursor/commit/
+    rollback as usual and conn.close() hands the connection back to the pool.
+
+    Inside a Flask request every call returns a handle on the SAME connection
+    (bound to `g`), so a route, its helpers and log_api_call use one
+    connection per request. It is released in teardown_appcontext.
+    """
+    if DB_REQUEST_SCOPED and has_app_context():
+        if "db_conn" not in g:
+            g.db_conn = get_db_pool().connect()
+        return SharedConnection(g.db_conn)
+    return get_db_pool().connect()
+
+
+def release_request_db_connection(exc=None):
+    """teardown_appcontext hook: rollback anything uncommitted and return to pool."""
+    conn = g.pop("db_conn", None)
+    if conn is not None:
+        conn.close()
+
+
+@contextmanager
+def db_connection():
+    """
+    with db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        ...
+    """
+    conn = get_db_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def get_db_pool_stats() -> dict:
+    return get_db_pool().stats()
+
+
     # Environment validation on startup
 def validate_environment():
     """Validate all required environment variables"""
@@ -0,0 +1,74 @@
+"""
+One-off migration: convert api_call_logs to monthly RANGE COLUMNS partitions
+(see utils/api_log_retention.py and "table changes List.txt").
+
+    python migrate_api_call_logs_partitions.py --dry-run   # print the DDL only
+    python migrate_api_call_logs_partitions.py
+
+MySQL requires the partitioning column in every unique key, so the primary
+key becomes (id, timestamp) and timestamp becomes DATETIME NOT NULL. The
+ALTER copies the table; run it in a quiet window. Safe to re-run (does
+nothing once the table is partitioned).
+"""
+import argparse
+from datetime import date, datetime
+
+from config import get_db_connection
+from utils.api_log_retention import (
+    API_LOG_PARTITIONS_AHEAD,
+    LOG_TABLE,
+    add_months,
+    list_partitions,
+    partition_by_sql,
+)
+
+
+def build_ddl(cursor, today: date) -> list[str]:
+    cursor.execute(f"SELECT MIN(`timestamp`) AS first_ts FROM {LOG_TABLE}")
+    row = cursor.fetchone()
+    first_ts = row["first_ts"] if row else None
+    if isinstance(first_ts, str):
+        first_ts = datetime.strptime(first_ts[:10], "%Y-%m-%d")
+    first_month = date(first_ts.year, first_ts.month, 1) if first_ts else date(today.year, today.month, 1)
+
+    return [
+        f"UPDATE {LOG_TABLE} SET `timestamp` = '1970-01-01 00:00:00' WHERE `timestamp` IS NULL",
+        f"""ALTER TABLE {LOG_TABLE}
+    MODIFY `timestamp` DATETIME NOT NULL,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (id, `timestamp`)""",
+        f"ALTER TABLE {LOG_TABLE}\n"
+        + partition_by_sql(first_month, add_months(today, API_LOG_PARTITIONS_AHEAD)),
+    ]
+
+
+def run(dry_run=False):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        if list_partitions(cursor):
+            print(f"[{datetime.now()}] {LOG_TABLE} is already partitioned, nothing to do")
+            return
+
+        statements = build_ddl(cursor, date.today())
+        for sql in statements:
+            print(sql + ";\n")
+            if not dry_run:
+                cursor.execute(sql)
+                conn.commit()
+        if not dry_run:
+            print(f"[{datetime.now()}] Done: {len(list_partitions(cursor))} partitions")
+    except Exception as e:
+        conn.rollback()
+        print("Error:", str(e))
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Partition api_call_logs by month")
+    parser.add_argument("--dry-run", action="store_true", help="print the DDL without running it")
+    args = parser.parse_args()
+    run(dry_run=args.dry_run)
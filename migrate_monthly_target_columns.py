@@ -0,0 +1,113 @@
+"""
+One-off migration for user_monthly_tracker / project_monthly_tracker
+(see "table changes List.txt"):
+
+  - month_key: STORED generated yyyymm INT from month_year ('JAN2026' /
+    'Jan2026'), indexed with user_id / project_id
+  - monthly_target (and working_days) TEXT -> DECIMAL
+
+    python migrate_monthly_target_columns.py --dry-run   # print the statements only
+    python migrate_monthly_target_columns.py
+
+month_year stays as it is, so clients keep sending and receiving the same
+strings. Target values that are not plain numbers are listed and set to
+NULL before the type change. Safe to re-run (tables that already have
+month_key are skipped).
+"""
+import argparse
+from datetime import datetime
+
+from config import get_db_connection
+from utils.tracker_dates import month_key_sql
+
+NUMERIC_RE = "'^[0-9]+(\\\\.[0-9]+)?$'"
+
+TABLES = {
+    "user_monthly_tracker": {
+        "id": "user_monthly_tracker_id",
+        "owner": "user_id",
+        "numeric": {"monthly_target": "DECIMAL(10,2)", "working_days": "DECIMAL(5,1)"},
+        "index": "idx_umt_user_month",
+    },
+    "project_monthly_tracker": {
+        "id": "project_monthly_tracker_id",
+        "owner": "project_id",
+        "numeric": {"monthly_target": "DECIMAL(12,2)"},
+        "index": "idx_pmt_project_month",
+    },
+}
+
+
+def has_month_key(cursor, table: str) -> bool:
+    cursor.execute(
+        """
+        SELECT 1 FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = 'month_key'
+        """,
+        (table,),
+    )
+    return cursor.fetchone() is not None
+
+
+def build_statements(table: str, spec: dict) -> list[str]:
+    statements = []
+    for col in spec["numeric"]:
+        statements.append(
+            f"UPDATE {table} SET {col} = NULL "
+            f"WHERE {col} IS NOT NULL AND TRIM({col}) NOT REGEXP {NUMERIC_RE}"
+        )
+    alter = [f"MODIFY {col} {sql_type} NULL" for col, sql_type in spec["numeric"].items()]
+    alter += [
+        f"ADD COLUMN month_key INT UNSIGNED AS ({month_key_sql('month_year')}) STORED AFTER month_year",
+        f"ADD KEY {spec['index']} ({spec['owner']}, month_key)",
+    ]
+    statements.append(f"ALTER TABLE {table}\n    " + ",\n    ".join(alter))
+    return statements
+
+
+def report_bad_rows(cursor, table: str, spec: dict) -> None:
+    checks = [f"TRIM({col}) NOT REGEXP {NUMERIC_RE}" for col in spec["numeric"]]
+    cursor.execute(
+        f"""
+        SELECT {spec['id']} AS id, month_year, {", ".join(spec["numeric"])}
+        FROM {table}
+        WHERE ({month_key_sql('month_year')}) IS NULL OR {" OR ".join(checks)}
+        """
+    )
+    rows = cursor.fetchall()
+    if rows:
+        print(f"{table}: {len(rows)} row(s) with an unreadable month_year (month_key NULL) or non-numeric target:")
+        for r in rows[:50]:
+            print("  " + ", ".join(f"{k}={v!r}" for k, v in r.items()))
+
+
+def run(dry_run=False):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        for table, spec in TABLES.items():
+            if has_month_key(cursor, table):
+                print(f"[{datetime.now()}] {table} already has month_key, skipped")
+                continue
+            report_bad_rows(cursor, table, spec)
+            for sql in build_statements(table, spec):
+                print(sql + ";\n")
+                if not dry_run:
+                    cursor.execute(sql)
+                    conn.commit()
+        if not dry_run:
+            print(f"[{datetime.now()}] Done")
+    except Exception as e:
+        conn.rollback()
+        print("Error:", str(e))
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add month_key and numeric targets to the monthly target tables")
+    parser.add_argument("--dry-run", action="store_true", help="print the statements without running them")
+    args = parser.parse_args()
+    run(dry_run=args.dry_run)
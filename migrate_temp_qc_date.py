@@ -0,0 +1,131 @@
+"""
+One-off migration: temp_qc.date TEXT -> DATE with a UNIQUE (user_id, date) key
+(see "table changes List.txt"). The dashboard, tracker views, monthly list
+and billable report join temp_qc on the typed date afterwards.
+
+    python migrate_temp_qc_date.py --dry-run   # print the statements only
+    python migrate_temp_qc_date.py
+
+The rows are copied into a new table in updated_date order with the same
+merge rule as /qc/temp-qc (a later non-NULL value wins), so rows that only
+differed in date formatting ('2026-3-5' / '2026-03-05 00:00:00') collapse
+into one. The old table is kept as temp_qc_text_backup, including any row
+whose date could not be parsed (they are listed before the swap). temp_qc
+writes made during the copy are lost: run it in a quiet window. Safe to
+re-run (does nothing once the column is a DATE).
+"""
+import argparse
+from datetime import datetime
+
+from config import get_db_connection
+
+TABLE = "temp_qc"
+BACKUP = "temp_qc_text_backup"
+NEW = "temp_qc_typed"
+
+# TEXT -> DATE for 'YYYY-MM-DD', 'YYYY-M-D' and 'YYYY-MM-DD HH:MM:SS'
+PARSED_DATE = "STR_TO_DATE(SUBSTRING_INDEX(TRIM(`date`), ' ', 1), '%Y-%m-%d')"
+
+
+def table_columns(cursor) -> list[dict]:
+    cursor.execute(
+        """
+        SELECT COLUMN_NAME AS name, DATA_TYPE AS type, EXTRA AS extra
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        ORDER BY ORDINAL_POSITION
+        """,
+        (TABLE,),
+    )
+    return cursor.fetchall()
+
+
+def date_indexes(cursor) -> list[str]:
+    """Secondary indexes on temp_qc that include `date` (a TEXT prefix index cannot stay on a DATE)."""
+    cursor.execute(
+        """
+        SELECT DISTINCT INDEX_NAME AS name
+        FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+          AND COLUMN_NAME = 'date' AND INDEX_NAME <> 'PRIMARY'
+        """,
+        (TABLE,),
+    )
+    return [r["name"] for r in cursor.fetchall()]
+
+
+def build_statements(columns: list[dict], drop_indexes: list[str]) -> list[str]:
+    names = [c["name"] for c in columns if "auto_increment" not in (c["extra"] or "").lower()]
+    select_cols = ", ".join(PARSED_DATE if n == "date" else f"`{n}`" for n in names)
+    order = "updated_date" if "updated_date" in names else "user_id"
+
+    # same rule as /qc/temp-qc: later non-NULL values win
+    updates = ",\n    ".join(
+        "updated_date = VALUES(updated_date)" if n == "updated_date"
+        else f"`{n}` = COALESCE(VALUES(`{n}`), `{n}`)"
+        for n in names if n not in ("user_id", "date")
+    )
+    alter = [f"DROP INDEX `{name}`" for name in drop_indexes] + [
+        "MODIFY `date` DATE NOT NULL",
+        "ADD UNIQUE KEY uq_temp_qc_user_date (user_id, `date`)",
+        "ADD KEY idx_temp_qc_date (`date`)",
+    ]
+
+    return [
+        # unparseable dates are filtered out below; keep STR_TO_DATE's warnings from aborting the copy
+        "SET SESSION sql_mode = REPLACE(REPLACE(@@sql_mode, 'STRICT_TRANS_TABLES', ''), 'STRICT_ALL_TABLES', '')",
+        f"DROP TABLE IF EXISTS {NEW}",
+        f"CREATE TABLE {NEW} LIKE {TABLE}",
+        f"ALTER TABLE {NEW}\n    " + ",\n    ".join(alter),
+        f"""INSERT INTO {NEW} ({", ".join(f"`{n}`" for n in names)})
+SELECT {select_cols}
+FROM {TABLE}
+WHERE {PARSED_DATE} IS NOT NULL
+ORDER BY {order}
+ON DUPLICATE KEY UPDATE
+    {updates}""",
+        f"RENAME TABLE {TABLE} TO {BACKUP}, {NEW} TO {TABLE}",
+    ]
+
+
+def run(dry_run=False):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        columns = table_columns(cursor)
+        date_col = next((c for c in columns if c["name"] == "date"), None)
+        if date_col is None:
+            raise RuntimeError(f"{TABLE}.date not found")
+        if date_col["type"].lower() == "date":
+            print(f"[{datetime.now()}] {TABLE}.date is already a DATE, nothing to do")
+            return
+
+        cursor.execute(f"SELECT user_id, `date` FROM {TABLE} WHERE {PARSED_DATE} IS NULL")
+        bad = cursor.fetchall()
+        if bad:
+            print(f"{len(bad)} row(s) with an unparseable date stay in {BACKUP} only:")
+            for r in bad[:50]:
+                print(f"  user_id={r['user_id']} date={r['date']!r}")
+
+        for sql in build_statements(columns, date_indexes(cursor)):
+            print(sql + ";\n")
+            if not dry_run:
+                cursor.execute(sql)
+                conn.commit()
+        if not dry_run:
+            cursor.execute(f"SELECT COUNT(*) AS n FROM {TABLE}")
+            print(f"[{datetime.now()}] Done: {cursor.fetchone()['n']} rows in {TABLE}, old table kept as {BACKUP}")
+    except Exception as e:
+        conn.rollback()
+        print("Error:", str(e))
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Type temp_qc.date as DATE with a unique (user_id, date) key")
+    parser.add_argument("--dry-run", action="store_true", help="print the statements without running them")
+    args = parser.parse_args()
+    run(dry_run=args.dry_run)
@@ -0,0 +1,117 @@
+"""
+One-off migration: task_work_tracker.date_time_dt, the STORED generated
+DATETIME copy of the TEXT date_time, plus its range indexes (see
+"table changes List.txt" and utils/tracker_dates.py).
+
+    python migrate_tracker_date_time_dt.py --dry-run   # report + print the statements only
+    python migrate_tracker_date_time_dt.py
+
+date_time values that CAST(... AS DATETIME) cannot parse are listed first.
+Under a strict sql_mode they make the ALTER fail; otherwise they would be
+stored as NULL and silently drop out of every date filter. So the ALTER is
+not run while any are left: fix those rows, then re-run. Safe to re-run
+(the column and each index are only added when missing).
+"""
+import argparse
+from datetime import datetime
+
+from config import get_db_connection
+from utils.tracker_dates import TRACKER_DT_COL
+
+TABLE = "task_work_tracker"
+
+INDEXES = {
+    "idx_twt_user_dt": f"user_id, {TRACKER_DT_COL}",
+    "idx_twt_project_dt": f"project_id, {TRACKER_DT_COL}",
+    "idx_twt_dt": TRACKER_DT_COL,
+}
+
+
+def has_column(cursor) -> bool:
+    cursor.execute(
+        """
+        SELECT 1 FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        """,
+        (TABLE, TRACKER_DT_COL),
+    )
+    return cursor.fetchone() is not None
+
+
+def existing_indexes(cursor) -> set[str]:
+    cursor.execute(
+        """
+        SELECT DISTINCT INDEX_NAME AS name
+        FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """,
+        (TABLE,),
+    )
+    return {r["name"] for r in cursor.fetchall()}
+
+
+def report_bad_rows(cursor) -> int:
+    cursor.execute(
+        f"""
+        SELECT tracker_id, user_id, date_time
+        FROM {TABLE}
+        WHERE date_time IS NOT NULL AND CAST(date_time AS DATETIME) IS NULL
+        """
+    )
+    rows = cursor.fetchall()
+    if rows:
+        print(f"{TABLE}: {len(rows)} row(s) with a date_time CAST(... AS DATETIME) cannot parse:")
+        for r in rows[:50]:
+            print(f"  tracker_id={r['tracker_id']} user_id={r['user_id']} date_time={r['date_time']!r}")
+    return len(rows)
+
+
+def build_statements(add_column: bool, indexes: set[str]) -> list[str]:
+    alter = []
+    if add_column:
+        alter.append(
+            f"ADD COLUMN {TRACKER_DT_COL} DATETIME AS (CAST(date_time AS DATETIME)) STORED AFTER date_time"
+        )
+    alter += [f"ADD KEY {name} ({cols})" for name, cols in INDEXES.items() if name not in indexes]
+    if not alter:
+        return []
+    return [f"ALTER TABLE {TABLE}\n    " + ",\n    ".join(alter)]
+
+
+def run(dry_run=False):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        add_column = not has_column(cursor)
+        statements = build_statements(add_column, existing_indexes(cursor))
+        if not statements:
+            print(f"[{datetime.now()}] {TABLE}.{TRACKER_DT_COL} and its indexes already exist, nothing to do")
+            return
+
+        bad = report_bad_rows(cursor) if add_column else 0
+        for sql in statements:
+            print(sql + ";\n")
+        if dry_run:
+            return
+        if bad:
+            print(f"[{datetime.now()}] Not altered: fix the {bad} date_time value(s) above first")
+            return
+
+        for sql in statements:
+            cursor.execute(sql)
+            conn.commit()
+        print(f"[{datetime.now()}] Done")
+    except Exception as e:
+        conn.rollback()
+        print("Error:", str(e))
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add the typed, indexed date_time_dt column to task_work_tracker")
+    parser.add_argument("--dry-run", action="store_true", help="report bad rows and print the statements without running them")
+    args = parser.parse_args()
+    run(dry_run=args.dry_run)
@@ -0,0 +1,41 @@
+"""
+Rebuild tracker_daily_fact from task_work_tracker.
+
+    python rebuild_tracker_daily_fact.py                      # all history
+    python rebuild_tracker_daily_fact.py --from 2026-03-01 --to 2026-03-31
+
+The API keeps the table current on every tracker write; run this after the
+initial migration, bulk imports or manual SQL fixes.
+"""
+import argparse
+from datetime import datetime
+
+from config import get_db_connection
+from utils.tracker_facts import rebuild_facts
+
+
+def run(date_from=None, date_to=None):
+    print(f"[{datetime.now()}] Rebuilding tracker_daily_fact ({date_from or 'start'} .. {date_to or 'now'}) ...")
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        conn.start_transaction()
+        count = rebuild_facts(cursor, date_from, date_to)
+        conn.commit()
+        print(f"[{datetime.now()}] Done: {count} fact rows written")
+    except Exception as e:
+        conn.rollback()
+        print("Error:", str(e))
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild tracker_daily_fact")
+    parser.add_argument("--from", dest="date_from", help="YYYY-MM-DD (inclusive)")
+    parser.add_argument("--to", dest="date_to", help="YYYY-MM-DD (inclusive)")
+    args = parser.parse_args()
+    run(args.date_from, args.date_to)
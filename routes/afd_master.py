@@ -3,6 +3,7 @@ from datetime import datetime
 from config import get_db_connection
 from utils.validators import validate_request
 from utils.response import api_response
+from utils.dropdown_cache import invalidate_dropdowns
 
 afd_master_bp = Blueprint("afd_master", __name__, url_prefix="/qc/afd-master")
 
@@ -43,6 +44,7 @@ def create_afd():
             VALUES (%s, %s, %s)
         """, (afd_name, 1, _today()))
         conn.commit()
+        invalidate_dropdowns("afd")
 
         return api_response(
             message="AFD created successfully",
@@ -114,6 +116,8 @@ def update_afd():
         if not updates:
             return api_response(message="Nothing to update", status=400)
 
+        # stamp updated_at so /project_category/list's ETag changes
+        updates.append("updated_at=NOW()")
         params.append(afd_id)
         cursor.execute(f"""
             UPDATE {AFD_TABLE}
@@ -121,6 +125,7 @@ def update_afd():
             WHERE afd_id=%s
         """, tuple(params))
         conn.commit()
+        invalidate_dropdowns("afd")
 
         return api_response(message="AFD updated successfully", status=200)
     except Exception as e:
@@ -149,8 +154,9 @@ def delete_afd():
         if not cursor.fetchone():
             return api_response(message="AFD not found", status=404)
 
-        cursor.execute(f"UPDATE {AFD_TABLE} SET is_active=0 WHERE afd_id=%s", (afd_id,))
+        cursor.execute(f"UPDATE {AFD_TABLE} SET is_active=0, updated_at=NOW() WHERE afd_id=%s", (afd_id,))
         conn.commit()
+        invalidate_dropdowns("afd")
 
         return api_response(message="AFD deleted (disabled) successfully", status=200)
     except Exception as e:
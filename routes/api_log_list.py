@@ -1,7 +1,19 @@
 from flask import Blueprint, request
 from config import get_db_connection
 from utils.response import api_response
-from datetime import datetime
+from utils.tracker_dates import datetime_range_sql
+from datetime import datetime, timedelta
+import base64
+import json
+import os
+
+# /logs pages through api_call_logs newest first, keyset on (timestamp, id),
+# inside a time window (last API_LOG_DEFAULT_DAYS days unless date_from/date_to
+# are given). Indexes: see "table changes List.txt".
+API_LOG_PAGE_SIZE = int(os.getenv("API_LOG_PAGE_SIZE", "200"))
+API_LOG_MAX_PAGE_SIZE = int(os.getenv("API_LOG_MAX_PAGE_SIZE", "1000"))
+API_LOG_DEFAULT_DAYS = int(os.getenv("API_LOG_DEFAULT_DAYS", "7"))
+
 
 def get_action_description(api_name):
     mapping = {
@@ -17,23 +29,127 @@ def get_action_description(api_name):
     }
     return mapping.get(api_name, api_name)
 
+
+def encode_log_cursor(row: dict) -> str:
+    """Keyset position after `row`: (timestamp, id), opaque to clients."""
+    ts = row["timestamp"]
+    ts = ts.strftime("%Y-%m-%d %H:%M:%S") if isinstance(ts, datetime) else str(ts)
+    raw = json.dumps([ts, int(row["id"])])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_log_cursor(token: str) -> tuple:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        ts, log_id = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
+        return ts, int(log_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def api_log_filters_sql(data: dict, params: list) -> str:
+    """Window + user_id / api_name filters -> ' AND ...' fragment (extends params)."""
+    date_from = data.get("date_from")
+    date_to = data.get("date_to")
+    if not date_from and not date_to:
+        date_from = (datetime.now() - timedelta(days=API_LOG_DEFAULT_DAYS)).strftime("%Y-%m-%d %H:%M:%S")
+    sql = datetime_range_sql(params, "l.timestamp", date_from, date_to)
+
+    user_id = data.get("user_id")
+    if user_id not in (None, ""):
+        try:
+            params.append(int(user_id))
+        except (TypeError, ValueError):
+            raise ValueError("user_id must be an integer")
+        sql += " AND l.user_id = %s"
+
+    api_name = data.get("api_name")
+    if api_name:
+        names = api_name if isinstance(api_name, list) else [api_name]
+        names = [str(n) for n in names if n]
+        if names:
+            sql += f" AND l.api_name IN ({','.join(['%s'] * len(names))})"
+            params.extend(names)
+
+    return sql
+
+
 api_log_list_bp = Blueprint("api_log_list", __name__)
 
 @api_log_list_bp.route("/logs", methods=["POST"])
 def get_api_logs():
+    """
+    Optional body:
+      date_from / date_to : window on timestamp (default: last API_LOG_DEFAULT_DAYS days)
+      user_id, api_name   : api_name may be a string or a list
+      page_size, cursor   : keyset paging (next_cursor of the previous page)
+      aggregate="hourly"  : counts per hour per api_name for the window instead of rows
+    """
+    data = request.get_json(silent=True) or {}
+
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
-        cursor.execute("""
+        params = []
+        try:
+            filters_sql = api_log_filters_sql(data, params)
+        except ValueError as e:
+            return api_response(400, str(e))
+
+        if data.get("aggregate") == "hourly":
+            cursor.execute(f"""
+                SELECT
+                    DATE_FORMAT(l.timestamp, '%Y-%m-%d %H:00:00') AS hour,
+                    l.api_name,
+                    COUNT(*) AS count
+                FROM api_call_logs l
+                WHERE 1=1{filters_sql}
+                GROUP BY hour, l.api_name
+                ORDER BY hour DESC, l.api_name
+            """, tuple(params))
+            buckets = cursor.fetchall()
+            return api_response(200, "API log activity fetched successfully", {
+                "count": len(buckets),
+                "buckets": buckets,
+            })
+
+        try:
+            page_size = max(1, min(int(data.get("page_size") or API_LOG_PAGE_SIZE), API_LOG_MAX_PAGE_SIZE))
+        except (TypeError, ValueError):
+            return api_response(400, "page_size must be an integer")
+
+        if data.get("cursor"):
+            try:
+                ts, log_id = decode_log_cursor(str(data["cursor"]))
+            except ValueError as e:
+                return api_response(400, str(e))
+            filters_sql += " AND (l.timestamp < %s OR (l.timestamp = %s AND l.id < %s))"
+            params.extend([ts, ts, log_id])
+
+        cursor.execute(f"""
             SELECT l.*, u.user_name
             FROM api_call_logs l
             LEFT JOIN tfs_user u ON l.user_id = u.user_id
-            ORDER BY l.timestamp DESC
-        """)
+            WHERE 1=1{filters_sql}
+            ORDER BY l.timestamp DESC, l.id DESC
+            LIMIT %s
+        """, tuple(params + [page_size + 1]))
         logs = cursor.fetchall()
+
+        has_more = len(logs) > page_size
+        logs = logs[:page_size]
+        next_cursor = encode_log_cursor(logs[-1]) if has_more else None
+
         for log in logs:
             log["action"] = f"{log.get('user_name', 'Unknown User')} {get_action_description(log['api_name'])} at {log['timestamp']} from {log.get('device_type', '')} ({log.get('device_id', '')})"
-        return api_response(200, "API logs fetched successfully", logs)
+        return api_response(200, "API logs fetched successfully", {
+            "count": len(logs),
+            "logs": logs,
+            "page_size": page_size,
+            "has_more": has_more,
+            "next_cursor": next_cursor,
+        })
     except Exception as e:
         return api_response(500, f"Failed to fetch logs: {str(e)}")
     finally:
@@ -1,6 +1,7 @@
 from flask import Blueprint, request
 from config import get_db_connection, BASE_UPLOAD_URL, UPLOAD_SUBDIRS
 from utils.response import api_response
+from utils.dropdown_cache import invalidate_dropdowns
 from utils.security import encrypt_password, decrypt_password, safe_decrypt_password
 from datetime import datetime
 from utils.validators import (
@@ -10,6 +11,8 @@ from utils.validators import (
     is_valid_phone
 )
 from utils.validators import validate_request
+from utils.reporting_edges import sync_user_edges
+from utils.visibility import invalidate_visibility
 import json
 import re
 
@@ -262,6 +265,12 @@ def user_handler():
 
         new_user_id = cursor.lastrowid
 
+        sync_user_edges(cursor, new_user_id, {
+            "project_manager": project_manager,
+            "asst_manager": assistant_manager,
+            "qa": qa,
+        })
+
         cursor.execute("""SELECT role_name FROM user_role WHERE role_id=%s""", (role_id,))
         role = cursor.fetchone()
 
@@ -288,6 +297,8 @@ def user_handler():
         ))
 
         conn.commit()
+        invalidate_dropdowns("tfs_user")
+        invalidate_visibility()
         return api_response(201, "User registered successfully")
 
     except Exception as e:
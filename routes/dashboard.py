@@ -3,31 +3,22 @@
 from flask import Blueprint, request
 from config import get_db_connection, UPLOAD_FOLDER, UPLOAD_SUBDIRS, BASE_UPLOAD_URL
 from utils.response import api_response
+from utils.tracker_dates import tracker_dt, tracker_range_sql, tracker_day_sql
+from utils.visibility import get_visibility
+from utils.fanout import FanoutTimeout, run_parallel
+from utils.tracker_facts import (
+    FACT_TABLE, fact_date_filters_ok, fact_range_sql, non_numeric_count_sql, numeric_sum_sql,
+)
 
 dashboard_bp = Blueprint("dashboard", __name__, url_prefix="/dashboard")
 
-TRACKER_DT = "CAST(twt.date_time AS DATETIME)"
+# indexed DATETIME copy of twt.date_time (range predicates only)
+TRACKER_DT = tracker_dt("twt")
 
 
 # -----------------------------
 # Helpers
 # -----------------------------
-def get_user_role(cursor, user_id: int) -> str | None:
-    cursor.execute(
-        """
-        SELECT r.role_name
-        FROM tfs_user u
-        JOIN user_role r ON r.role_id = u.role_id
-        WHERE u.user_id=%s AND u.is_active=1 AND u.is_delete=1
-        """,
-        (user_id,),
-    )
-    row = cursor.fetchone()
-    if not row:
-        return None
-    return (row.get("role_name") or "").strip().lower()
-
-
 def multi_id_match_sql(col: str) -> str:
     cleaned = f"REPLACE(REPLACE(REPLACE(REPLACE({col}, '[', ''), ']', ''), CHAR(34), ''), ' ', '')"
     return f"({col} = %s OR FIND_IN_SET(%s, {cleaned}) > 0)"
@@ -55,29 +46,16 @@ def apply_tracker_filters(data: dict, where_sql: str, params: list) -> tuple[str
         params.append(data["task_id"])
 
     if data.get("date"):
-        where_sql += f" AND DATE({TRACKER_DT}) = %s"
-        params.append(data["date"])
-
-    if data.get("date_from"):
-        date_from = data["date_from"]
-        if len(date_from) == 10:
-            date_from += " 00:00:00"
-        where_sql += f" AND {TRACKER_DT} >= %s"
-        params.append(date_from)
+        where_sql += tracker_day_sql(params, data["date"])
 
-    if data.get("date_to"):
-        date_to = data["date_to"]
-        if len(date_to) == 10:
-            date_to += " 23:59:59"
-        where_sql += f" AND {TRACKER_DT} <= %s"
-        params.append(date_to)
+    where_sql += tracker_range_sql(params, data.get("date_from"), data.get("date_to"))
 
     return where_sql, params
 
 
 # -----------------------------
 # QC FILTER HELPERS (NEW - does not change existing tracker logic)
-# temp_qc.date is TEXT 'YYYY-MM-DD'
+# temp_qc.date is a DATE, one row per (user_id, date) (migrate_temp_qc_date.py)
 # -----------------------------
 def _date_only(val: str | None) -> str | None:
     """Accepts 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS' and returns 'YYYY-MM-DD'."""
@@ -91,52 +69,217 @@ def _date_only(val: str | None) -> str | None:
 
 def apply_qc_filters(data: dict, where_sql: str, params: list) -> tuple[str, list]:
     """
-    Apply SAME date/date_from/date_to/user_id filters but on temp_qc.date.
-    IMPORTANT: uses tq.date (NOT updated_date).
+    Apply SAME date/date_from/date_to/user_id filters but on the QC day
+    (temp_qc.date, NOT updated_date).
     """
     if data.get("user_id"):
-        where_sql += " AND tq.user_id = %s"
+        where_sql += " AND q.user_id = %s"
         params.append(int(data["user_id"]))
 
     if data.get("date"):
-        where_sql += " AND tq.date = %s"
+        where_sql += " AND q.date = %s"
         params.append(_date_only(data["date"]))
 
     if data.get("date_from"):
         df = _date_only(data["date_from"])
         if df:
-            where_sql += " AND tq.date >= %s"
+            where_sql += " AND q.date >= %s"
             params.append(df)
 
     if data.get("date_to"):
         dt = _date_only(data["date_to"])
         if dt:
-            where_sql += " AND tq.date <= %s"
+            where_sql += " AND q.date <= %s"
             params.append(dt)
 
     return where_sql, params
 
 
 # -----------------------------
-# USER → TRACKER SCOPING (IMPORTANT PART)
+# ONE PASS OVER THE TRACKER SLICE
 # -----------------------------
-def detect_existing_column(cursor, table: str, candidates: list[str]) -> str | None:
+DASHBOARD_BASE_FROM = """
+    FROM task_work_tracker twt
+    JOIN tfs_user u ON u.user_id = twt.user_id
+    JOIN project p ON p.project_id = twt.project_id
+"""
+
+
+def _summarize_slice(groups: list) -> tuple[dict, list[int], dict]:
+    user_ids, project_ids, task_ids = set(), set(), set()
+    tracker_rows = 0
+    total_production = 0
+    total_billable = 0
+    non_numeric_billable = 0
+    billable_map = {}
+    for g in groups:
+        user_ids.add(g["user_id"])
+        project_ids.add(g["project_id"])
+        if g["task_id"] is not None:
+            task_ids.add(g["task_id"])
+        tracker_rows += g["tracker_rows"]
+        non_numeric_billable += int(g["non_numeric_billable"] or 0)
+        total_production += g["production"] or 0
+        total_billable += g["billable_hours"] or 0
+        billable_map[g["project_id"]] = billable_map.get(g["project_id"], 0) + (g["billable_hours"] or 0)
+
+    summary = {
+        "user_count": len(user_ids),
+        "project_count": len(project_ids),
+        "task_count": len(task_ids),
+        "tracker_rows": tracker_rows,
+        "total_production": total_production,
+        "total_billable_hours": total_billable,
+        "non_numeric_billable_rows": non_numeric_billable,
+    }
+    return summary, sorted(user_ids, reverse=True), billable_map
+
+
+def tracker_slice_aggregates(cursor, where_sql: str, params: list) -> tuple[dict, list[int], dict]:
+    """
+    Scans the filtered tracker slice ONCE, grouped by (user, project, task),
+    and derives everything the dashboard used to query separately:
+      - summary counts / totals (same keys as the old summary query)
+      - the distinct user ids in the slice
+      - {project_id: total_billable_hours}
+    """
     cursor.execute(
-        """
-        SELECT COLUMN_NAME
-        FROM INFORMATION_SCHEMA.COLUMNS
-        WHERE TABLE_SCHEMA = DATABASE()
-          AND TABLE_NAME = %s
+        f"""
+        SELECT
+            twt.user_id,
+            twt.project_id,
+            twt.task_id,
+            COUNT(*) AS tracker_rows,
+            SUM(twt.production) AS production,
+            {numeric_sum_sql("twt.billable_hours")} AS billable_hours,
+            {non_numeric_count_sql("twt.billable_hours")} AS non_numeric_billable
+        {DASHBOARD_BASE_FROM}
+        {where_sql}
+        GROUP BY twt.user_id, twt.project_id, twt.task_id
         """,
-        (table,),
+        tuple(params),
     )
-    cols = {r["COLUMN_NAME"].lower() for r in (cursor.fetchall() or [])}
-    for c in candidates:
-        if c.lower() in cols:
-            return c
-    return None
+    return _summarize_slice(cursor.fetchall() or [])
+
+
+# tracker_daily_fact twin of DASHBOARD_BASE_FROM / apply_tracker_filters:
+# O(days x users) rows instead of one per tracker (utils/tracker_facts.py)
+DASHBOARD_FACT_FROM = f"""
+    FROM {FACT_TABLE} f
+    JOIN tfs_user u ON u.user_id = f.user_id
+    JOIN project p ON p.project_id = f.project_id
+"""
+
+
+def apply_fact_filters(data: dict, where_sql: str, params: list) -> tuple[str, list]:
+    if data.get("user_id"):
+        where_sql += " AND f.user_id = %s"
+        params.append(int(data["user_id"]))
+
+    if data.get("project_id"):
+        where_sql += " AND f.project_id = %s"
+        params.append(data["project_id"])
+
+    if data.get("task_id"):
+        where_sql += " AND f.task_id = %s"
+        params.append(data["task_id"])
+
+    if data.get("date"):
+        where_sql += fact_range_sql(params, data["date"], data["date"])
+
+    where_sql += fact_range_sql(params, data.get("date_from"), data.get("date_to"))
+
+    return where_sql, params
+
 
+def fact_slice_aggregates(cursor, where_sql: str, params: list) -> tuple[dict, list[int], dict]:
+    """tracker_slice_aggregates over tracker_daily_fact (same return shape)."""
+    cursor.execute(
+        f"""
+        SELECT
+            f.user_id,
+            f.project_id,
+            NULLIF(f.task_id, 0) AS task_id,
+            CAST(SUM(f.tracker_count) AS SIGNED) AS tracker_rows,
+            SUM(f.production) AS production,
+            SUM(f.billable_hours) AS billable_hours,
+            CAST(SUM(f.non_numeric_billable) AS SIGNED) AS non_numeric_billable
+        {DASHBOARD_FACT_FROM}
+        {where_sql}
+        GROUP BY f.user_id, f.project_id, f.task_id
+        """,
+        tuple(params),
+    )
+    return _summarize_slice(cursor.fetchall() or [])
+
+
+def get_dashboard_users(cursor, user_ids: list[int]) -> list[dict]:
+    """User cards for the slice's users (primary-key lookups, newest id first)."""
+    if not user_ids:
+        return []
+    params: list = []
+    in_sql = build_in_clause_int(user_ids, params)
+    cursor.execute(
+        f"""
+        SELECT
+            u.user_id,
+            u.user_name,
+            u.user_email,
+            u.user_number,
+            u.user_address,
+            u.user_tenure,
+            r.role_name AS role,
+            d.designation,
+            tm.team_name
+        FROM tfs_user u
+        LEFT JOIN user_role r ON r.role_id = u.role_id
+        LEFT JOIN user_designation d ON d.designation_id = u.designation_id
+        LEFT JOIN team tm ON tm.team_id = u.team_id
+        WHERE u.user_id {in_sql}
+        ORDER BY u.user_id DESC
+        """,
+        tuple(params),
+    )
+    return cursor.fetchall() or []
+
+
+def qc_aggregates(cursor, qc_where: str, qc_params: list) -> tuple[dict, dict]:
+    """
+    One pass over the temp_qc scores: per-user avg / day count
+    plus the overall row from WITH ROLLUP.
+    Returns ({"avg_qc_score", "qc_days_count"}, {user_id: same}).
+    """
+    cursor.execute(
+        f"""
+        SELECT
+            q.user_id,
+            GROUPING(q.user_id) AS is_total,
+            ROUND(SUM(q.qc_score) / NULLIF(COUNT(*), 0), 2) AS avg_qc_score,
+            COUNT(*) AS qc_days_count
+        FROM temp_qc q
+        {qc_where}
+          AND q.qc_score IS NOT NULL
+        GROUP BY q.user_id WITH ROLLUP
+        """,
+        tuple(qc_params),
+    )
+    overall = {"avg_qc_score": None, "qc_days_count": 0}
+    per_user = {}
+    for r in cursor.fetchall() or []:
+        info = {
+            "avg_qc_score": r.get("avg_qc_score"),
+            "qc_days_count": r.get("qc_days_count") or 0,
+        }
+        if r.get("is_total"):
+            overall = info
+        elif r.get("user_id") is not None:
+            per_user[int(r["user_id"])] = info
+    return overall, per_user
 
+
+# -----------------------------
+# USER → TRACKER SCOPING (IMPORTANT PART)
+# -----------------------------
 def get_subordinate_user_ids(cursor, role: str, logged_in_user_id: int) -> list[int] | None:
     """
     Returns:
@@ -144,7 +287,6 @@ def get_subordinate_user_ids(cursor, role: str, logged_in_user_id: int) -> list[
       - list[int] for other roles (users under them, including self)
     """
     role = (role or "").strip().lower()
-    v = str(logged_in_user_id)
 
     if role in ["admin", "super admin"]:
         return None
@@ -152,84 +294,22 @@ def get_subordinate_user_ids(cursor, role: str, logged_in_user_id: int) -> list[
     if role == "agent":
         return [logged_in_user_id]
 
-    # ✅ QA: agents mapped via tfs_user.qa_id containing QA user_id
+    # QA -> tfs_user.qa_id, Assistant Manager -> tfs_user.asst_manager_id,
+    # Project Manager -> tfs_user.project_manager_id (NOT project table),
+    # all resolved from the cached user_reporting_edge set (utils/visibility.py).
     if role == "qa":
-        cursor.execute(
-            f"""
-            SELECT DISTINCT tu.user_id
-            FROM tfs_user tu
-            WHERE tu.is_active=1 AND tu.is_delete=1
-              AND {multi_id_match_sql("tu.qa_id")}
-            """,
-            (v, v),
-        )
-        rows = cursor.fetchall() or []
-        ids = [int(r["user_id"]) for r in rows if r.get("user_id") is not None]
-        if logged_in_user_id not in ids:
-            ids.append(logged_in_user_id)
-        return ids
-
-    # ✅ Assistant Manager: MUST come from tfs_user mapping (NOT project table)
-    if role == "assistant manager":
-        col = detect_existing_column(
-            cursor,
-            "tfs_user",
-            [
-                "assistant_manager_id",
-                "asst_manager_id",
-                "asst_reporting_manager_id",
-                "reporting_manager_id",
-            ],
-        )
-        if not col:
-            return [logged_in_user_id]
-
-        cursor.execute(
-            f"""
-            SELECT tu.user_id
-            FROM tfs_user tu
-            WHERE tu.is_active=1 AND tu.is_delete=1
-              AND {multi_id_match_sql(f"tu.{col}")}
-            """,
-            (v, v),
-        )
-        rows = cursor.fetchall() or []
-        ids = [int(r["user_id"]) for r in rows if r.get("user_id") is not None]
-        if logged_in_user_id not in ids:
-            ids.append(logged_in_user_id)
-        return ids
-
-    # ✅ Project Manager: also from tfs_user mapping (not project table)
-    if role in ["manager", "project manager", "product manager"]:
-        col = detect_existing_column(
-            cursor,
-            "tfs_user",
-            [
-                "reporting_manager_id",
-                "manager_id",
-                "project_manager_id",
-                "reporting_to",
-            ],
-        )
-        if not col:
-            return [logged_in_user_id]
-
-        cursor.execute(
-            f"""
-            SELECT tu.user_id
-            FROM tfs_user tu
-            WHERE tu.is_active=1 AND tu.is_delete=1
-              AND {multi_id_match_sql(f"tu.{col}")}
-            """,
-            (v, v),
-        )
-        rows = cursor.fetchall() or []
-        ids = [int(r["user_id"]) for r in rows if r.get("user_id") is not None]
-        if logged_in_user_id not in ids:
-            ids.append(logged_in_user_id)
-        return ids
+        relations = ("qa",)
+    elif role == "assistant manager":
+        relations = ("asst_manager",)
+    elif role in ["manager", "project manager", "product manager"]:
+        relations = ("project_manager",)
+    else:
+        return [logged_in_user_id]
 
-    return [logged_in_user_id]
+    vis = get_visibility(cursor, logged_in_user_id)
+    if vis is None:
+        return [logged_in_user_id]
+    return vis.user_ids(relations, active_only=True)
 
 
 # -----------------------------
@@ -346,9 +426,10 @@ def dashboard_filter():
     cursor = conn.cursor(dictionary=True)
 
     try:
-        logged_role = get_user_role(cursor, int(logged_in_user_id))
-        if not logged_role:
+        vis = get_visibility(cursor, logged_in_user_id)
+        if not vis or vis.is_active != 1:
             return api_response(404, "Logged in user not found")
+        logged_role = vis.role
 
         # ✅ USERS UNDER LOGGED-IN (HIERARCHY) FIRST
         visible_user_ids = get_subordinate_user_ids(cursor, logged_role, int(logged_in_user_id))
@@ -356,11 +437,7 @@ def dashboard_filter():
         # --------------------
         # TRACKERS (ONLY THOSE USERS)
         # --------------------
-        base_from = """
-            FROM task_work_tracker twt
-            JOIN tfs_user u ON u.user_id = twt.user_id
-            JOIN project p ON p.project_id = twt.project_id
-        """
+        base_from = DASHBOARD_BASE_FROM
         where_sql = """
             WHERE u.is_active=1 AND u.is_delete=1
               AND twt.is_active=1
@@ -380,6 +457,7 @@ def dashboard_filter():
                     "Dashboard data fetched successfully",
                     {
                         "logged_in_role": logged_role,
+                        "notes": [],
                         "filters_applied": {
                             "user_id": data.get("user_id"),
                             "project_id": data.get("project_id"),
@@ -395,6 +473,7 @@ def dashboard_filter():
                             "tracker_rows": 0,
                             "total_production": 0,
                             "total_billable_hours": 0,
+                            "non_numeric_billable_rows": 0,
                             "avg_qc_score": None,
                             "qc_days_count": 0,
                         },
@@ -408,29 +487,20 @@ def dashboard_filter():
         # Apply all existing tracker filters (UNCHANGED)
         where_sql, params = apply_tracker_filters(data, where_sql, params)
 
-        # USERS list (from trackers scope)
-        users_query = f"""
-            SELECT DISTINCT
-                u.user_id,
-                u.user_name,
-                u.user_email,
-                u.user_number,
-                u.user_address,
-                u.user_tenure,
-                r.role_name AS role,
-                d.designation,
-                tm.team_name
-            {base_from}
-            LEFT JOIN user_role r ON r.role_id = u.role_id
-            LEFT JOIN user_designation d ON d.designation_id = u.designation_id
-            LEFT JOIN team tm ON tm.team_id = u.team_id
-            {where_sql}
-            ORDER BY u.user_id DESC
-        """
-        cursor.execute(users_query, tuple(params))
-        users = cursor.fetchall()
+        # --------------------
+        # QC SUMMARY + QC PER USER
+        # Uses the QC day (temp_qc.date, NOT updated_date)
+        # Respects: visible_user_ids + (user_id/date/date_from/date_to)
+        # --------------------
+        qc_where = "WHERE 1=1"
+        qc_params: list = []
 
-        # TRACKER rows
+        if visible_user_ids is not None:
+            qc_where += f" AND q.user_id {build_in_clause_int(visible_user_ids, qc_params)}"
+
+        qc_where, qc_params = apply_qc_filters(data, qc_where, qc_params)
+
+        # TRACKER rows (latest 500; stops early on the date_time_dt index)
         tracker_query = f"""
             SELECT
                 twt.tracker_id,
@@ -450,8 +520,56 @@ def dashboard_filter():
             ORDER BY {TRACKER_DT} DESC
             LIMIT 500
         """
-        cursor.execute(tracker_query, tuple(params))
-        tracker_rows = cursor.fetchall()
+
+        # Aggregates come from tracker_daily_fact unless a date filter carries a time
+        # (facts are per day); the latest-500 tracker rows always come from trackers.
+        use_facts = fact_date_filters_ok(data.get("date_from"), data.get("date_to"))
+        fact_where = ""
+        fact_params: list = []
+        if use_facts:
+            fact_where = """
+                WHERE u.is_active=1 AND u.is_delete=1
+                  AND p.is_active=1
+            """
+            if visible_user_ids is not None:
+                fact_where += f" AND f.user_id {build_in_clause_int(visible_user_ids, fact_params)}"
+            fact_where, fact_params = apply_fact_filters(data, fact_where, fact_params)
+
+        def load_slice(c):
+            # ONE grouped pass over the slice -> summary, user ids, per-project billable,
+            # then the USERS list (from trackers scope)
+            if use_facts:
+                slice_summary, slice_user_ids, slice_billable = fact_slice_aggregates(c, fact_where, fact_params)
+            else:
+                slice_summary, slice_user_ids, slice_billable = tracker_slice_aggregates(c, where_sql, params)
+            return slice_summary, get_dashboard_users(c, slice_user_ids), slice_billable
+
+        def load_trackers(c):
+            c.execute(tracker_query, tuple(params))
+            return c.fetchall()
+
+        def load_projects(c):
+            # PROJECTS / TASKS (INDIVIDUAL ROLE LOGIC) (UNCHANGED)
+            role_projects = get_projects_for_role(c, logged_role, int(logged_in_user_id))
+            role_tasks = get_tasks_for_role(
+                c, logged_role, int(logged_in_user_id), [p["project_id"] for p in role_projects]
+            )
+            return role_projects, role_tasks
+
+        # independent reads, each on its own pooled connection (utils/fanout.py)
+        results = run_parallel(
+            {
+                "slice": load_slice,
+                "tracker": load_trackers,
+                "qc": lambda c: qc_aggregates(c, qc_where, qc_params),
+                "projects": load_projects,
+            },
+            cursor=cursor,
+        )
+        summary, users, billable_map = results["slice"]
+        tracker_rows = results["tracker"]
+        qc_summary, qc_user_map = results["qc"]
+        projects, tasks = results["projects"]
 
         tracker_files_url = f"{BASE_UPLOAD_URL}/{UPLOAD_SUBDIRS['TRACKER_FILES']}/"
         for t in tracker_rows:
@@ -463,70 +581,8 @@ def dashboard_filter():
             else:
                 t["tracker_file"] = tracker_files_url + tracker_file_temp
 
-        # SUMMARY (UNCHANGED)
-        summary_query = f"""
-            SELECT
-                COUNT(DISTINCT twt.user_id) AS user_count,
-                COUNT(DISTINCT twt.project_id) AS project_count,
-                COUNT(DISTINCT twt.task_id) AS task_count,
-                COUNT(*) AS tracker_rows,
-                COALESCE(SUM(twt.production), 0) AS total_production,
-                COALESCE(SUM(twt.billable_hours), 0) AS total_billable_hours
-            {base_from}
-            {where_sql}
-        """
-        cursor.execute(summary_query, tuple(params))
-        summary = cursor.fetchone() or {}
-
-        # --------------------
-        # QC SUMMARY + QC PER USER (NEW)
-        # Uses temp_qc.date (NOT updated_date)
-        # Respects: visible_user_ids + (user_id/date/date_from/date_to)
-        # Does NOT change tracker logic.
-        # --------------------
-        qc_where = "WHERE 1=1"
-        qc_params: list = []
-
-        if visible_user_ids is not None:
-            qc_where += f" AND tq.user_id {build_in_clause_int(visible_user_ids, qc_params)}"
-
-        qc_where, qc_params = apply_qc_filters(data, qc_where, qc_params)
-
-        # overall avg qc for current dashboard filters
-        qc_summary_query = f"""
-            SELECT
-                ROUND(SUM(tq.qc_score) / NULLIF(COUNT(*), 0), 2) AS avg_qc_score,
-                COUNT(*) AS qc_days_count
-            FROM temp_qc tq
-            {qc_where}
-              AND tq.qc_score IS NOT NULL
-        """
-        cursor.execute(qc_summary_query, tuple(qc_params))
-        qc_summary = cursor.fetchone() or {}
-        summary["avg_qc_score"] = qc_summary.get("avg_qc_score")
-        summary["qc_days_count"] = qc_summary.get("qc_days_count") or 0
-
-        # per-user avg qc
-        qc_user_query = f"""
-            SELECT
-                tq.user_id,
-                ROUND(SUM(tq.qc_score) / NULLIF(COUNT(*), 0), 2) AS avg_qc_score,
-                COUNT(*) AS qc_days_count
-            FROM temp_qc tq
-            {qc_where}
-              AND tq.qc_score IS NOT NULL
-            GROUP BY tq.user_id
-        """
-        cursor.execute(qc_user_query, tuple(qc_params))
-        qc_user_rows = cursor.fetchall() or []
-        qc_user_map = {
-            int(r["user_id"]): {
-                "avg_qc_score": r.get("avg_qc_score"),
-                "qc_days_count": r.get("qc_days_count") or 0,
-            }
-            for r in qc_user_rows
-            if r.get("user_id") is not None
-        }
+        summary["avg_qc_score"] = qc_summary["avg_qc_score"]
+        summary["qc_days_count"] = qc_summary["qc_days_count"]
 
         # attach qc fields to each user
         for urow in users:
@@ -537,33 +593,25 @@ def dashboard_filter():
             urow["avg_qc_score"] = info["avg_qc_score"]
             urow["qc_days_count"] = info["qc_days_count"]
 
-        # --------------------
-        # PROJECTS / TASKS (INDIVIDUAL ROLE LOGIC) (UNCHANGED)
-        # --------------------
-        projects = get_projects_for_role(cursor, logged_role, int(logged_in_user_id))
-        project_ids = [p["project_id"] for p in projects]
-        tasks = get_tasks_for_role(cursor, logged_role, int(logged_in_user_id), project_ids)
-
-        # Billable hours for only returned projects but from SAME tracker scope (UNCHANGED)
-        billable_query = f"""
-            SELECT
-                p.project_id,
-                COALESCE(SUM(twt.billable_hours), 0) AS total_billable_hours
-            {base_from}
-            {where_sql}
-            GROUP BY p.project_id
-        """
-        cursor.execute(billable_query, tuple(params))
-        bill_rows = cursor.fetchall() or []
-        billable_map = {r["project_id"]: r["total_billable_hours"] for r in bill_rows}
+        # Billable hours for only returned projects, from the SAME tracker pass
         for pr in projects:
             pr["total_billable_hours"] = billable_map.get(pr["project_id"], 0)
 
+        # billable_hours is free text: only plain numbers are summed (same rule
+        # as tracker_daily_fact); tell the client when some rows counted as 0
+        notes = []
+        if summary["non_numeric_billable_rows"]:
+            notes.append(
+                f"total_billable_hours counts numeric billable_hours only; "
+                f"{summary['non_numeric_billable_rows']} tracker row(s) with a non-numeric value count as 0"
+            )
+
         return api_response(
             200,
             "Dashboard data fetched successfully",
             {
                 "logged_in_role": logged_role,
+                "notes": notes,
                 "filters_applied": {
                     "user_id": data.get("user_id"),
                     "project_id": data.get("project_id"),
@@ -580,6 +628,12 @@ def dashboard_filter():
             },
         )
 
+    except FanoutTimeout:
+        import logging
+
+        logging.exception("Dashboard filter timed out")
+        return api_response(503, "Dashboard filter timed out, please narrow the filters and retry.")
+
     except Exception:
         import logging
 
@@ -1,6 +1,8 @@
 from flask import Blueprint, request
-from utils.response import api_response
+from utils.response import api_response, body_etag, etag_json_response
+from utils.dropdown_cache import dropdown_cache, dropdown_cache_key
 from config import get_db_connection
+from utils.reporting_edges import reports_to_sql
 from datetime import datetime, timedelta
 
 dropdown_bp = Blueprint("dropdown", __name__)
@@ -43,9 +45,28 @@ def get():
     dropdown_type = (data["dropdown_type"] or "").strip().lower()
 
     # Calculate month start and end for deactivated_at logic
-    month_start = datetime.now().replace(day=1)
+    month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     month_end = (month_start.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(seconds=1)
 
+    # Served from memory (and 304 on a matching If-None-Match) until the TTL
+    # passes or a project/task/user/... write invalidates it
+    cache_key = dropdown_cache_key(dropdown_type, data, month_start)
+    cached = dropdown_cache.get(cache_key)
+    if cached:
+        return etag_json_response(*cached)
+
+    resp, status = load_dropdown(data, dropdown_type, month_start, month_end)
+    if status != 200:
+        return resp, status
+
+    body = resp.get_data()
+    etag = body_etag(body)
+    dropdown_cache.put(cache_key, body, etag)
+    return etag_json_response(body, etag)
+
+
+def load_dropdown(data: dict, dropdown_type: str, month_start, month_end):
+    """Runs the dropdown query; returns api_response's (response, status)."""
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
 
@@ -222,10 +243,6 @@ def get():
 
                 user_role = get_user_role(cursor, logged_in_user_id)
 
-                clean_pm = "REPLACE(REPLACE(REPLACE(REPLACE(u.project_manager_id,'[',''),']',''), '\"',''),' ','')"
-                clean_am = "REPLACE(REPLACE(REPLACE(REPLACE(u.asst_manager_id,'[',''),']',''), '\"',''),' ','')"
-                clean_qa = "REPLACE(REPLACE(REPLACE(REPLACE(u.qa_id,'[',''),']',''), '\"',''),' ','')"
-
                 # ---------------- ADMIN / SUPER ADMIN ---------------- #
                 if user_role in ["admin", "super admin"]:
                     query = f"""
@@ -269,10 +286,10 @@ def get():
                                 AND u.deactivated_at BETWEEN %s AND %s
                             )
                         )
-                        AND FIND_IN_SET(%s, {clean_pm})
                     """
 
-                    params = [month_start, month_end, logged_in_user_id]
+                    params = [month_start, month_end]
+                    query += " AND " + reports_to_sql(params, logged_in_user_id, ("project_manager",))
 
                     if team_id:
                         query += f" AND FIND_IN_SET(%s, {clean_team})"
@@ -297,10 +314,10 @@ def get():
                                 AND u.deactivated_at BETWEEN %s AND %s
                             )
                         )
-                        AND FIND_IN_SET(%s, {clean_am})
-                        ORDER BY u.user_name
                     """
-                    params = (month_start, month_end, logged_in_user_id)
+                    params = [month_start, month_end]
+                    query += " AND " + reports_to_sql(params, logged_in_user_id, ("asst_manager",))
+                    query += " ORDER BY u.user_name"
 
                 # ---------------- QA ---------------- #
                 elif user_role == "qa":
@@ -319,10 +336,10 @@ def get():
                                 AND u.deactivated_at BETWEEN %s AND %s
                             )
                         )
-                        AND FIND_IN_SET(%s, {clean_qa})
-                        ORDER BY u.user_name
                     """
-                    params = (month_start, month_end, logged_in_user_id)
+                    params = [month_start, month_end]
+                    query += " AND " + reports_to_sql(params, logged_in_user_id, ("qa",))
+                    query += " ORDER BY u.user_name"
 
                 else:
                     return api_response(403, "Not allowed")
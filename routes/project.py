@@ -1,5 +1,6 @@
 from flask import Blueprint, request
-from utils.response import api_response
+from utils.response import api_response, list_validators
+from utils.dropdown_cache import invalidate_dropdowns
 from config import get_db_connection
 from utils.cloudinary_utils import upload_to_cloudinary, delete_from_cloudinary, FOLDER_PROJECT
 from utils.file_utils import is_allowed_file
@@ -193,6 +194,7 @@ def create_project():
         )
 
         conn.commit()
+        invalidate_dropdowns("project")
 
         return api_response(
             201,
@@ -302,6 +304,7 @@ def update_project():
         )
 
         conn.commit()
+        invalidate_dropdowns("project")
 
         return api_response(200, "Project updated successfully")
 
@@ -326,6 +329,11 @@ def list_projects():
 
     try:
 
+        # 304 when nothing in project changed since the client's copy
+        validators = list_validators(cursor, {"project": "updated_date"})
+        if validators.not_modified():
+            return validators.not_modified_response()
+
         cursor.execute("""
             SELECT
                 project_id,
@@ -377,7 +385,7 @@ def list_projects():
 
             })
 
-        return api_response(200, "Projects fetched successfully", result)
+        return validators.apply(api_response(200, "Projects fetched successfully", result))
 
     except Exception as e:
 
@@ -433,6 +441,7 @@ def delete_project():
         )
 
         conn.commit()
+        invalidate_dropdowns("project")
 
         return api_response(200, "Project deleted successfully")
 
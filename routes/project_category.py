@@ -1,7 +1,8 @@
 # routes/project_category.py
 
 from flask import Blueprint, request
-from utils.response import api_response
+from utils.response import api_response, list_validators
+from utils.dropdown_cache import invalidate_dropdowns
 from config import get_db_connection
 from datetime import datetime
 
@@ -39,6 +40,7 @@ def create_project_category():
             (project_category_name, afd_id, now_str, now_str)
         )
         conn.commit()
+        invalidate_dropdowns("project_category")
 
         return api_response(201, "Project category created successfully", {
             "project_category_id": cursor.lastrowid
@@ -100,6 +102,7 @@ def update_project_category():
             (project_category_name, afd_id, updated_str, project_category_id)
         )
         conn.commit()
+        invalidate_dropdowns("project_category")
 
         return api_response(200, "Project category updated successfully")
 
@@ -138,6 +141,7 @@ def delete_project_category():
             (updated_str, project_category_id)
         )
         conn.commit()
+        invalidate_dropdowns("project_category")
 
         return api_response(200, "Project category deleted successfully")
 
@@ -159,6 +163,15 @@ def list_project_categories():
     cursor = conn.cursor(dictionary=True)
 
     try:
+        # 304 when categories / AFDs are unchanged since the client's copy
+        validators = list_validators(
+            cursor,
+            {"project_category": "updated_date", "afd": "updated_at", "qc_afd": "updated_at"},
+            project_category_id,
+        )
+        if validators.not_modified():
+            return validators.not_modified_response()
+
         query = """
             SELECT 
                 pc.project_category_id,
@@ -196,7 +209,7 @@ def list_project_categories():
         rows = cursor.fetchall()
 
         if not rows:
-            return api_response(200, "No data found", [])
+            return validators.apply(api_response(200, "No data found", []))
 
         # -----------------------------
         # Build Nested Structure
@@ -251,7 +264,7 @@ def list_project_categories():
             pc["afd"] = afd_list
             final_result.append(pc)
 
-        return api_response(200, "Data fetched successfully", final_result)
+        return validators.apply(api_response(200, "Data fetched successfully", final_result))
 
     except Exception as e:
         return api_response(500, f"Failed to fetch data: {str(e)}")
@@ -1,6 +1,8 @@
 from flask import Blueprint, request
 from config import get_db_connection
 from utils.response import api_response
+from utils.tracker_facts import FACT_TABLE, fact_month_sql, fact_range_sql
+from utils.tracker_dates import month_key, month_year_label
 from datetime import datetime
 
 project_monthly_tracker_bp = Blueprint("project_monthly_tracker",__name__)
@@ -14,6 +16,13 @@ def validate_required(data: dict, fields: list[str]) -> str | None:
             return f"{f} is required"
     return None
 
+def to_number(val):
+    """'100' / 100 / '99.5' -> float; None when it is not a number."""
+    try:
+        return float(str(val).strip())
+    except (TypeError, ValueError):
+        return None
+
 def project_exists(cursor, project_id: int) -> bool:
     cursor.execute(
         "SELECT project_id FROM project WHERE project_id=%s AND is_active=1",
@@ -61,8 +70,15 @@ def add_project_monthly_tracker():
 
         for idx, data in enumerate(records):
             project_id = int(data["project_id"])
-            month_year = str(data["month_year"]).strip()
-            monthly_target = str(data["monthly_target"]).strip()
+            key = month_key(data["month_year"])  # Feb2026 / FEB2026 / 2026-02
+            if key is None:
+                skipped.append({"index": idx + 1, "project_id": project_id, "reason": "month_year must be like Feb2026"})
+                continue
+            month_year = month_year_label(key, upper=False)  # stored as MonYYYY, month_key is generated from it
+            monthly_target = to_number(data["monthly_target"])
+            if monthly_target is None:
+                skipped.append({"index": idx + 1, "project_id": project_id, "reason": "monthly_target must be a number"})
+                continue
             created_date = str(data.get("created_date") or now_str())
 
             # Check project exists
@@ -75,9 +91,9 @@ def add_project_monthly_tracker():
                 """
                 SELECT project_monthly_tracker_id
                 FROM project_monthly_tracker
-                WHERE project_id=%s AND month_year=%s AND is_active=1
+                WHERE project_id=%s AND month_key=%s AND is_active=1
                 """,
-                (project_id, month_year)
+                (project_id, key)
             )
             if cursor.fetchone():
                 skipped.append({"index": idx + 1, "project_id": project_id, "month_year": month_year, "reason": "Already exists"})
@@ -138,13 +154,20 @@ def update_project_monthly_tracker():
         updates.append("project_id=%s")
         params.append(int(data["project_id"]))
 
+    new_key = None
     if "month_year" in data and data["month_year"] not in [None, ""]:
+        new_key = month_key(data["month_year"])
+        if new_key is None:
+            return api_response(400, "month_year must be like Feb2026")
         updates.append("month_year=%s")
-        params.append(str(data["month_year"]).strip())
+        params.append(month_year_label(new_key, upper=False))
 
     if "monthly_target" in data and data["monthly_target"] not in [None, ""]:
+        monthly_target = to_number(data["monthly_target"])
+        if monthly_target is None:
+            return api_response(400, "monthly_target must be a number")
         updates.append("monthly_target=%s")
-        params.append(str(data["monthly_target"]).strip())
+        params.append(monthly_target)
 
     if "created_date" in data and data["created_date"] not in [None, ""]:
         updates.append("created_date=%s")
@@ -164,7 +187,7 @@ def update_project_monthly_tracker():
     try:
         cursor.execute(
             """
-            SELECT project_id, month_year
+            SELECT project_id, month_key
             FROM project_monthly_tracker
             WHERE project_monthly_tracker_id=%s
             """,
@@ -179,20 +202,20 @@ def update_project_monthly_tracker():
             if not project_exists(cursor, int(data["project_id"])):
                 return api_response(404, "Project not found or inactive")
 
-        # prevent duplicate active rows for final (project_id, month_year)
-        if ("project_id" in data and data["project_id"] not in [None, ""]) or ("month_year" in data and data["month_year"] not in [None, ""]):
+        # prevent duplicate active rows for final (project_id, month)
+        if ("project_id" in data and data["project_id"] not in [None, ""]) or new_key is not None:
             final_project_id = int(data["project_id"]) if ("project_id" in data and data["project_id"] not in [None, ""]) else int(current["project_id"])
-            final_month_year = str(data["month_year"]).strip() if ("month_year" in data and data["month_year"] not in [None, ""]) else str(current["month_year"])
+            final_month_key = new_key if new_key is not None else current["month_key"]
 
             cursor.execute(
                 """
                 SELECT project_monthly_tracker_id
                 FROM project_monthly_tracker
-                WHERE project_id=%s AND month_year=%s
+                WHERE project_id=%s AND month_key=%s
                   AND is_active=1
                   AND project_monthly_tracker_id<>%s
                 """,
-                (final_project_id, final_month_year, pm_id)
+                (final_project_id, final_month_key, pm_id)
             )
             if cursor.fetchone():
                 return api_response(409, "Monthly target for this project and month already exists")
@@ -284,43 +307,44 @@ def list_project_monthly_tracker():
         where_pmt += " AND pmt.project_id=%s"
         pmt_params.append(int(data["project_id"]))
 
+    key = None
     if data.get("month_year"):
-        where_pmt += " AND pmt.month_year=%s"
-        pmt_params.append(str(data["month_year"]).strip())
+        key = month_key(data["month_year"])  # Feb2026 / FEB2026 / 2026-02
+        if key is None:
+            return api_response(400, "month_year must be like Feb2026")
+        where_pmt += " AND pmt.month_key=%s"
+        pmt_params.append(key)
 
     if data.get("project_name"):
         where_pmt += " AND p.project_name LIKE %s"
         pmt_params.append(f"%{data['project_name']}%")
 
     # -----------------------------
-    # 2) Filters for achieved hours
+    # 2) Filters for achieved hours (tracker_daily_fact, one row per user/day/task)
     # -----------------------------
-    twt_params = []
-    where_twt = "WHERE twt.is_active=1"
+    fact_params = []
+    where_fact = "WHERE 1=1"
 
     if data.get("project_id"):
-        where_twt += " AND twt.project_id=%s"
-        twt_params.append(int(data["project_id"]))
+        where_fact += " AND f.project_id=%s"
+        fact_params.append(int(data["project_id"]))
 
-    if data.get("month_year"):
-        where_twt += " AND DATE_FORMAT(twt.date_time, '%b%Y')=%s"
-        twt_params.append(str(data["month_year"]).strip())
+    if key is not None:
+        where_fact += fact_month_sql(fact_params, key // 100, key % 100)
 
     if data.get("task_id"):
-        where_twt += " AND twt.task_id=%s"
-        twt_params.append(int(data["task_id"]))
+        where_fact += " AND f.task_id=%s"
+        fact_params.append(int(data["task_id"]))
 
     if data.get("user_id"):
-        where_twt += " AND twt.user_id=%s"
-        twt_params.append(int(data["user_id"]))
-
-    if data.get("date_from"):
-        where_twt += " AND twt.date_time >= %s"
-        twt_params.append(str(data["date_from"]).strip() + " 00:00:00")
+        where_fact += " AND f.user_id=%s"
+        fact_params.append(int(data["user_id"]))
 
-    if data.get("date_to"):
-        where_twt += " AND twt.date_time <= %s"
-        twt_params.append(str(data["date_to"]).strip() + " 23:59:59")
+    where_fact += fact_range_sql(
+        fact_params,
+        str(data["date_from"]).strip()[:10] if data.get("date_from") else None,
+        str(data["date_to"]).strip()[:10] if data.get("date_to") else None,
+    )
 
     limit = int(data.get("limit") or 200)
     offset = int(data.get("offset") or 0)
@@ -340,14 +364,14 @@ def list_project_monthly_tracker():
                 -- Original achieved/pending based on actual_billable_hours
                 COALESCE(twt_sum.achieved_hours, 0) AS achieved_hours,
                 (
-                    COALESCE(CAST(pmt.monthly_target AS DECIMAL(12,2)), 0)
+                    COALESCE(pmt.monthly_target, 0)
                     - COALESCE(twt_sum.achieved_hours, 0)
                 ) AS pending_hours,
 
                 -- NEW: achieved/pending based on billable_hours
                 COALESCE(twt_sum.tenure_achieved_hours, 0) AS tenure_achieved_hours,
                 (
-                    COALESCE(CAST(pmt.monthly_target AS DECIMAL(12,2)), 0)
+                    COALESCE(pmt.monthly_target, 0)
                     - COALESCE(twt_sum.tenure_achieved_hours, 0)
                 ) AS tenure_pending_hours,
 
@@ -358,37 +382,25 @@ def list_project_monthly_tracker():
 
             LEFT JOIN (
                 SELECT
-                    twt.project_id,
-                    DATE_FORMAT(twt.date_time, '%b%Y') AS month_year,
-                    -- existing logic
-                    SUM(
-                        CASE
-                            WHEN twt.actual_billable_hours REGEXP '^[0-9]+(\\.[0-9]+)?$'
-                            THEN CAST(twt.actual_billable_hours AS DECIMAL(12,2))
-                            ELSE 0
-                        END
-                    ) AS achieved_hours,
+                    f.project_id,
+                    YEAR(f.work_date) * 100 + MONTH(f.work_date) AS month_key,
+                    -- existing logic (numeric actual_billable_hours only)
+                    SUM(f.actual_billable_hours) AS achieved_hours,
                     -- NEW: sum based on billable_hours
-                    SUM(
-                        CASE
-                            WHEN twt.billable_hours REGEXP '^[0-9]+(\\.[0-9]+)?$'
-                            THEN CAST(twt.billable_hours AS DECIMAL(12,2))
-                            ELSE 0
-                        END
-                    ) AS tenure_achieved_hours
-                FROM task_work_tracker twt
-                {where_twt}
-                GROUP BY twt.project_id, DATE_FORMAT(twt.date_time, '%b%Y')
+                    SUM(f.billable_hours) AS tenure_achieved_hours
+                FROM {FACT_TABLE} f
+                {where_fact}
+                GROUP BY f.project_id, YEAR(f.work_date) * 100 + MONTH(f.work_date)
             ) twt_sum
                 ON twt_sum.project_id = pmt.project_id
-               AND twt_sum.month_year = pmt.month_year
+               AND twt_sum.month_key = pmt.month_key
 
             {where_pmt}
             ORDER BY pmt.project_monthly_tracker_id DESC
             LIMIT %s OFFSET %s
         """
 
-        cursor.execute(query, tuple(twt_params + pmt_params + [limit, offset]))
+        cursor.execute(query, tuple(fact_params + pmt_params + [limit, offset]))
         rows = cursor.fetchall()
 
         count_query = f"""
@@ -63,10 +63,11 @@ def assign_daily_hours():
         data_to_insert = [(agent_id, today_str, now_str) for agent_id in agent_ids]
         
         cur.executemany(sql, data_to_insert)
+        affected = cur.rowcount
         
         conn.commit()
 
-        return response(True, f"Successfully assigned 9 hours to {cur.rowcount} agents for {today_str}.", None, 200)
+        return response(True, f"Successfully assigned 9 hours to {affected} agents for {today_str}.", None, 200)
 
     except Exception as e:
         if conn:
@@ -3,6 +3,7 @@
 from flask import Blueprint, request
 from config import get_db_connection
 from utils.response import api_response
+from utils.dropdown_cache import invalidate_dropdowns
 from datetime import datetime
 
 qc_afd_bp = Blueprint("qc_afd", __name__)
@@ -138,6 +139,7 @@ def add_qc_afd():
                 inserted_ids.append(cursor.lastrowid)
 
         conn.commit()
+        invalidate_dropdowns("afd")
 
         return api_response(
             201,
@@ -277,6 +279,7 @@ def update_full_qc_afd():
                     )
 
         conn.commit()
+        invalidate_dropdowns("afd")
         return api_response(200, "Master + Categories + Subcategories updated successfully")
 
     except Exception as e:
@@ -367,6 +370,7 @@ def delete_qc_afd():
             )
 
         conn.commit()
+        invalidate_dropdowns("afd")
         return api_response(200, "Records deleted successfully")
 
     except Exception as e:
@@ -1,47 +1,53 @@
 from flask import Blueprint, request
 from config import get_db_connection
 from utils.response import api_response
+from utils.visibility import get_visibility, in_clause_int
+from utils.reporting_edges import get_manager_map
+from utils.qc_history import qc_page_size, qc_history_filters_sql, split_page, fetch_qc_children
 
 qc_history_user_bp = Blueprint("qc_history_user", __name__)
 
 
 @qc_history_user_bp.route("/view_qc_history_user_based", methods=["POST"])
 def view_qc_history_user_based():
+    """
+    Body: logged_in_user_id (required); optional date_from, date_to, project_id,
+    task_id, agent_id, page_size (default QC_HISTORY_PAGE_SIZE), cursor.
+    """
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
 
     try:
-        data = request.json
+        data = request.get_json(silent=True) or {}
         logged_in_user_id = data.get("logged_in_user_id")
 
         if not logged_in_user_id:
             return api_response(400, "logged_in_user_id is required")
 
-        # ✅ 1. Get role
-        cursor.execute("""
-            SELECT ur.role_name
-            FROM tfs_user u
-            JOIN user_role ur ON u.role_id = ur.role_id
-            WHERE u.user_id = %s
-        """, (logged_in_user_id,))
-        user = cursor.fetchone()
+        try:
+            page_size = qc_page_size(data)
+        except ValueError as e:
+            return api_response(400, str(e))
 
-        if not user:
+        # ✅ 1. Get role (+ cached visibility set)
+        vis = get_visibility(cursor, logged_in_user_id)
+
+        if not vis:
             return api_response(404, "User not found")
 
-        role = user["role_name"].strip().lower()
+        role = vis.role
 
         # 2. Base Query
         base_query = """
         SELECT
             qr.*,
+            u.user_id AS agent_id,
             u.user_name AS agent_name,
             u.team_id AS user_team_id,
             t.team_name,
             p.project_name,
             task.task_name,
-            qa.user_name AS qa_agent_name,
-            am.user_name AS assistant_manager_name
+            qa.user_name AS qa_agent_name
         FROM qc_records qr
         LEFT JOIN task_work_tracker twt ON qr.tracker_id = twt.tracker_id
         LEFT JOIN tfs_user u ON u.user_id = twt.user_id
@@ -49,94 +55,60 @@ def view_qc_history_user_based():
         LEFT JOIN project p ON p.project_id = twt.project_id
         LEFT JOIN task task ON task.task_id = twt.task_id
         LEFT JOIN tfs_user qa ON qa.user_id = qr.qa_user_id
-        LEFT JOIN tfs_user am ON u.asst_manager_id LIKE CONCAT('%', am.user_id, '%')
         """
 
         params = []
 
         # 3. Role-based filtering (JSON ARRAY SUPPORT)
         if "admin" in role:
-            pass
+            base_query += " WHERE 1=1"
 
         elif "project manager" in role:
-            base_query += """
-            WHERE (
-                JSON_CONTAINS(u.project_manager_id, %s)
-                OR u.user_id = %s
-            )
-            """
-            params.extend([f"{logged_in_user_id}", logged_in_user_id])
+            visible_ids = vis.user_ids(("project_manager",), include_deleted=True)
+            base_query += f" WHERE u.user_id {in_clause_int(visible_ids, params)}"
 
         elif "assistant manager" in role:
-            base_query += """
-            WHERE (
-                JSON_CONTAINS(u.asst_manager_id, %s)
-                OR u.user_id = %s
-            )
-            """
-            params.extend([f"{logged_in_user_id}", logged_in_user_id])
+            visible_ids = vis.user_ids(("asst_manager",), include_deleted=True)
+            base_query += f" WHERE u.user_id {in_clause_int(visible_ids, params)}"
 
         elif "qa" in role:
-            base_query += """
-            WHERE (
-                JSON_CONTAINS(u.qa_id, %s)
-                OR u.user_id = %s
-            )
-            """
-            params.extend([f"{logged_in_user_id}", logged_in_user_id])
+            visible_ids = vis.user_ids(("qa",), include_deleted=True)
+            base_query += f" WHERE u.user_id {in_clause_int(visible_ids, params)}"
 
         else:
             base_query += " WHERE u.user_id = %s "
             params.append(logged_in_user_id)
 
-        base_query += " ORDER BY qr.id DESC"
+        try:
+            base_query += qc_history_filters_sql(data, params)
+        except ValueError as e:
+            return api_response(400, str(e))
+
+        base_query += " ORDER BY qr.id DESC LIMIT %s"
 
         print("QUERY:", base_query)
         print("PARAMS:", params)
 
-        # ✅ 4. Execute
-        cursor.execute(base_query, tuple(params))
-        qc_records = cursor.fetchall()
+        # ✅ 4. Execute (one page)
+        cursor.execute(base_query, tuple(params + [page_size + 1]))
+        qc_records, has_more, next_cursor = split_page(cursor.fetchall(), page_size, "id")
 
         if not qc_records:
-            return api_response(200, "No QC records found", {"count": 0, "records": []})
-
-        qc_record_ids = [r["id"] for r in qc_records]
-
-        # 5. Reworks
-        cursor.execute(f"""
-            SELECT 
-                *,
-                rework_status as review_status
-            FROM qc_rework_history
-            WHERE qc_record_id IN ({','.join(['%s'] * len(qc_record_ids))})
-            ORDER BY qc_rework_id DESC
-        """, tuple(qc_record_ids))
-        reworks = cursor.fetchall()
-
-        # 6. Corrections
-        cursor.execute(f"""
-            SELECT 
-                *,
-                correction_status as review_status
-            FROM qc_correction_history
-            WHERE qc_record_id IN ({','.join(['%s'] * len(qc_record_ids))})
-            ORDER BY qc_correction_id DESC
-        """, tuple(qc_record_ids))
-        corrections = cursor.fetchall()
-
-        # 7. Mapping
-        rework_map = {}
-        for r in reworks:
-            rework_map.setdefault(r["qc_record_id"], []).append(r)
-
-        correction_map = {}
-        for c in corrections:
-            correction_map.setdefault(c["qc_record_id"], []).append(c)
-
-        # 8. Merge
+            return api_response(200, "No QC records found", {
+                "count": 0, "records": [], "page_size": page_size, "has_more": False, "next_cursor": None
+            })
+
+        # 5. Reworks + corrections of this page only
+        rework_map, correction_map = fetch_qc_children(cursor, [r["id"] for r in qc_records])
+
+        # 6. Assistant managers: exact user_reporting_edge lookup for the page's agents
+        asst_managers = get_manager_map(cursor, (r["agent_id"] for r in qc_records), "asst_manager")
+
+        # 7. Merge
         final_data = []
         for record in qc_records:
+            names = [m["user_name"] for m in asst_managers.get(record["agent_id"], []) if m["user_name"]]
+            record["assistant_manager_name"] = ",".join(names) or None
             record["qc_rework"] = rework_map.get(record["id"], [])
             record["qc_correction"] = correction_map.get(record["id"], [])
             final_data.append(record)
@@ -146,7 +118,10 @@ def view_qc_history_user_based():
             "QC history fetched successfully",
             {
                 "count": len(final_data),
-                "records": final_data
+                "records": final_data,
+                "page_size": page_size,
+                "has_more": has_more,
+                "next_cursor": next_cursor,
             }
         )
 
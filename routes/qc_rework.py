@@ -2,6 +2,7 @@ from flask import Blueprint, request
 from utils.response import api_response
 from config import get_db_connection
 from utils.cloudinary_utils import upload_to_cloudinary, FOLDER_QC_REWORK
+from utils.qc_history import qc_page_size, qc_history_filters_sql, split_page, fetch_qc_children
 from datetime import datetime
 
 qc_rework_bp = Blueprint("qc_rework", __name__)
@@ -128,12 +129,25 @@ def add_rework_file():
 
 @qc_rework_bp.route("/view_all_qc_history", methods=["POST"])
 def view_all_qc_history():
+    """
+    Optional body: date_from, date_to, project_id, task_id, agent_id,
+    page_size (default QC_HISTORY_PAGE_SIZE), cursor (next_cursor of the previous page).
+    """
+    data = request.get_json(silent=True) or {}
+
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
 
     try:
-        # 1️⃣ Fetch main qc_records with metadata
-        query_qc_records = """
+        try:
+            page_size = qc_page_size(data)
+            params = []
+            filters_sql = qc_history_filters_sql(data, params)
+        except ValueError as e:
+            return api_response(400, str(e))
+
+        # 1️⃣ Fetch one page of qc_records with metadata
+        query_qc_records = f"""
         SELECT
             qr.id AS qc_record_id,
             u.user_name AS agent_name,
@@ -152,49 +166,22 @@ def view_all_qc_history():
         LEFT JOIN tfs_user u ON u.user_id = twt.user_id
         LEFT JOIN project p ON p.project_id = twt.project_id
         LEFT JOIN task t ON t.task_id = twt.task_id
+        WHERE 1=1{filters_sql}
         ORDER BY qr.id DESC
+        LIMIT %s
         """
-        cursor.execute(query_qc_records)
-        qc_records = cursor.fetchall()
+        cursor.execute(query_qc_records, tuple(params + [page_size + 1]))
+        qc_records, has_more, next_cursor = split_page(cursor.fetchall(), page_size, "qc_record_id")
 
         if not qc_records:
-            return api_response(200, "No QC records found", {"count": 0, "records": []})
-
-        qc_record_ids = [r["qc_record_id"] for r in qc_records]
-
-        # 2️⃣ Fetch related reworks
-        query_reworks = f"""
-        SELECT 
-            *,
-            rework_status as review_status
-        FROM qc_rework_history
-        WHERE qc_record_id IN ({','.join(map(str, qc_record_ids))})
-        ORDER BY qc_rework_id DESC
-        """
-        cursor.execute(query_reworks)
-        reworks = cursor.fetchall()
-
-        # 3️⃣ Fetch related corrections
-        query_corrections = f"""
-        SELECT 
-            *,
-            correction_status as review_status
-        FROM qc_correction_history
-        WHERE qc_record_id IN ({','.join(map(str, qc_record_ids))})
-        ORDER BY qc_correction_id DESC
-        """
-        cursor.execute(query_corrections)
-        corrections = cursor.fetchall()
-
-        # 4️⃣ Merge data
-        rework_map = {}
-        for r in reworks:
-            rework_map.setdefault(r["qc_record_id"], []).append(r)
+            return api_response(200, "No QC records found", {
+                "count": 0, "records": [], "page_size": page_size, "has_more": False, "next_cursor": None
+            })
 
-        correction_map = {}
-        for c in corrections:
-            correction_map.setdefault(c["qc_record_id"], []).append(c)
+        # 2️⃣ Reworks + corrections of this page only
+        rework_map, correction_map = fetch_qc_children(cursor, [r["qc_record_id"] for r in qc_records])
 
+        # 3️⃣ Merge data
         final_data = []
         for record in qc_records:
             record_id = record["qc_record_id"]
@@ -205,7 +192,13 @@ def view_all_qc_history():
         return api_response(
             200,
             "QC full history fetched successfully",
-            {"count": len(final_data), "records": final_data}
+            {
+                "count": len(final_data),
+                "records": final_data,
+                "page_size": page_size,
+                "has_more": has_more,
+                "next_cursor": next_cursor,
+            }
         )
 
     except Exception as e:
@@ -221,8 +214,66 @@ def view_pending_qc_dashboard():
     cursor = conn.cursor(dictionary=True)
 
     try:
-        # 1️⃣ Base QC records with metadata
+        # 1️⃣ Latest pending REWORK per record + the version right before it
+        # (LAG over the record's whole history; only records with a pending rework)
         cursor.execute("""
+            SELECT *
+            FROM (
+                SELECT
+                    h.*,
+                    LAG(h.qc_rework_id) OVER w AS _prev_id,
+                    LAG(h.rework_qc_score) OVER w AS _prev_score,
+                    LAG(h.rework_error_list) OVER w AS _prev_errors,
+                    MAX(CASE WHEN h.rework_file_qc_status = 'pending' THEN h.qc_rework_id END)
+                        OVER (PARTITION BY h.qc_record_id) AS _latest_pending_id
+                FROM qc_rework_history h
+                WHERE h.qc_record_id IN (
+                    SELECT qc_record_id FROM qc_rework_history WHERE rework_file_qc_status = 'pending'
+                )
+                WINDOW w AS (PARTITION BY h.qc_record_id ORDER BY h.qc_rework_id)
+            ) x
+            WHERE x.qc_rework_id = x._latest_pending_id
+        """)
+        reworks = cursor.fetchall()
+
+        # 2️⃣ Latest pending CORRECTION per record + the version right before it
+        cursor.execute("""
+            SELECT *
+            FROM (
+                SELECT
+                    h.*,
+                    LAG(h.qc_correction_id) OVER w AS _prev_id,
+                    LAG(h.correction_error_list) OVER w AS _prev_errors,
+                    MAX(CASE WHEN h.correction_file_qc_status = 'pending' THEN h.qc_correction_id END)
+                        OVER (PARTITION BY h.qc_record_id) AS _latest_pending_id
+                FROM qc_correction_history h
+                WHERE h.qc_record_id IN (
+                    SELECT qc_record_id FROM qc_correction_history WHERE correction_file_qc_status = 'pending'
+                )
+                WINDOW w AS (PARTITION BY h.qc_record_id ORDER BY h.qc_correction_id)
+            ) x
+            WHERE x.qc_correction_id = x._latest_pending_id
+        """)
+        corrections = cursor.fetchall()
+
+        # 3️⃣ Maps (helper columns split off so the history rows keep their shape)
+        def _split(row):
+            helpers = {k: row.pop(k) for k in [k for k in row if k.startswith("_")]}
+            return row, helpers
+
+        rework_map = {r["qc_record_id"]: _split(r) for r in reworks}
+        correction_map = {c["qc_record_id"]: _split(c) for c in corrections}
+
+        pending_ids = sorted(set(rework_map) | set(correction_map))
+        if not pending_ids:
+            return api_response(200, "No QC records found", {
+                "count": 0,
+                "record": []
+            })
+
+        # 4️⃣ Base QC records with metadata (only those with something pending)
+        in_ph = ",".join(["%s"] * len(pending_ids))
+        cursor.execute(f"""
             SELECT
                 qr.id AS qc_record_id,
                 qr.tracker_id,
@@ -243,60 +294,19 @@ def view_pending_qc_dashboard():
             LEFT JOIN project p ON p.project_id = twt.project_id
             LEFT JOIN project_category pc ON p.project_category_id = pc.project_category_id
             LEFT JOIN task t ON t.task_id = twt.task_id
+            WHERE qr.id IN ({in_ph})
             ORDER BY qr.id DESC
-        """)
+        """, tuple(pending_ids))
         qc_records = cursor.fetchall()
 
-        if not qc_records:
-            return api_response(200, "No QC records found", {
-                "count": 0,
-                "record": []
-            })
-
-        qc_ids = [str(r["qc_record_id"]) for r in qc_records]
-
-        # 2️⃣ Latest pending REWORK
-        cursor.execute(f"""
-            SELECT r1.*
-            FROM qc_rework_history r1
-            WHERE r1.rework_file_qc_status = 'pending'
-            AND r1.qc_rework_id = (
-                SELECT MAX(r2.qc_rework_id)
-                FROM qc_rework_history r2
-                WHERE r2.qc_record_id = r1.qc_record_id
-                AND r2.rework_file_qc_status = 'pending'
-            )
-            AND r1.qc_record_id IN ({','.join(qc_ids)})
-        """)
-        reworks = cursor.fetchall()
-
-        # 3️⃣ Latest pending CORRECTION
-        cursor.execute(f"""
-            SELECT c1.*
-            FROM qc_correction_history c1
-            WHERE c1.correction_file_qc_status = 'pending'
-            AND c1.qc_correction_id = (
-                SELECT MAX(c2.qc_correction_id)
-                FROM qc_correction_history c2
-                WHERE c2.qc_record_id = c1.qc_record_id
-                AND c2.correction_file_qc_status = 'pending'
-            )
-            AND c1.qc_record_id IN ({','.join(qc_ids)})
-        """)
-        corrections = cursor.fetchall()
-
-        # 4️⃣ Maps
-        rework_map = {r["qc_record_id"]: r for r in reworks}
-        correction_map = {c["qc_record_id"]: c for c in corrections}
-
         records = []
 
-        # 5️⃣ Loop
+        # 5️⃣ Single pass, no per-record queries
         for qc in qc_records:
             rid = qc["qc_record_id"]
 
-            latest_rework = rework_map.get(rid)
-            latest_correction = correction_map.get(rid)
+            latest_rework, rework_prev = rework_map.get(rid, (None, None))
+            latest_correction, correction_prev = correction_map.get(rid, (None, None))
 
             if not latest_rework and not latest_correction:
                 continue
@@ -308,20 +318,9 @@ def view_pending_qc_dashboard():
             prev_rework_errors = None
 
             if latest_rework:
-                cursor.execute("""
-                    SELECT rework_qc_score, rework_error_list
-                    FROM qc_rework_history
-                    WHERE qc_record_id = %s
-                    AND qc_rework_id < %s
-                    ORDER BY qc_rework_id DESC
-                    LIMIT 1
-                """, (rid, latest_rework["qc_rework_id"]))
-
-                prev = cursor.fetchone()
-
-                if prev:
-                    prev_rework_score = prev["rework_qc_score"]
-                    prev_rework_errors = prev["rework_error_list"]
+                if rework_prev["_prev_id"] is not None:
+                    prev_rework_score = rework_prev["_prev_score"]
+                    prev_rework_errors = rework_prev["_prev_errors"]
                 else:
                     prev_rework_score = qc["qc_score"]
                     prev_rework_errors = qc["error_list"]
@@ -333,19 +332,8 @@ def view_pending_qc_dashboard():
             prev_corr_errors = None
 
             if latest_correction:
-                cursor.execute("""
-                    SELECT correction_error_list
-                    FROM qc_correction_history
-                    WHERE qc_record_id = %s
-                    AND qc_correction_id < %s
-                    ORDER BY qc_correction_id DESC
-                    LIMIT 1
-                """, (rid, latest_correction["qc_correction_id"]))
-
-                prev = cursor.fetchone()
-
-                if prev:
-                    prev_corr_errors = prev["correction_error_list"]
+                if correction_prev["_prev_id"] is not None:
+                    prev_corr_errors = correction_prev["_prev_errors"]
                 else:
                     prev_corr_errors = qc["error_list"]
 
@@ -1,7 +1,8 @@
 # routes/task.py
 
 from flask import Blueprint, request
-from utils.response import api_response
+from utils.response import api_response, list_validators
+from utils.dropdown_cache import invalidate_dropdowns
 from config import get_db_connection
 from utils.cloudinary_utils import upload_to_cloudinary, delete_from_cloudinary, FOLDER_TASK
 from utils.file_utils import is_allowed_file
@@ -181,6 +182,7 @@ def add_task():
             ),
         )
         conn.commit()
+        invalidate_dropdowns("task")
         return api_response(201, "Task added successfully", {
             "task_file": task_file_url(saved_filename)
         })
@@ -306,6 +308,7 @@ def update_task():
         )
 
         conn.commit()
+        invalidate_dropdowns("task")
 
         # ✅ delete old Cloudinary file only after commit
         try:
@@ -363,6 +366,7 @@ def delete_task():
             (updated_str, task_id),
         )
         conn.commit()
+        invalidate_dropdowns("task")
 
         # delete from Cloudinary after commit
         try:
@@ -389,6 +393,11 @@ def list_tasks():
     cursor = conn.cursor(dictionary=True)
 
     try:
+        # 304 when nothing in task changed since the client's copy
+        validators = list_validators(cursor, {"task": "updated_date"})
+        if validators.not_modified():
+            return validators.not_modified_response()
+
         cursor.execute(
             """
             SELECT task_id, project_id, task_team_id,
@@ -423,7 +432,7 @@ def list_tasks():
                 }
             )
 
-        return api_response(200, "Task list fetched successfully", result)
+        return validators.apply(api_response(200, "Task list fetched successfully", result))
 
     except Exception as e:
         return api_response(500, f"Failed to fetch tasks: {str(e)}")
@@ -1,9 +1,19 @@
-from flask import Blueprint, request
-from config import get_db_connection
+from flask import Blueprint, Response, current_app, request, stream_with_context
+from config import get_db_connection, get_db_pool
 from utils.response import api_response
 from utils.api_log_utils import log_api_call
 from utils.cloudinary_utils import upload_to_cloudinary, delete_from_cloudinary, FOLDER_TRACKER
+from utils.tracker_dates import TRACKER_DT_COL, tracker_dt, tracker_range_sql, tracker_month_sql, month_bounds, month_key
+from utils.visibility import get_visibility, in_clause_int
+from utils.reporting_edges import get_manager_map
+from utils.fanout import run_parallel
+from utils.tracker_facts import (
+    DAY_WEIGHT_SQL, FACT_TABLE, fact_date_filters_ok, fact_month_sql, fact_range_sql,
+    refresh_fact_day, refresh_fact_days,
+)
 from datetime import datetime, timedelta
+import base64
+import json
 import re
 import os
 
@@ -22,41 +32,11 @@ def calculate_targets(base_target, user_tenure):
     return actual_target, tenure_target
 
 
-def normalize_month_year(month_year: str) -> str:
-    month_year = (month_year or "").strip()
-    if not month_year:
-        return ""
-
-    s = month_year.lower()
-    month_abbr = s[:3].capitalize()
-    year_part = s[3:]
-    return f"{month_abbr}{year_part}"
-
-
 def get_role_context(cursor, user_id: int) -> dict:
-    cursor.execute(
-        """
-        SELECT
-            u.role_id AS user_role_id,
-            r.role_name AS user_role_name,
-            (
-                SELECT ur2.role_id
-                FROM user_role ur2
-                WHERE LOWER(TRIM(ur2.role_name)) = 'agent'
-                LIMIT 1
-            ) AS agent_role_id
-        FROM tfs_user u
-        JOIN user_role r ON r.role_id = u.role_id
-        WHERE u.user_id=%s AND u.is_delete=1
-        """,
-        (int(user_id),),
-    )
-    row = cursor.fetchone() or {}
-    return {
-        "user_role_id": row.get("user_role_id"),
-        "user_role_name": (row.get("user_role_name") or "").strip().lower(),
-        "agent_role_id": row.get("agent_role_id"),
-    }
+    vis = get_visibility(cursor, user_id)
+    if vis is None:
+        return {"user_role_id": None, "user_role_name": "", "agent_role_id": None}
+    return vis.as_role_context()
 
 
 def cleaned_csv_col(col_sql: str) -> str:
@@ -199,13 +179,15 @@ def add_tracker():
                 billable_hours, actual_billable_hours, tracker_file, tracker_note, shift, 1, now_str, now_str
             ),
         )
-        conn.commit()
         tracker_id = cursor.lastrowid
+        refresh_fact_day(cursor, user_id, now_str)
 
+        # API log goes into the same transaction as the tracker row
         device_id = form.get("device_id")
         device_type = form.get("device_type")
         api_call_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_api_call("add_tracker", user_id, device_id, device_type, api_call_time)
+        log_api_call("add_tracker", user_id, device_id, device_type, api_call_time, conn=conn)
+        conn.commit()
 
         return api_response(201, "Tracker added successfully", {"tracker_id": tracker_id})
 
@@ -350,16 +332,20 @@ def update_tracker():
                 tracker_id,
             ),
         )
+        # old and new day (date_time may have moved)
+        refresh_fact_days(cursor, [
+            (tracker["user_id"], tracker["date_time"]),
+            (tracker["user_id"], date_time),
+        ])
+        device_id = form.get("device_id")
+        device_type = form.get("device_type")
+        api_call_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_api_call("update_tracker", tracker["user_id"], device_id, device_type, api_call_time, conn=conn)
         conn.commit()
 
         # if DB commit succeeded, clear rollback marker
         new_file_saved = None
 
-        device_id = form.get("device_id")
-        device_type = form.get("device_type")
-        api_call_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_api_call("update_tracker", tracker["user_id"], device_id, device_type, api_call_time)
-
         return api_response(200, "Tracker updated successfully")
 
     except ValueError as e:
@@ -395,7 +381,7 @@ def delete_tracker():
 
     try:
         cursor.execute(
-            "SELECT tracker_id, user_id, tracker_file FROM task_work_tracker WHERE tracker_id=%s",
+            "SELECT tracker_id, user_id, tracker_file, date_time FROM task_work_tracker WHERE tracker_id=%s",
             (tracker_id,),
         )
         tracker = cursor.fetchone()
@@ -406,7 +392,8 @@ def delete_tracker():
         cursor.execute(
             "UPDATE task_work_tracker SET is_active = 0 WHERE tracker_id = %s",
             (tracker_id,),
-        )        
+        )
+        refresh_fact_day(cursor, tracker["user_id"], tracker["date_time"])
         
         # ✅ delete associated tracker_records (Node.js backend ingestion data)
         tracker_file = tracker.get("tracker_file")
@@ -415,17 +402,17 @@ def delete_tracker():
                 "DELETE FROM tracker_records WHERE file_path = %s",
                 (tracker_file,)
             )
+
+        device_id = data.get("device_id")
+        device_type = data.get("device_type")
+        api_call_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_api_call("delete_tracker", tracker["user_id"], device_id, device_type, api_call_time, conn=conn)
  
         conn.commit()
  
         # ✅ delete from Cloudinary
         safe_delete_cloudinary_tracker(tracker_file)
 
-        device_id = data.get("device_id")
-        device_type = data.get("device_type")
-        api_call_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_api_call("delete_tracker", tracker["user_id"], device_id, device_type, api_call_time)
-
         return api_response(200, "Tracker deleted successfully")
 
     except Exception as e:
@@ -439,8 +426,213 @@ def delete_tracker():
 # ------------------------
 # VIEW TRACKERS (with totals) - NO MONTH/YEAR LOGIC
 # ------------------------
+TRACKER_VIEW_PAGE_SIZE = int(os.getenv("TRACKER_VIEW_PAGE_SIZE", "500"))
+TRACKER_VIEW_MAX_PAGE_SIZE = int(os.getenv("TRACKER_VIEW_MAX_PAGE_SIZE", "2000"))
+TRACKER_STREAM_BATCH_SIZE = int(os.getenv("TRACKER_STREAM_BATCH_SIZE", "1000"))
+
+TRACKER_VIEW_SELECT = """
+    SELECT 
+        twt.*, u.user_id, u.user_id AS agent_id, u.user_name, u.user_email, u.user_tenure,
+        p.project_id, p.project_name, p.project_category_id, pc.afd_id,
+        tk.task_name, tk.qc_percentage, t.team_name,
+        (twt.production / NULLIF(twt.tenure_target, 0)) AS billable_hours
+    FROM task_work_tracker twt
+    LEFT JOIN tfs_user u ON u.user_id = twt.user_id
+    LEFT JOIN project p ON p.project_id = twt.project_id
+    LEFT JOIN task tk ON tk.task_id = twt.task_id
+    LEFT JOIN project_category pc ON pc.project_category_id = p.project_category_id
+    LEFT JOIN team t ON u.team_id = t.team_id
+"""
+
+
+def _normalize_tracker_row(t: dict) -> dict:
+    t.pop(TRACKER_DT_COL, None)
+    t["agent_id"] = t.get("user_id")
+
+    file_path = t.get("tracker_file")
+    if not file_path:
+        t["tracker_file"] = None
+    # If mistakenly prefixed with python path
+    elif not file_path.startswith("http") and "https://" in file_path:
+        t["tracker_file"] = file_path[file_path.index("https://"):]
+    return t
+
+
+def _join_distinct(values) -> str | None:
+    out = []
+    for v in values:
+        if v is not None and str(v) not in out:
+            out.append(str(v))
+    return ",".join(out) or None
+
+
+def attach_assistant_managers(cursor, rows: list, with_email: bool = True) -> list:
+    """
+    Adds assistant_manager_id / _name (/ _email) to each row, comma-joined like
+    the GROUP_CONCAT they replace. Resolved once per distinct user_id from
+    user_reporting_edge instead of three correlated tfs_user scans per row.
+    """
+    managers = get_manager_map(cursor, (r.get("user_id") for r in rows), "asst_manager")
+    for r in rows:
+        ams = managers.get(r.get("user_id"), [])
+        r["assistant_manager_id"] = _join_distinct(m["user_id"] for m in ams)
+        r["assistant_manager_name"] = _join_distinct(m["user_name"] for m in ams)
+        if with_email:
+            r["assistant_manager_email"] = _join_distinct(m["user_email"] for m in ams)
+    return rows
+
+
+def encode_tracker_cursor(row: dict) -> str:
+    """Keyset position after `row`: (date_time_dt, tracker_id), opaque to clients."""
+    dt = row.get(TRACKER_DT_COL)
+    raw = json.dumps([dt.strftime("%Y-%m-%d %H:%M:%S") if dt else None, int(row["tracker_id"])])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_tracker_cursor(token: str) -> tuple:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        dt, tracker_id = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if dt is not None:
+            datetime.strptime(dt, "%Y-%m-%d %H:%M:%S")
+        return dt, int(tracker_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def tracker_keyset_sql(params: list, cursor_token) -> str:
+    """
+    Rows strictly after the cursor in ORDER BY date_time_dt DESC, tracker_id DESC
+    (NULL datetimes sort last in DESC order).
+    """
+    if not cursor_token:
+        return ""
+    dt, tracker_id = decode_tracker_cursor(str(cursor_token))
+    col = tracker_dt()
+    if dt is None:
+        params.append(tracker_id)
+        return f" AND ({col} IS NULL AND twt.tracker_id < %s)"
+    params.extend([dt, dt, tracker_id])
+    return f" AND ({col} < %s OR ({col} = %s AND twt.tracker_id < %s) OR {col} IS NULL)"
+
+
+TRACKER_KEYSET_ORDER = f" ORDER BY {tracker_dt()} DESC, twt.tracker_id DESC"
+
+
+def _stream_trackers_ndjson(where_sql: str, params: list):
+    """
+    Yields one JSON line per tracker, walking the keyset in batches so memory
+    stays flat no matter how many rows match. Uses its own pooled connection:
+    the request's connection/cursor are released when the view returns.
+    Rows go through the app's JSON provider, so dates / Decimals look the
+    same as in the paged response.
+    """
+    dumps = current_app.json.dumps
+    conn = get_db_pool().connect()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        keyset_sql, keyset_params = "", []
+        while True:
+            cursor.execute(
+                TRACKER_VIEW_SELECT + where_sql + keyset_sql + TRACKER_KEYSET_ORDER + " LIMIT %s",
+                tuple(params + keyset_params + [TRACKER_STREAM_BATCH_SIZE]),
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            last = rows[-1]
+            next_token = encode_tracker_cursor(last)
+            attach_assistant_managers(cursor, rows)
+            for row in rows:
+                yield dumps(_normalize_tracker_row(row)) + "\n"
+            if len(rows) < TRACKER_STREAM_BATCH_SIZE:
+                break
+            keyset_params = []
+            keyset_sql = tracker_keyset_sql(keyset_params, next_token)
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def _tracker_view_totals(cursor, where: str, params: list, data: dict) -> tuple[int, dict]:
+    """
+    (total_count, totals) over the whole filtered /tracker/view set.
+    The matching users reach the assigned-hours query as a semi-join
+    subquery, not as a materialized IN list.
+    """
+    cursor.execute(
+        f"""
+        SELECT
+            COUNT(*) AS total_count,
+            COALESCE(SUM(twt.tenure_target), 0) AS total_tenure_target,
+            COALESCE(SUM(twt.production / NULLIF(twt.tenure_target, 0)), 0) AS total_billable_hours,
+            COALESCE(SUM(twt.production), 0) AS total_production,
+            COUNT(DISTINCT twt.user_id) AS total_active_agents
+        FROM task_work_tracker twt
+        LEFT JOIN tfs_user u ON u.user_id = twt.user_id
+        {where}
+        """,
+        tuple(params),
+    )
+    agg = cursor.fetchone() or {}
+
+    # Total assigned hours (temp_qc) but only for dates where trackers exist (per day, not per tracker)
+    assigned_params = []
+    assigned_where = "WHERE wt.is_active = 1"
+    if data.get("date_from") and data.get("date_to"):
+        assigned_where += tracker_range_sql(
+            assigned_params, str(data["date_from"])[:10], str(data["date_to"])[:10], alias="wt"
+        )
+    assigned_params.extend(params)
+    cursor.execute(
+        f"""
+        SELECT COALESCE(SUM(q.assigned_hours), 0) AS total_assigned
+        FROM (
+            SELECT DISTINCT wt.user_id, DATE({tracker_dt("wt")}) AS work_date
+            FROM task_work_tracker wt
+            {assigned_where}
+              AND wt.user_id IN (
+                SELECT twt.user_id
+                FROM task_work_tracker twt
+                LEFT JOIN tfs_user u ON u.user_id = twt.user_id
+                {where} AND twt.user_id IS NOT NULL
+              )
+        ) twt_distinct
+        INNER JOIN temp_qc q
+            ON q.user_id = twt_distinct.user_id
+            AND q.date = twt_distinct.work_date
+        """,
+        tuple(assigned_params),
+    )
+    total_assigned_hours = float((cursor.fetchone() or {}).get("total_assigned") or 0)
+
+    return int(agg.get("total_count") or 0), {
+        "total_tenure_target": round(float(agg.get("total_tenure_target") or 0), 2),
+        "total_billable_hours": round(float(agg.get("total_billable_hours") or 0), 2),
+        "total_production": round(float(agg.get("total_production") or 0), 2),
+        "total_assigned_hours": round(total_assigned_hours, 2),
+        "total_active_agents": int(agg.get("total_active_agents") or 0),
+    }
+
+
 @tracker_bp.route("/view", methods=["POST"])
 def view_trackers():
+    """
+    Tracker list, optionally keyset-paginated.
+
+    Request (all optional besides logged_in_user_id):
+      page_size      : rows per page (TRACKER_VIEW_PAGE_SIZE when only cursor is sent,
+                       capped at TRACKER_VIEW_MAX_PAGE_SIZE)
+      cursor         : next_cursor from the previous page
+      include_totals : true -> also recompute totals on cursor pages
+      stream         : true (or format="ndjson") -> application/x-ndjson export of every matching row (no totals)
+
+    Without page_size and cursor the response is the old full list
+    ({count, trackers, totals}, count = every matching row). Paged responses
+    add page_size / has_more / next_cursor; count is the rows on the page.
+    Totals cover the whole filtered set and are sent on the first page only
+    (no cursor) unless include_totals is set.
+    """
     print("====== INSIDE /tracker/view ======")
     data = request.get_json() or {}
 
@@ -454,45 +646,25 @@ def view_trackers():
         if not logged_in_user_id:
             return api_response(400, "logged_in_user_id is required")
 
+        paged = data.get("page_size") is not None or bool(data.get("cursor"))
+        with_totals = not data.get("cursor") or bool(data.get("include_totals"))
+        try:
+            page_size = int(data.get("page_size") or TRACKER_VIEW_PAGE_SIZE)
+        except (TypeError, ValueError):
+            return api_response(400, "page_size must be an integer")
+        page_size = max(1, min(page_size, TRACKER_VIEW_MAX_PAGE_SIZE))
+
         ctx = get_role_context(cursor, int(logged_in_user_id))
         role_name = ctx["user_role_name"]
 
         # -----------------------------
-        # Main Tracker Query
+        # Filters (shared by page, totals and stream)
         # -----------------------------
-        query = """
-        SELECT 
-            twt.*, u.user_id, u.user_id AS agent_id, u.user_name, u.user_email, u.user_tenure,
-            (SELECT GROUP_CONCAT(DISTINCT am.user_id) 
-             FROM tfs_user am 
-             WHERE u.asst_manager_id = am.user_id 
-                OR JSON_CONTAINS(u.asst_manager_id, JSON_ARRAY(am.user_id))
-            ) AS assistant_manager_id,
-            (SELECT GROUP_CONCAT(DISTINCT am.user_name) 
-             FROM tfs_user am 
-             WHERE u.asst_manager_id = am.user_id 
-                OR JSON_CONTAINS(u.asst_manager_id, JSON_ARRAY(am.user_id))
-            ) AS assistant_manager_name,
-            (SELECT GROUP_CONCAT(DISTINCT am.user_email) 
-             FROM tfs_user am 
-             WHERE u.asst_manager_id = am.user_id 
-                OR JSON_CONTAINS(u.asst_manager_id, JSON_ARRAY(am.user_id))
-            ) AS assistant_manager_email,
-            p.project_id, p.project_name, p.project_category_id, pc.afd_id,
-            tk.task_name, tk.qc_percentage, t.team_name,
-            (twt.production / NULLIF(twt.tenure_target, 0)) AS billable_hours
-        FROM task_work_tracker twt
-        LEFT JOIN tfs_user u ON u.user_id = twt.user_id
-        LEFT JOIN project p ON p.project_id = twt.project_id
-        LEFT JOIN task tk ON tk.task_id = twt.task_id
-        LEFT JOIN project_category pc ON pc.project_category_id = p.project_category_id
-        LEFT JOIN team t ON u.team_id = t.team_id
-        WHERE twt.is_active != 0
-        """
+        where = " WHERE twt.is_active != 0"
 
         # Dynamic filters
         if data.get("team_id"):
-            query += " AND u.team_id=%s"
+            where += " AND u.team_id=%s"
             params.append(data["team_id"])
         if data.get("user_id"):
             user_ids_filter = data["user_id"]
@@ -502,149 +674,103 @@ def view_trackers():
                 user_ids_filter = [user_ids_filter]
 
             placeholders = ",".join(["%s"] * len(user_ids_filter))
-            query += f" AND twt.user_id IN ({placeholders})"
+            where += f" AND twt.user_id IN ({placeholders})"
 
             params.extend(user_ids_filter)
         elif role_name not in ("admin", "super admin", "project manager"):
-            manager_id_str = str(logged_in_user_id)
-            manager_id_int = int(logged_in_user_id)
-            query += """
-                AND twt.user_id IN (
-                    SELECT tu.user_id
-                    FROM tfs_user tu
-                    WHERE tu.is_delete = 1
-                    AND (
-                        tu.project_manager_id = %s 
-                        OR tu.project_manager_id = %s
-                        OR tu.asst_manager_id = %s 
-                        OR tu.asst_manager_id = %s
-                        OR tu.qa_id = %s 
-                        OR tu.qa_id = %s
-                        OR tu.user_id = %s
-                        OR (JSON_VALID(tu.project_manager_id) AND JSON_CONTAINS(tu.project_manager_id, JSON_ARRAY(%s)))
-                        OR (JSON_VALID(tu.project_manager_id) AND JSON_CONTAINS(tu.project_manager_id, JSON_ARRAY(CAST(%s AS UNSIGNED))))
-                        OR (JSON_VALID(tu.asst_manager_id) AND JSON_CONTAINS(tu.asst_manager_id, JSON_ARRAY(%s)))
-                        OR (JSON_VALID(tu.asst_manager_id) AND JSON_CONTAINS(tu.asst_manager_id, JSON_ARRAY(CAST(%s AS UNSIGNED))))
-                        OR (JSON_VALID(tu.qa_id) AND JSON_CONTAINS(tu.qa_id, JSON_ARRAY(%s)))
-                        OR (JSON_VALID(tu.qa_id) AND JSON_CONTAINS(tu.qa_id, JSON_ARRAY(CAST(%s AS UNSIGNED))))
-                    )
-                )
-            """
-            params.extend([
-                manager_id_str, manager_id_int,  # project_manager_id
-                manager_id_str, manager_id_int,  # asst_manager_id
-                manager_id_str, manager_id_int,  # qa_id
-                manager_id_int,  # user_id
-                manager_id_str, manager_id_str,  # project_manager_id JSON
-                manager_id_str, manager_id_str,  # asst_manager_id JSON
-                manager_id_str, manager_id_str   # qa_id JSON
-            ])
+            # self + anyone reporting to me as PM / AM / QA (cached visibility set)
+            vis = get_visibility(cursor, logged_in_user_id)
+            visible_ids = vis.user_ids() if vis else [int(logged_in_user_id)]
+            where += f" AND twt.user_id {in_clause_int(visible_ids, params)}"
         if data.get("project_id"):
-            query += " AND twt.project_id=%s"
+            where += " AND twt.project_id=%s"
             params.append(data["project_id"])
         if data.get("task_id"):
-            query += " AND twt.task_id=%s"
+            where += " AND twt.task_id=%s"
             params.append(data["task_id"])
         if data.get("shift"):
-            query += " AND twt.shift=%s"
+            where += " AND twt.shift=%s"
             params.append(data["shift"].upper())
-        if data.get("date_from"):
-            df = data["date_from"]
-            if len(df) == 10: df += " 00:00:00"
-            query += " AND CAST(twt.date_time AS DATETIME) >= %s"
-            params.append(df)   
-        if data.get("date_to"):
-            dt_ = data["date_to"]
-            if len(dt_) == 10: dt_ += " 23:59:59"
-            query += " AND CAST(twt.date_time AS DATETIME) <= %s"
-            params.append(dt_)
+        where += tracker_range_sql(params, data.get("date_from"), data.get("date_to"))
         if data.get("is_active") is not None:
-            query += " AND twt.is_active=%s"
+            where += " AND twt.is_active=%s"
             params.append(data["is_active"])
         if data.get("qc_pending") is not None:
-            query += " AND twt.qc_status = %s"
+            where += " AND twt.qc_status = %s"
             params.append(data["qc_pending"])
 
             # ensure tracker file exists
-            query += " AND twt.tracker_file IS NOT NULL AND twt.tracker_file != ''"
-
-        query += " ORDER BY CAST(twt.date_time AS DATETIME) DESC"
-        cursor.execute(query, tuple(params))
-        trackers = cursor.fetchall()
-
-        # Normalize tracker_file
-        for t in trackers:
-            file_path = t.get("tracker_file")
-            t["agent_id"] = t.get("user_id")
+            where += " AND twt.tracker_file IS NOT NULL AND twt.tracker_file != ''"
 
-            if not file_path:
-                t["tracker_file"] = None
-                continue
-
-            # If already cloudinary URL, keep as is
-            if file_path.startswith("http"):
-                t["tracker_file"] = file_path
-
-            # If mistakenly prefixed with python path
-            elif "https://" in file_path:
-                t["tracker_file"] = file_path[file_path.index("https://"):]
-
-            else:
-                t["tracker_file"] = file_path
+        api_call_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         # -----------------------------
-        # Totals
+        # NDJSON export
         # -----------------------------
-        # Total assigned hours from temp_qc but only for dates where trackers exist (per day, not per tracker)
-        assigned_query = """
-            SELECT COALESCE(SUM(tqc.assigned_hours), 0) AS total_assigned
-            FROM (
-                SELECT DISTINCT twt.user_id, DATE(CAST(twt.date_time AS DATETIME)) AS work_date
-                FROM task_work_tracker twt
-                WHERE twt.is_active = 1
-            ) twt_distinct
-            INNER JOIN temp_qc tqc
-                ON tqc.user_id = twt_distinct.user_id
-                AND DATE(tqc.date) = twt_distinct.work_date
-        """
-        assigned_params = []
+        if data.get("stream") or str(data.get("format") or "").lower() == "ndjson":
+            log_api_call("view_trackers", logged_in_user_id, data.get("device_id"), data.get("device_type"), api_call_time)
+            return Response(
+                stream_with_context(_stream_trackers_ndjson(where, list(params))),
+                mimetype="application/x-ndjson",
+            )
 
-        if trackers:
-            user_ids = [t["user_id"] for t in trackers if t.get("user_id")]
-            in_ph = ",".join(["%s"]*len(user_ids))
-            assigned_query += f" WHERE twt_distinct.user_id IN ({in_ph})"
-            assigned_params.extend(user_ids)
+        # -----------------------------
+        # Full list (no page_size / cursor sent) or one keyset page
+        # -----------------------------
+        if not paged:
+            cursor.execute(TRACKER_VIEW_SELECT + where + TRACKER_KEYSET_ORDER, tuple(params))
+            trackers = cursor.fetchall()
+            has_more, next_cursor = False, None
+        else:
+            page_params = list(params)
+            try:
+                keyset_sql = tracker_keyset_sql(page_params, data.get("cursor"))
+            except ValueError as e:
+                return api_response(400, str(e))
+            page_params.append(page_size + 1)
 
-        if data.get("date_from") and data.get("date_to"):
-            assigned_query += " AND twt_distinct.work_date BETWEEN %s AND %s"
-            assigned_params.extend([data["date_from"], data["date_to"]])
+            cursor.execute(
+                TRACKER_VIEW_SELECT + where + keyset_sql + TRACKER_KEYSET_ORDER + " LIMIT %s",
+                tuple(page_params),
+            )
+            trackers = cursor.fetchall()
 
-        cursor.execute(assigned_query, tuple(assigned_params))
-        total_assigned_hours = float((cursor.fetchone() or {}).get("total_assigned") or 0)
+            has_more = len(trackers) > page_size
+            trackers = trackers[:page_size]
+            next_cursor = encode_tracker_cursor(trackers[-1]) if has_more else None
+        for t in trackers:
+            _normalize_tracker_row(t)
+        attach_assistant_managers(cursor, trackers)
 
-        
-        totals = {
-            "total_tenure_target": round(sum(float(t.get("tenure_target") or 0) for t in trackers), 2),
-            "total_billable_hours": round(sum(float(t.get("billable_hours") or 0) for t in trackers), 2),
-            "total_production": round(sum(float(t.get("production") or 0) for t in trackers), 2),
-            "total_assigned_hours": round(total_assigned_hours, 2),
-            "total_active_agents": len(set(t["user_id"] for t in trackers if t.get("user_id")))
-        }
+        total_count, totals = _tracker_view_totals(cursor, where, params, data) if with_totals else (None, None)
 
         # -----------------------------
         # Log API call
         # -----------------------------
-        log_api_call("view_trackers", logged_in_user_id, data.get("device_id"), data.get("device_type"), datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        log_api_call("view_trackers", logged_in_user_id, data.get("device_id"), data.get("device_type"), api_call_time)
+
+        if not paged:
+            return api_response(
+                200,
+                "Trackers fetched successfully",
+                {
+                    "count": len(trackers),
+                    "trackers": trackers,
+                    "totals": totals
+                }
+            )
 
-        return api_response(
-            200,
-            "Trackers fetched successfully",
-            {
-                "count": len(trackers),
-                "trackers": trackers,
-                "totals": totals
-            }
-        )
+        result = {
+            "count": len(trackers),
+            "page_size": page_size,
+            "has_more": has_more,
+            "next_cursor": next_cursor,
+            "trackers": trackers,
+        }
+        if with_totals:
+            result["total_count"] = total_count
+            result["totals"] = totals
+        return api_response(200, "Trackers fetched successfully", result)
 
     except Exception as e:
         return api_response(500, f"Failed to fetch trackers: {str(e)}")
@@ -654,23 +780,6 @@ def view_trackers():
         conn.close()
 
 
-def normalize_month_year(val):
-    """
-    Accepts: Jan2026 / jan2026 / JAN2026
-    Returns: Jan2026
-    """
-    if not val:
-        return None
-    s = str(val).strip()
-    if not s:
-        return None
-    try:
-        dt = datetime.strptime(s.title(), "%b%Y")
-        return dt.strftime("%b%Y")
-    except Exception:
-        return None
-
-
 def cleaned_csv_col(col_name: str) -> str:
     """
     For columns that store CSV-like ids e.g. "[111, 113]"
@@ -686,9 +795,6 @@ def view_daily_trackers():
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
 
-    # temp_qc date column is TEXT storing 'YYYY-MM-DD'
-    QC_DATE_COL = "date"
-
     try:
         params = []
 
@@ -696,52 +802,50 @@ def view_daily_trackers():
         if not logged_in_user_id:
             return api_response(400, "logged_in_user_id is required")
 
-        # ---------- Smart Month Detection ----------
-        month_year = None
+        # ---------- Smart Month Detection (yyyymm key) ----------
+        month_key_val = None
 
         # 1️⃣ If date filter exists → derive month from date_to OR date_from
         if data.get("date_from") or data.get("date_to"):
             try:
                 ref_date = data.get("date_to") or data.get("date_from")
                 ref_date = str(ref_date)[:10]  # ensure YYYY-MM-DD
-                dt_obj = datetime.strptime(ref_date, "%Y-%m-%d")
-                month_year = dt_obj.strftime("%b%Y")
+                month_key_val = month_key(datetime.strptime(ref_date, "%Y-%m-%d"))
             except Exception:
-                month_year = None
+                month_key_val = None
 
-        # 2️⃣ Else use explicit month_year
-        if not month_year:
-            month_year = normalize_month_year(data.get("month_year"))
+        # 2️⃣ Else use explicit month_year (Jan2026 / JAN2026 / 2026-01)
+        if not month_key_val:
+            month_key_val = month_key(data.get("month_year"))
 
         # 3️⃣ Else fallback to current month
-        if not month_year:
-            cursor.execute("SELECT DATE_FORMAT(CURDATE(), '%b%Y') AS m")
-            month_year = normalize_month_year((cursor.fetchone() or {}).get("m") or "")
+        if not month_key_val:
+            month_key_val = month_key(datetime.now())
+
+        month_start, next_month_start = month_bounds(month_key_val // 100, month_key_val % 100)
+        month_year = month_start.strftime("%b%Y")  # response label, e.g. Jan2026
 
 
         # -------- Role check
-        cursor.execute(
-            """
-            SELECT LOWER(TRIM(r.role_name)) AS role_name
-            FROM tfs_user u
-            JOIN user_role r ON r.role_id = u.role_id
-            WHERE u.user_id=%s
-            LIMIT 1
-            """,
-            (int(logged_in_user_id),),
-        )
-        role_name = ((cursor.fetchone() or {}).get("role_name") or "").lower()
+        vis = get_visibility(cursor, logged_in_user_id)
+        role_name = vis.role if vis else ""
+
+        # -------- Source: tracker_daily_fact unless a filter needs raw trackers
+        # (is_active is not a fact dimension - facts hold active trackers only;
+        # fact days have no time part)
+        date_from = str(data["date_from"]).strip() if data.get("date_from") else None
+        date_to = str(data["date_to"]).strip() if data.get("date_to") else None
+        use_facts = data.get("is_active") is None and fact_date_filters_ok(date_from, date_to)
+        src = "f" if use_facts else "twt"
 
         # -------- WHERE (same filters as /view)
-        where = "WHERE twt.is_active != 0"
+        where = "WHERE 1=1"
 
         # Month filter
-        try:
-            dt = datetime.strptime(month_year, "%b%Y")
-            where += " AND YEAR(CAST(twt.date_time AS DATETIME))=%s AND MONTH(CAST(twt.date_time AS DATETIME))=%s"
-            params.extend([dt.year, dt.month])
-        except Exception:
-            pass
+        if use_facts:
+            where += fact_month_sql(params, month_start.year, month_start.month)
+        else:
+            where += tracker_month_sql(params, month_start.year, month_start.month)
 
         # Team filter
         if data.get("team_id"):
@@ -750,105 +854,115 @@ def view_daily_trackers():
 
         # Project/task filters
         if data.get("project_id"):
-            where += " AND twt.project_id=%s"
+            where += f" AND {src}.project_id=%s"
             params.append(data["project_id"])
 
         if data.get("task_id"):
-            where += " AND twt.task_id=%s"
+            where += f" AND {src}.task_id=%s"
             params.append(data["task_id"])
 
         if data.get("shift"):
-            where += " AND twt.shift = %s"
+            where += f" AND {src}.shift = %s"
             params.append(data["shift"].upper())
 
         # Date range filters
-        if data.get("date_from"):
-            date_from = str(data["date_from"])
-            if len(date_from) == 10:
-                date_from += " 00:00:00"
-            where += " AND CAST(twt.date_time AS DATETIME) >= %s"
-            params.append(date_from)
-
-        if data.get("date_to"):
-            date_to = str(data["date_to"])
-            if len(date_to) == 10:
-                date_to += " 23:59:59"
-            where += " AND CAST(twt.date_time AS DATETIME) <= %s"
-            params.append(date_to)
+        if use_facts:
+            where += fact_range_sql(params, date_from, date_to)
+        else:
+            where += tracker_range_sql(params, date_from, date_to)
 
-        if data.get("is_active") is not None:
-            where += " AND twt.is_active=%s"
-            params.append(data["is_active"])
+        # active trackers unless asked otherwise (same rule as tracker_daily_fact)
+        if not use_facts:
+            if data.get("is_active") is not None:
+                where += " AND twt.is_active=%s"
+                params.append(data["is_active"])
+            else:
+                where += " AND twt.is_active = 1"
 
         # User filter OR restriction (manager logic)
         if data.get("user_id"):
-            where += " AND twt.user_id=%s"
+            where += f" AND {src}.user_id=%s"
             params.append(data["user_id"])
         else:
             if "admin" not in role_name and "project manager" not in role_name:
-                manager_id_str = str(logged_in_user_id)
-                manager_id_int = int(logged_in_user_id)
-                where += f"""
-                    AND twt.user_id IN (
-                        SELECT tu.user_id
-                        FROM tfs_user tu
-                        WHERE tu.is_delete = 1
-                          AND (
-                                tu.project_manager_id = %s
-                                OR tu.project_manager_id = %s
-                                OR tu.asst_manager_id = %s
-                                OR tu.asst_manager_id = %s
-                                OR tu.qa_id = %s
-                                OR tu.qa_id = %s
-                                OR tu.user_id = %s
-                                OR (JSON_VALID(tu.project_manager_id) AND JSON_CONTAINS(tu.project_manager_id, JSON_ARRAY(%s)))
-                                OR (JSON_VALID(tu.project_manager_id) AND JSON_CONTAINS(tu.project_manager_id, JSON_ARRAY(CAST(%s AS UNSIGNED))))
-                                OR (JSON_VALID(tu.asst_manager_id) AND JSON_CONTAINS(tu.asst_manager_id, JSON_ARRAY(%s)))
-                                OR (JSON_VALID(tu.asst_manager_id) AND JSON_CONTAINS(tu.asst_manager_id, JSON_ARRAY(CAST(%s AS UNSIGNED))))
-                                OR (JSON_VALID(tu.qa_id) AND JSON_CONTAINS(tu.qa_id, JSON_ARRAY(%s)))
-                                OR (JSON_VALID(tu.qa_id) AND JSON_CONTAINS(tu.qa_id, JSON_ARRAY(CAST(%s AS UNSIGNED))))
-                          )
-                    )
-                """
-                params.extend([
-                    manager_id_str, manager_id_int,
-                    manager_id_str, manager_id_int,
-                    manager_id_str, manager_id_int,
-                    manager_id_int,
-                    manager_id_str, manager_id_str,
-                    manager_id_str, manager_id_str,
-                    manager_id_str, manager_id_str
-                ])
+                # self + anyone reporting to me as PM / AM / QA (cached visibility set)
+                visible_ids = vis.user_ids() if vis else [int(logged_in_user_id)]
+                where += f" AND {src}.user_id {in_clause_int(visible_ids, params)}"
 
         # -------- Daily aggregation + cumulative + daily required
-        query = f"""
+        if use_facts:
+            # per-day rows are pre-aggregated; cumulative sums are window functions
+            # over the (small) filtered month instead of a correlated subquery per row.
+            # Worked-day weight comes from temp_qc (one row per user/day).
+            cte = f"""
+            WITH daily AS (
+                SELECT
+                    f.user_id,
+                    NULLIF(f.shift, '') AS shift,
+                    f.work_date,
+                    SUM(f.tenure_billable_hours) AS total_billable_hours_day,
+                    CAST(SUM(f.tracker_count) AS SIGNED) AS trackers_count_day
+                FROM {FACT_TABLE} f
+                LEFT JOIN tfs_user u ON u.user_id = f.user_id
+                {where}
+                GROUP BY f.user_id, f.shift, f.work_date
+            ),
+            worked_days AS (
+                SELECT
+                    f.user_id,
+                    f.work_date,
+                    SUM(COALESCE(MAX({DAY_WEIGHT_SQL}), 0))
+                        OVER (PARTITION BY f.user_id ORDER BY f.work_date)
+                        AS worked_days_till_day
+                FROM {FACT_TABLE} f
+                LEFT JOIN tfs_user u ON u.user_id = f.user_id
+                LEFT JOIN temp_qc q
+                    ON q.user_id = f.user_id
+                    AND q.date = f.work_date
+                {where}
+                GROUP BY f.user_id, f.work_date
+            ),
+            daily_with_cum AS (
+                SELECT
+                    d.*,
+                    SUM(d.total_billable_hours_day)
+                        OVER (PARTITION BY d.user_id ORDER BY d.work_date)
+                        AS cumulative_billable_hours_till_day,
+                    wd.worked_days_till_day
+                FROM daily d
+                JOIN worked_days wd
+                  ON wd.user_id = d.user_id
+                 AND wd.work_date = d.work_date
+            )
+            """
+        else:
+            cte = f"""
             WITH daily AS (
                 SELECT DISTINCT
                     twt.user_id,
                     twt.shift,
-                    DATE(CAST(twt.date_time AS DATETIME)) AS work_date,
+                    DATE({tracker_dt()}) AS work_date,
                     SUM(COALESCE(twt.production, 0) / NULLIF(twt.tenure_target, 0)) AS total_billable_hours_day,
                     COUNT(*) AS trackers_count_day
                 FROM task_work_tracker twt
                 LEFT JOIN tfs_user u ON u.user_id = twt.user_id
                 {where}
-                GROUP BY twt.user_id, twt.shift, DATE(CAST(twt.date_time AS DATETIME))
+                GROUP BY twt.user_id, twt.shift, DATE({tracker_dt()})
             ),
             worked_days AS (
                 SELECT DISTINCT
                     twt.user_id,
-                    DATE(CAST(twt.date_time AS DATETIME)) AS work_date,
+                    DATE({tracker_dt()}) AS work_date,
                     CASE
-                        WHEN tq.assigned_hours = 4.5 THEN 0.5
+                        WHEN q.assigned_hours = 4.5 THEN 0.5
                         ELSE 1
                     END AS day_weight
                 FROM task_work_tracker twt
                 LEFT JOIN tfs_user u ON u.user_id = twt.user_id
-                INNER JOIN temp_qc tq
-                    ON tq.user_id = twt.user_id
-                    AND DATE(tq.date) = DATE(CAST(twt.date_time AS DATETIME))
-                    AND tq.assigned_hours IS NOT NULL
-                    AND tq.assigned_hours > 0
+                INNER JOIN temp_qc q
+                    ON q.user_id = twt.user_id
+                    AND q.date = DATE({tracker_dt()})
+                    AND q.assigned_hours > 0
                 {where}
             ),
             daily_with_cum AS (
@@ -865,6 +979,9 @@ def view_daily_trackers():
                     ) AS worked_days_till_day
                 FROM daily d
             )
+            """
+
+        query = cte + f"""
             SELECT
                 dwc.user_id,
                 dwc.shift,
@@ -874,17 +991,7 @@ def view_daily_trackers():
                 t.team_id,
                 t.team_name,
 
-                -- ✅ assistant manager info (GROUP_CONCAT to prevent duplicates)
-                (SELECT GROUP_CONCAT(DISTINCT am.user_id) 
-                 FROM tfs_user am 
-                 WHERE u.asst_manager_id = am.user_id 
-                    OR JSON_CONTAINS(u.asst_manager_id, JSON_ARRAY(am.user_id))
-                ) AS assistant_manager_id,
-                (SELECT GROUP_CONCAT(DISTINCT am.user_name) 
-                 FROM tfs_user am 
-                 WHERE u.asst_manager_id = am.user_id 
-                    OR JSON_CONTAINS(u.asst_manager_id, JSON_ARRAY(am.user_id))
-                ) AS assistant_manager_name,
+                -- assistant manager info: attach_assistant_managers() after fetch
 
                 dwc.work_date,
 
@@ -894,22 +1001,22 @@ def view_daily_trackers():
                 ROUND(dwc.cumulative_billable_hours_till_day, 4)
                     AS cumulative_billable_hours_till_day,
 
-                -- QC data from separate tables (temp_qc takes priority for historical data)
-                COALESCE(tqc.qc_score, qr.qc_score) AS qc_score,
-                COALESCE(tqc.assigned_hours, 0) AS assigned_hours,
+                -- QC day: temp_qc score takes priority over the qc_records average
+                COALESCE(q.qc_score, qr.qc_score) AS qc_score,
+                COALESCE(q.assigned_hours, 0) AS assigned_hours,
 
                 umt.user_monthly_tracker_id,
-                COALESCE(CAST(umt.monthly_target AS DECIMAL(10,2)), 0) AS monthly_target,
+                COALESCE(umt.monthly_target, 0) AS monthly_target,
                 COALESCE(umt.extra_assigned_hours, 0) AS extra_assigned_hours,
                 (
-                  COALESCE(CAST(umt.monthly_target AS DECIMAL(10,2)), 0)
+                  COALESCE(umt.monthly_target, 0)
                   + COALESCE(umt.extra_assigned_hours, 0)
                 ) AS monthly_total_target,
 
-                CAST(umt.working_days AS DECIMAL(10,2)) AS working_days,
+                umt.working_days AS working_days,
 
                 GREATEST(
-                    COALESCE(CAST(umt.working_days AS DECIMAL(10,2)), 0)
+                    COALESCE(umt.working_days, 0)
                     - COALESCE(dwc.worked_days_till_day, 0),
                     0
                 ) AS pending_days_after_this_day,
@@ -917,21 +1024,21 @@ def view_daily_trackers():
                 CASE
                   WHEN umt.user_monthly_tracker_id IS NULL THEN NULL
                   WHEN GREATEST(
-                        COALESCE(CAST(umt.working_days AS DECIMAL(10,2)), 0)
+                        COALESCE(umt.working_days, 0)
                         - COALESCE(dwc.worked_days_till_day, 0),
                         0
                       ) = 0 THEN NULL
                   ELSE
                     (
                       (
-                        COALESCE(CAST(umt.monthly_target AS DECIMAL(10,2)), 0)
+                        COALESCE(umt.monthly_target, 0)
                         + COALESCE(umt.extra_assigned_hours, 0)
                       )
                       - COALESCE(dwc.cumulative_billable_hours_till_day, 0)
                     )
                     / NULLIF(
                         GREATEST(
-                            COALESCE(CAST(umt.working_days AS DECIMAL(10,2)), 0)
+                            COALESCE(umt.working_days, 0)
                             - COALESCE(dwc.worked_days_till_day, 0),
                             0
                         ),
@@ -948,35 +1055,47 @@ def view_daily_trackers():
                     DATE(date_of_file_submission) AS qc_date,
                     ROUND(AVG(qc_score), 2) AS qc_score
                 FROM qc_records
+                WHERE date_of_file_submission >= %s AND date_of_file_submission < %s
                 GROUP BY agent_id, DATE(date_of_file_submission)
             ) qr
             ON qr.agent_id = dwc.user_id
             AND qr.qc_date = dwc.work_date
 
-            LEFT JOIN temp_qc tqc
-              ON tqc.user_id = dwc.user_id
-             AND tqc.date = DATE_FORMAT(dwc.work_date, '%Y-%m-%d')
+            LEFT JOIN temp_qc q
+              ON q.user_id = dwc.user_id
+             AND q.date = dwc.work_date
 
             LEFT JOIN user_monthly_tracker umt
               ON umt.user_id = dwc.user_id
              AND umt.is_active = 1
-             AND umt.month_year = %s
+             AND umt.month_key = %s
 
             ORDER BY dwc.work_date DESC, u.user_name ASC
         """
 
-        final_params = list(params) + list(params) + [month_year]
+        final_params = list(params) + list(params) + [month_start, next_month_start, month_key_val]
         cursor.execute(query, tuple(final_params))
         rows = cursor.fetchall()
 
         # -------- month_summary
         user_ids = sorted({r.get("user_id") for r in rows if r.get("user_id") is not None})
-        month_summary = []
+        tasks = {"managers": lambda c: attach_assistant_managers(c, rows, with_email=False)}
 
         if user_ids:
             in_ph = ",".join(["%s"] * len(user_ids))
             team_id = data.get("team_id")  # may be None
 
+            # Worked days count up to a cutoff: today for the current month, the
+            # whole month for past months, nothing for future months.
+            today = datetime.now().date()
+            if month_start.date() <= today < next_month_start.date():
+                cutoff_next = datetime(today.year, today.month, today.day) + timedelta(days=1)
+            elif today >= next_month_start.date():
+                cutoff_next = next_month_start
+            else:
+                cutoff_next = month_start
+
+            # One grouped pass over the month's trackers, joined once per user
             summary_query = f"""
                 SELECT
                     u.user_id,
@@ -986,108 +1105,67 @@ def view_daily_trackers():
                     t.team_id,
                     t.team_name,
 
-                    m.mon AS month_year,
+                    %s AS month_year,
                     umt.user_monthly_tracker_id,
-                    COALESCE(CAST(umt.monthly_target AS DECIMAL(10,2)), 0) AS monthly_target,
+                    COALESCE(umt.monthly_target, 0) AS monthly_target,
                     COALESCE(umt.extra_assigned_hours, 0) AS extra_assigned_hours,
                     (
-                      COALESCE(CAST(umt.monthly_target AS DECIMAL(10,2)), 0)
+                      COALESCE(umt.monthly_target, 0)
                       + COALESCE(umt.extra_assigned_hours, 0)
                     ) AS monthly_total_target,
-                    COALESCE((
-                      SELECT SUM(twt3.production / NULLIF(twt3.tenure_target, 0))
-                      FROM task_work_tracker twt3
-                      WHERE twt3.user_id = u.user_id
-                        AND twt3.is_active = 1
-                        AND (YEAR(CAST(twt3.date_time AS DATETIME))*100 + MONTH(CAST(twt3.date_time AS DATETIME))) = m.yyyymm
-                    ), 0) AS total_billable_hours_month,
+                    COALESCE(agg.billable_hours, 0) AS total_billable_hours_month,
                     CASE
                       WHEN umt.user_monthly_tracker_id IS NULL THEN NULL
-                      ELSE GREATEST(
-                             COALESCE(CAST(umt.working_days AS SIGNED), 0)
-                             - COALESCE((
-                                 SELECT COUNT(DISTINCT DATE(CAST(twt2.date_time AS DATETIME)))
-                                 FROM task_work_tracker twt2
-                                 WHERE twt2.user_id = u.user_id
-                                   AND twt2.is_active = 1
-                                   AND (YEAR(CAST(twt2.date_time AS DATETIME))*100 + MONTH(CAST(twt2.date_time AS DATETIME))) = m.yyyymm
-                                   AND DATE(CAST(twt2.date_time AS DATETIME)) <= m.cutoff
-                               ), 0),
-                             0
-                           )
+                      ELSE GREATEST(COALESCE(umt.working_days, 0) - COALESCE(agg.worked_days, 0), 0)
                     END AS pending_days,
                     CASE
                       WHEN umt.user_monthly_tracker_id IS NULL THEN NULL
-                      WHEN GREATEST(
-                             COALESCE(CAST(umt.working_days AS SIGNED), 0)
-                             - COALESCE((
-                                 SELECT COUNT(DISTINCT DATE(CAST(twt2.date_time AS DATETIME)))
-                                 FROM task_work_tracker twt2
-                                 WHERE twt2.user_id = u.user_id
-                                   AND twt2.is_active = 1
-                                   AND (YEAR(CAST(twt2.date_time AS DATETIME))*100 + MONTH(CAST(twt2.date_time AS DATETIME))) = m.yyyymm
-                                   AND DATE(CAST(twt2.date_time AS DATETIME)) <= m.cutoff
-                               ), 0),
-                             0
-                           ) = 0 THEN NULL
+                      WHEN GREATEST(COALESCE(umt.working_days, 0) - COALESCE(agg.worked_days, 0), 0) = 0 THEN NULL
                       ELSE
                         (
                           (
-                            COALESCE(CAST(umt.monthly_target AS DECIMAL(10,2)), 0)
+                            COALESCE(umt.monthly_target, 0)
                             + COALESCE(umt.extra_assigned_hours, 0)
                           )
-                          - COALESCE((
-                              SELECT SUM(twt3.production / NULLIF(twt3.tenure_target, 0))
-                              FROM task_work_tracker twt3
-                              WHERE twt3.user_id = u.user_id
-                                AND twt3.is_active = 1
-                                AND (YEAR(CAST(twt3.date_time AS DATETIME))*100 + MONTH(CAST(twt3.date_time AS DATETIME))) = m.yyyymm
-                            ), 0)
+                          - COALESCE(agg.billable_hours, 0)
                         )
-                        / NULLIF(
-                            GREATEST(
-                              COALESCE(CAST(umt.working_days AS SIGNED), 0)
-                              - COALESCE((
-                                  SELECT COUNT(DISTINCT DATE(CAST(twt2.date_time AS DATETIME)))
-                                  FROM task_work_tracker twt2
-                                  WHERE twt2.user_id = u.user_id
-                                    AND twt2.is_active = 1
-                                    AND (YEAR(CAST(twt2.date_time AS DATETIME))*100 + MONTH(CAST(twt2.date_time AS DATETIME))) = m.yyyymm
-                                    AND DATE(CAST(twt2.date_time AS DATETIME)) <= m.cutoff
-                                ), 0),
-                              0
-                            ),
-                            0
-                          )
+                        / GREATEST(COALESCE(umt.working_days, 0) - COALESCE(agg.worked_days, 0), 0)
                     END AS daily_required_hours
                 FROM tfs_user u
                 LEFT JOIN team t ON t.team_id = u.team_id
-                CROSS JOIN (
+                LEFT JOIN (
                     SELECT
-                      %s AS mon,
-                      CAST(DATE_FORMAT(STR_TO_DATE(CONCAT('01-', %s), '%d-%b%Y'), '%Y%m') AS UNSIGNED) AS yyyymm,
-                      CASE
-                        WHEN (YEAR(CURDATE())*100 + MONTH(CURDATE())) =
-                             CAST(DATE_FORMAT(STR_TO_DATE(CONCAT('01-', %s), '%d-%b%Y'), '%Y%m') AS UNSIGNED)
-                        THEN CURDATE()
-                        WHEN (YEAR(CURDATE())*100 + MONTH(CURDATE())) >
-                             CAST(DATE_FORMAT(STR_TO_DATE(CONCAT('01-', %s), '%d-%b%Y'), '%Y%m') AS UNSIGNED)
-                        THEN LAST_DAY(STR_TO_DATE(CONCAT('01-', %s), '%d-%b%Y'))
-                        ELSE DATE_SUB(STR_TO_DATE(CONCAT('01-', %s), '%d-%b%Y'), INTERVAL 1 DAY)
-                      END AS cutoff
-                ) m
+                        twt.user_id,
+                        SUM(twt.production / NULLIF(twt.tenure_target, 0)) AS billable_hours,
+                        COUNT(DISTINCT CASE WHEN {tracker_dt()} < %s THEN DATE({tracker_dt()}) END) AS worked_days
+                    FROM task_work_tracker twt
+                    WHERE twt.user_id IN ({in_ph})
+                      AND twt.is_active = 1
+                      AND {tracker_dt()} >= %s AND {tracker_dt()} < %s
+                    GROUP BY twt.user_id
+                ) agg ON agg.user_id = u.user_id
                 LEFT JOIN user_monthly_tracker umt
                   ON umt.user_id = u.user_id
                  AND umt.is_active = 1
-                 AND umt.month_year = m.mon
+                 AND umt.month_key = %s
                 WHERE u.user_id IN ({in_ph})
                   -- ✅ team filter applied to summary too
                   AND (%s IS NULL OR u.team_id = %s)
             """
 
-            summary_params = [month_year] * 6 + user_ids + [team_id, team_id]
-            cursor.execute(summary_query, tuple(summary_params))
-            month_summary = cursor.fetchall()
+            summary_params = (
+                [month_year, cutoff_next] + user_ids + [month_start, next_month_start]
+                + [month_key_val] + user_ids + [team_id, team_id]
+            )
+
+            def load_month_summary(c):
+                c.execute(summary_query, tuple(summary_params))
+                return c.fetchall()
+
+            tasks["month_summary"] = load_month_summary
+
+        # assistant managers and month_summary only depend on `rows`: run side by side
+        month_summary = run_parallel(tasks, cursor=cursor).get("month_summary", [])
 
         # -------- Response KEYS SAME AS /view
         return api_response(
@@ -1,10 +1,14 @@
 # routes/user.py
 from flask import Blueprint, request
-from utils.response import api_response
+from utils.response import api_response, list_validators
+from utils.dropdown_cache import invalidate_dropdowns
 from config import get_db_connection, UPLOAD_SUBDIRS, BASE_UPLOAD_URL, UPLOAD_FOLDER
 from utils.security import decrypt_password, encrypt_password, safe_decrypt_password
 from utils.validators import validate_request
 from utils.json_utils import to_db_json
+from utils.reporting_edges import sync_user_edges_from_columns, reports_to_sql, relations_for_role
+from utils.visibility import invalidate_visibility
+from utils.schema_registry import get_schema
 from datetime import datetime,timedelta
 import json
 import os
@@ -179,6 +183,23 @@ def list_users():
         if role == "agent":
             return api_response(200, "No users available", [])
 
+        # 304 when no user (or role / designation / team) changed since the
+        # client's copy; the lookup tables have no timestamp, so they are
+        # versioned on a checksum of the columns joined below. The month
+        # matters for the deactivated_at window
+        validators = list_validators(
+            cursor,
+            {
+                "tfs_user": "updated_date",
+                "user_role": ("role_id", "role_name"),
+                "user_designation": ("designation_id", "designation"),
+                "team": ("team_id", "team_name"),
+            },
+            (int(user_id), date_from, date_to, data.get("is_active"), datetime.now().strftime("%Y%m")),
+        )
+        if validators.not_modified():
+            return validators.not_modified_response()
+
         query = """
             SELECT
                 u.user_id,
@@ -224,46 +245,10 @@ def list_users():
             
         params.append(month_val)
 
-        # ✅ Role-based filtering (MariaDB-safe; supports BOTH JSON arrays and comma/bracket strings)
-        # This avoids: invalid JSON errors + missing matches when stored value isn't valid JSON
-        if role == "qa":
-            query += """
-                AND (
-                    TRIM(COALESCE(u.qa_id, '')) = %s
-                    OR FIND_IN_SET(
-                        %s,
-                        REPLACE(REPLACE(REPLACE(REPLACE(COALESCE(u.qa_id,''), '[',''), ']',''), '"',''), ' ', '')
-                    ) > 0
-                )
-            """
-            params.append(str(int(user_id)))   # exact match
-            params.append(str(int(user_id)))   # FIND_IN_SET
-
-        elif role == "assistant manager":
-            query += """
-                AND (
-                    TRIM(COALESCE(u.asst_manager_id, '')) = %s
-                    OR FIND_IN_SET(
-                        %s,
-                        REPLACE(REPLACE(REPLACE(REPLACE(COALESCE(u.asst_manager_id,''), '[',''), ']',''), '"',''), ' ', '')
-                    ) > 0
-                )
-            """
-            params.append(str(int(user_id)))   # exact match
-            params.append(str(int(user_id)))   # FIND_IN_SET
-
-        elif role in ["manager", "project manager"]:
-            query += """
-                AND (
-                    TRIM(COALESCE(u.project_manager_id, '')) = %s
-                    OR FIND_IN_SET(
-                        %s,
-                        REPLACE(REPLACE(REPLACE(REPLACE(COALESCE(u.project_manager_id,''), '[',''), ']',''), '"',''), ' ', '')
-                    ) > 0
-                )
-            """
-            params.append(str(int(user_id)))   # exact match
-            params.append(str(int(user_id)))   # FIND_IN_SET
+        # ✅ Role-based filtering via user_reporting_edge (indexed, no string parsing)
+        relations = relations_for_role(role)
+        if relations:
+            query += " AND " + reports_to_sql(params, int(user_id), relations)
 
         if data.get("is_active") is not None:
             query += " AND u.is_active = %s"
@@ -312,7 +297,7 @@ def list_users():
             if user.get("user_password"):
                 user["user_password"] = safe_decrypt_password(user["user_password"])
 
-        return api_response(200, "Users fetched successfully", users)
+        return validators.apply(api_response(200, "Users fetched successfully", users))
 
     except Exception as e:
         return api_response(500, f"Failed to fetch users: {str(e)}")
@@ -435,7 +420,8 @@ def update_user():
                 print("DELETE FAILED (user update):", e, "old_file=", old_profile_file)
 
             user_fields["profile_picture"] = new_filename
-            user_fields["profile_picture_base64"] = None  # clear base64 if column exists
+            if get_schema().has_column("tfs_user", "profile_picture_base64"):
+                user_fields["profile_picture_base64"] = None  # clear base64 if column exists
 
         # build update
         for col, val in user_fields.items():
@@ -456,7 +442,12 @@ def update_user():
         user_update_vals.append(user_id)
         cursor.execute(update_user_query, user_update_vals)
 
+        # keep user_reporting_edge in step with the manager columns just written
+        sync_user_edges_from_columns(cursor, int(user_id), user_fields)
+
         conn.commit()
+        invalidate_dropdowns("tfs_user")
+        invalidate_visibility()
         return api_response(200, "User updated successfully")
 
     except Exception as e:
@@ -497,10 +488,12 @@ def delete_user():
 
         cursor.execute("""
             UPDATE tfs_user
-            SET is_delete = 0, is_active = 0
+            SET is_delete = 0, is_active = 0, updated_date = NOW()
             WHERE user_id = %s
         """, (user_id,))
         conn.commit()
+        invalidate_dropdowns("tfs_user")
+        invalidate_visibility()
 
         try:
             safe_remove_profile_pic(profile_file)
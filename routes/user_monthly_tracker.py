@@ -3,31 +3,60 @@
 from flask import Blueprint, request
 from config import get_db_connection
 from utils.response import api_response
+from utils.tracker_facts import FACT_TABLE, fact_month_sql
+from utils.visibility import get_visibility, in_clause_int
+from utils.tracker_dates import date_month_sql, month_key, month_year_label
 from datetime import datetime, timedelta
 
 user_monthly_tracker_bp = Blueprint("user_monthly_tracker", __name__)
 
-# task_work_tracker.date_time is TEXT like "YYYY-MM-DD HH:MM:SS"
-TRACKER_DT = "CAST(twt.date_time AS DATETIME)"
-TRACKER_YEAR_MONTH = f"(YEAR({TRACKER_DT})*100 + MONTH({TRACKER_DT}))"
-
 
 def now_str() -> str:
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 
-def month_year_to_yyyymm_sql(month_year_col: str) -> str:
+def to_number(val):
+    """'160' / 160 / '22.5' -> float; None when it is not a number."""
+    try:
+        return float(str(val).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def user_fact_join(fact_where_sql: str) -> str:
     """
-    Your DB stores month_year like 'JAN2026', 'DEC2025' (MONYYYY).
-    Convert MONYYYY -> integer YYYYMM inside SQL.
+    Per-user tracker totals from tracker_daily_fact (aliased agg), replacing a
+    LEFT JOIN onto every task_work_tracker row of the user + GROUP BY.
     """
     return f"""
-    CAST(
-      DATE_FORMAT(
-        STR_TO_DATE(CONCAT('01-', {month_year_col}), '%d-%b%Y'),
-        '%Y%m'
-      ) AS UNSIGNED
-    )
+        LEFT JOIN (
+            SELECT
+                f.user_id,
+                SUM(f.tenure_billable_hours) AS billable_hours,
+                SUM(f.production) AS production,
+                CAST(SUM(f.tracker_count) AS SIGNED) AS tracker_rows
+            FROM {FACT_TABLE} f
+            WHERE 1=1 {fact_where_sql}
+            GROUP BY f.user_id
+        ) agg ON agg.user_id = u.user_id
+    """
+
+
+def user_qc_join(qc_where_sql: str) -> str:
+    """
+    Per-user QC from temp_qc (aliased qc), one row per user per day:
+    avg_qc_score = SUM(qc_score) / COUNT(days having qc_score).
+    """
+    return f"""
+        LEFT JOIN (
+            SELECT
+                q.user_id,
+                ROUND(SUM(q.qc_score) / NULLIF(COUNT(*), 0), 2) AS avg_qc_score,
+                COUNT(*) AS qc_days_count
+            FROM temp_qc q
+            WHERE q.qc_score IS NOT NULL {qc_where_sql}
+            GROUP BY q.user_id
+        ) qc ON qc.user_id = u.user_id
     """
 
 
@@ -43,29 +72,10 @@ def get_role_context(cursor, user_id: int) -> dict:
         "agent_role_id": int|None
       }
     """
-    cursor.execute(
-        """
-        SELECT
-            u.role_id AS user_role_id,
-            r.role_name AS user_role_name,
-            (
-                SELECT ur2.role_id
-                FROM user_role ur2
-                WHERE LOWER(TRIM(ur2.role_name)) = 'agent'
-                LIMIT 1
-            ) AS agent_role_id
-        FROM tfs_user u
-        JOIN user_role r ON r.role_id = u.role_id
-        WHERE u.user_id=%s AND u.is_active=1 AND u.is_delete=1
-        """,
-        (int(user_id),),
-    )
-    row = cursor.fetchone() or {}
-    return {
-        "user_role_id": row.get("user_role_id"),
-        "user_role_name": (row.get("user_role_name") or "").strip().lower(),
-        "agent_role_id": row.get("agent_role_id"),
-    }
+    vis = get_visibility(cursor, user_id)
+    if vis is None or vis.is_active != 1:
+        return {"user_role_id": None, "user_role_name": "", "agent_role_id": None}
+    return vis.as_role_context()
 
 
 # ---------------------------
@@ -117,10 +127,17 @@ def add_user_monthly_target():
                 continue
 
             user_id = int(data["user_id"])
-            month_year = str(data["month_year"]).strip()  # MONYYYY like JAN2026
-            monthly_target = str(data["monthly_target"]).strip()  # TEXT in DB
+            key = month_key(data["month_year"])  # JAN2026 / Jan2026 / 2026-01
+            if key is None:
+                skipped.append({"index": idx + 1, "reason": "month_year must be like JAN2026"})
+                continue
+            month_year = month_year_label(key)  # stored as MONYYYY, month_key is generated from it
+            monthly_target = to_number(data["monthly_target"])
+            working_days = to_number(data["working_days"])
+            if monthly_target is None or working_days is None:
+                skipped.append({"index": idx + 1, "reason": "monthly_target and working_days must be numbers"})
+                continue
             extra_assigned_hours = int(data.get("extra_assigned_hours") or 0)
-            working_days = str(data["working_days"]).strip()  # TEXT in DB
             created_date = str(data.get("created_date") or now_str())
 
             # ---- Validate user exists
@@ -143,9 +160,9 @@ def add_user_monthly_target():
                 """
                 SELECT user_monthly_tracker_id
                 FROM user_monthly_tracker
-                WHERE user_id=%s AND month_year=%s 
+                WHERE user_id=%s AND month_key=%s
                 """,
-                (user_id, month_year),
+                (user_id, key),
             )
             if cursor.fetchone():
                 skipped.append(
@@ -219,21 +236,31 @@ def update_user_monthly_target():
         updates.append("user_id=%s")
         params.append(int(data["user_id"]))
 
+    new_key = None
     if "month_year" in data and data["month_year"] not in [None, ""]:
+        new_key = month_key(data["month_year"])
+        if new_key is None:
+            return api_response(400, "month_year must be like JAN2026")
         updates.append("month_year=%s")
-        params.append(str(data["month_year"]).strip())  # keep as-is (MONYYYY)
+        params.append(month_year_label(new_key))  # MONYYYY
 
     if "monthly_target" in data and data["monthly_target"] not in [None, ""]:
+        monthly_target = to_number(data["monthly_target"])
+        if monthly_target is None:
+            return api_response(400, "monthly_target must be a number")
         updates.append("monthly_target=%s")
-        params.append(str(data["monthly_target"]).strip())
+        params.append(monthly_target)
 
     if "extra_assigned_hours" in data and data["extra_assigned_hours"] not in [None, ""]:
         updates.append("extra_assigned_hours=%s")
         params.append(int(data["extra_assigned_hours"])) 
 
     if "working_days" in data and data["working_days"] not in [None, ""]:
+        working_days = to_number(data["working_days"])
+        if working_days is None:
+            return api_response(400, "working_days must be a number")
         updates.append("working_days=%s")
-        params.append(str(data["working_days"]).strip())
+        params.append(working_days)
 
     if not updates:
         return api_response(400, "Nothing to update")
@@ -245,7 +272,7 @@ def update_user_monthly_target():
         # Current row
         cursor.execute(
             """
-            SELECT user_id, month_year
+            SELECT user_id, month_key
             FROM user_monthly_tracker
             WHERE user_monthly_tracker_id=%s
             """,
@@ -269,30 +296,23 @@ def update_user_monthly_target():
             if not cursor.fetchone():
                 return api_response(404, "User not found or inactive")
 
-        # Prevent duplicate active (final user_id + final month_year)
-        if (
-            ("user_id" in data and data["user_id"] not in [None, ""])
-            or ("month_year" in data and data["month_year"] not in [None, ""])
-        ):
+        # Prevent duplicate active (final user_id + final month)
+        if ("user_id" in data and data["user_id"] not in [None, ""]) or new_key is not None:
             final_user_id = (
                 int(data["user_id"])
                 if ("user_id" in data and data["user_id"] not in [None, ""])
                 else int(current["user_id"])
             )
-            final_month_year = (
-                str(data["month_year"]).strip()
-                if ("month_year" in data and data["month_year"] not in [None, ""])
-                else str(current["month_year"])
-            )
+            final_month_key = new_key if new_key is not None else current["month_key"]
 
             cursor.execute(
                 """
                 SELECT user_monthly_tracker_id
                 FROM user_monthly_tracker
-                WHERE user_id=%s AND month_year=%s 
+                WHERE user_id=%s AND month_key=%s
                   AND user_monthly_tracker_id<>%s
                 """,
-                (final_user_id, final_month_year, umt_id),
+                (final_user_id, final_month_key, umt_id),
             )
             if cursor.fetchone():
                 return api_response(409, "Monthly target already exists for this user and month")
@@ -387,8 +407,10 @@ def list_user_monthly_targets():
             return api_response(500, "Agent role not found in user_role table", None)
         
         if month_year:
-            dt = datetime.strptime(month_year, "%b%Y")  # Mar2026
-            month_start = dt.replace(day=1)
+            key = month_key(month_year)  # Mar2026 / MAR2026 / 2026-03
+            if key is None:
+                return api_response(400, "month_year must be like Mar2026", None)
+            month_start = datetime(key // 100, key % 100, 1)
         else:
             now = datetime.now()
             month_start = now.replace(day=1)
@@ -428,69 +450,33 @@ def list_user_monthly_targets():
             user_where += " AND u.user_id=%s"
             user_params.append(int(logged_in_user_id))
         else:
-            mid = str(logged_in_user_id)
-            user_where += """
-                AND (
-                    JSON_CONTAINS(u.project_manager_id, %s)
-                    OR JSON_CONTAINS(u.asst_manager_id, %s)
-                    OR JSON_CONTAINS(u.qa_id, %s)
-                )
-            """
-
-            user_params.extend([str(mid), str(mid), str(mid)])
+            # anyone reporting to me as PM / AM / QA (cached visibility set)
+            vis = get_visibility(cursor, logged_in_user_id)
+            visible_ids = vis.user_ids(include_self=False) if vis else []
+            user_where += f" AND u.user_id {in_clause_int(visible_ids, user_params)}"
 
         # ---------------- Joins: month_year optional ----------------
-        # temp_qc.date is TEXT 'YYYY-MM-DD'
-        QC_YEAR_MONTH = "DATE_FORMAT(STR_TO_DATE(tq.date, '%Y-%m-%d'), '%Y%m')"
-
         if month_year:
+            fact_params: list = []
+            fact_month = fact_month_sql(fact_params, month_start.year, month_start.month)
+            qc_params: list = []
+            qc_month = date_month_sql(qc_params, "q.date", month_start.year, month_start.month)
             umt_join = """
                 INNER JOIN user_monthly_tracker umt
                   ON umt.user_id = u.user_id
                  AND umt.is_active=1
-                 AND umt.month_year=%s
-            """
-            twt_join = f"""
-                LEFT JOIN task_work_tracker twt
-                  ON twt.user_id = u.user_id
-                 AND twt.is_active=1
-                 AND {TRACKER_YEAR_MONTH} = {month_year_to_yyyymm_sql('%s')}
-            """
-            # ✅ avg_qc_score = SUM(qc_score) / COUNT(days having qc_score)
-            qc_join = f"""
-                LEFT JOIN (
-                    SELECT
-                        tq.user_id,
-                        ROUND(SUM(tq.qc_score) / NULLIF(COUNT(DISTINCT tq.date), 0), 2) AS avg_qc_score,
-                        COUNT(DISTINCT tq.date) AS qc_days_count
-                    FROM temp_qc tq
-                    WHERE tq.qc_score IS NOT NULL
-                      AND {QC_YEAR_MONTH} = {month_year_to_yyyymm_sql('%s')}
-                    GROUP BY tq.user_id
-                ) qc ON qc.user_id = u.user_id
+                 AND umt.month_key=%s
             """
+            fact_join = user_fact_join(fact_month)
+            qc_join = user_qc_join(qc_month)
         else:
             umt_join = """
                 LEFT JOIN user_monthly_tracker umt
                   ON umt.user_id = u.user_id
                  AND umt.is_active=1
             """
-            twt_join = """
-                LEFT JOIN task_work_tracker twt
-                  ON twt.user_id = u.user_id
-                 AND twt.is_active=1
-            """
-            qc_join = """
-                LEFT JOIN (
-                    SELECT
-                        tq.user_id,
-                        ROUND(SUM(tq.qc_score) / NULLIF(COUNT(DISTINCT tq.date), 0), 2) AS avg_qc_score,
-                        COUNT(DISTINCT tq.date) AS qc_days_count
-                    FROM temp_qc tq
-                    WHERE tq.qc_score IS NOT NULL
-                    GROUP BY tq.user_id
-                ) qc ON qc.user_id = u.user_id
-            """
+            fact_join = user_fact_join("")
+            qc_join = user_qc_join("")
 
         # ---------------- Main query ----------------
         query = f"""
@@ -501,16 +487,16 @@ def list_user_monthly_targets():
                 umt.user_monthly_tracker_id,
                 umt.month_year,
                 umt.working_days,
-                COALESCE(CAST(umt.monthly_target AS DECIMAL(10,2)), 0) AS monthly_target,
+                COALESCE(umt.monthly_target, 0) AS monthly_target,
                 COALESCE(umt.extra_assigned_hours, 0) AS extra_assigned_hours,
                 (
-                    COALESCE(CAST(umt.monthly_target AS DECIMAL(10,2)), 0)
+                    COALESCE(umt.monthly_target, 0)
                     + COALESCE(umt.extra_assigned_hours, 0)
                 ) AS monthly_total_target,
 
-                COALESCE(SUM(COALESCE(twt.production, 0) / NULLIF(twt.tenure_target, 0)), 0) AS total_billable_hours,
-                COALESCE(SUM(twt.production), 0) AS total_production,
-                COUNT(twt.tracker_id) AS tracker_rows,
+                COALESCE(agg.billable_hours, 0) AS total_billable_hours,
+                COALESCE(agg.production, 0) AS total_production,
+                COALESCE(agg.tracker_rows, 0) AS tracker_rows,
 
                 -- QC monthly avg and qc-days count
                 qc.avg_qc_score AS avg_qc_score,
@@ -518,35 +504,24 @@ def list_user_monthly_targets():
 
                 GREATEST(
                     (
-                        COALESCE(CAST(umt.monthly_target AS DECIMAL(10,2)), 0)
+                        COALESCE(umt.monthly_target, 0)
                         + COALESCE(umt.extra_assigned_hours, 0)
-                    ) - COALESCE(SUM(COALESCE(twt.production, 0) / NULLIF(twt.tenure_target, 0)), 0),
+                    ) - COALESCE(agg.billable_hours, 0),
                     0
                 ) AS pending_target
             FROM tfs_user u
             LEFT JOIN team t ON u.team_id = t.team_id
             {umt_join}
-            {twt_join}
+            {fact_join}
             {qc_join}
             {user_where}
-            GROUP BY
-                u.user_id,
-                u.user_name,
-                t.team_name,
-                umt.user_monthly_tracker_id,
-                umt.month_year,
-                umt.working_days,
-                monthly_target,
-                extra_assigned_hours,
-                qc.avg_qc_score,
-                qc.qc_days_count
             ORDER BY u.user_name ASC
         """
 
         # Params order:
-        # if month_year: umt_join(%s), twt_join(%s), qc_join(%s), then user_where params
+        # if month_year: umt_join(month_key), fact_join(month range), qc_join(month range), then user_where params
         if month_year:
-            final_params = [month_year, month_year, month_year]
+            final_params = [key] + fact_params + qc_params
         else:
             final_params = []
         final_params.extend(user_params)
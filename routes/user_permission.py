@@ -1,6 +1,7 @@
 from flask import Blueprint, request
 from utils.response import api_response
 from config import get_db_connection
+from utils.reporting_edges import reports_to_sql, relations_for_role
 
 permission_bp = Blueprint("permission", __name__, url_prefix="/permission")
 
@@ -61,40 +62,10 @@ def user_list_with_permissions():
         """
         params = []
 
-        # 4) Role-based filtering (handle multiple manager/QA assignments in JSON arrays)
-        logged_in_id_str = str(logged_in_user_id)
-        logged_in_id_int = int(logged_in_user_id)
-        
-        if role == "qa":
-            query += """ AND (
-                u.qa_id = %s 
-                OR u.qa_id = %s
-                OR (JSON_VALID(u.qa_id) AND (
-                    JSON_CONTAINS(u.qa_id, JSON_ARRAY(%s)) 
-                    OR JSON_CONTAINS(u.qa_id, JSON_ARRAY(CAST(%s AS UNSIGNED)))
-                ))
-            )"""
-            params.extend([logged_in_id_str, logged_in_id_int, logged_in_id_str, logged_in_id_str])
-        elif role == "assistant manager":
-            query += """ AND (
-                u.asst_manager_id = %s 
-                OR u.asst_manager_id = %s
-                OR (JSON_VALID(u.asst_manager_id) AND (
-                    JSON_CONTAINS(u.asst_manager_id, JSON_ARRAY(%s))
-                    OR JSON_CONTAINS(u.asst_manager_id, JSON_ARRAY(CAST(%s AS UNSIGNED)))
-                ))
-            )"""
-            params.extend([logged_in_id_str, logged_in_id_int, logged_in_id_str, logged_in_id_str])
-        elif role == "manager" or role == "project manager":
-            query += """ AND (
-                u.project_manager_id = %s 
-                OR u.project_manager_id = %s
-                OR (JSON_VALID(u.project_manager_id) AND (
-                    JSON_CONTAINS(u.project_manager_id, JSON_ARRAY(%s))
-                    OR JSON_CONTAINS(u.project_manager_id, JSON_ARRAY(CAST(%s AS UNSIGNED)))
-                ))
-            )"""
-            params.extend([logged_in_id_str, logged_in_id_int, logged_in_id_str, logged_in_id_str])
+        # 4) Role-based filtering via user_reporting_edge (covers JSON arrays and CSV alike)
+        relations = relations_for_role(role)
+        if relations:
+            query += " AND " + reports_to_sql(params, int(logged_in_user_id), relations)
         # admin / super admin -> no extra filter
 
         # 5) Additional filter: if filter_role is provided, filter by that role
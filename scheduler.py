@@ -1,5 +1,6 @@
 import requests
 import os
+from utils.api_log_retention import API_LOG_RETENTION_MONTHS, run_retention
 from apscheduler.schedulers.background import BackgroundScheduler
 
 def assign_daily_hours_job():
@@ -20,6 +21,20 @@ def assign_daily_hours_job():
               
               )
 
+def api_log_retention_job():
+    """
+    Job to add next months' api_call_logs partitions and archive + drop the
+    ones older than API_LOG_RETENTION_MONTHS.
+    """
+    try:
+        summary = run_retention()
+        if summary["skipped"]:
+            print(f"API log retention skipped: {summary['skipped']}")
+        else:
+            print(f"API log retention done: created={summary['created']} dropped={summary['dropped']}")
+    except Exception as e:
+        print(f"An error occurred during API log retention: {e}")
+
 def start_scheduler():
     """
     Initializes and starts the scheduler.
@@ -27,5 +42,8 @@ def start_scheduler():
     scheduler = BackgroundScheduler(daemon=True)
     # Schedule the job to run every day at 8:00 AM
     scheduler.add_job(assign_daily_hours_job, 'cron', hour=8, minute=0)
+    # api_call_logs partitions: daily at 2:30 AM
+    scheduler.add_job(api_log_retention_job, 'cron', hour=2, minute=30)
     scheduler.start()
     print("Scheduler started. Daily hours assignment job is scheduled for 8:00 AM.")
+    print(f"API log retention job is scheduled for 2:30 AM (keeping {API_LOG_RETENTION_MONTHS} months).")
@@ -0,0 +1,183 @@
+import gzip
+import json
+import os
+from datetime import date, datetime
+
+from config import get_db_pool
+
+# api_call_logs is RANGE COLUMNS partitioned by month on `timestamp`:
+#
+#   p202610  VALUES LESS THAN ('2026-11-01 00:00:00')   -> October 2026
+#   ...
+#   pmax     VALUES LESS THAN (MAXVALUE)                 -> safety net
+#
+# Inserts always land in the current month's partition and the windowed
+# /api_log_list/logs queries prune to the months they touch. The daily
+# retention job (scheduler.py) keeps API_LOG_PARTITIONS_AHEAD empty future
+# partitions split off pmax, and for every month older than
+# API_LOG_RETENTION_MONTHS writes the rows to a gzip'd NDJSON file in
+# API_LOG_ARCHIVE_DIR and drops the partition (a metadata-only operation,
+# unlike DELETE). Convert the table once with migrate_api_call_logs_partitions.py.
+LOG_TABLE = "api_call_logs"
+API_LOG_RETENTION_MONTHS = int(os.getenv("API_LOG_RETENTION_MONTHS", "6"))
+API_LOG_PARTITIONS_AHEAD = int(os.getenv("API_LOG_PARTITIONS_AHEAD", "3"))
+API_LOG_ARCHIVE_DIR = os.getenv("API_LOG_ARCHIVE_DIR", os.path.join("archive", "api_call_logs"))
+API_LOG_ARCHIVE_BATCH = int(os.getenv("API_LOG_ARCHIVE_BATCH", "10000"))
+
+MAX_PARTITION = "pmax"
+
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month `months` away from day's month."""
+    index = day.year * 12 + (day.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month_start: date) -> str:
+    return f"p{month_start.year}{month_start.month:02d}"
+
+
+def partition_def(month_start: date) -> str:
+    upper = add_months(month_start, 1)
+    return f"PARTITION {partition_name(month_start)} VALUES LESS THAN ('{upper:%Y-%m-%d} 00:00:00')"
+
+
+def partition_by_sql(first_month: date, last_month: date) -> str:
+    """PARTITION BY clause covering first_month..last_month, plus pmax."""
+    parts = []
+    month = date(first_month.year, first_month.month, 1)
+    while month <= last_month:
+        parts.append(partition_def(month))
+        month = add_months(month, 1)
+    parts.append(f"PARTITION {MAX_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    return "PARTITION BY RANGE COLUMNS(`timestamp`) (\n    " + ",\n    ".join(parts) + "\n)"
+
+
+def list_partitions(cursor) -> list[tuple[str, str]]:
+    """[(partition_name, less_than_value), ...] in order; [] when not partitioned."""
+    cursor.execute(
+        """
+        SELECT PARTITION_NAME, PARTITION_DESCRIPTION
+        FROM INFORMATION_SCHEMA.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION
+        """,
+        (LOG_TABLE,),
+    )
+    out = []
+    for row in cursor.fetchall() or []:
+        if isinstance(row, dict):
+            row = (row["PARTITION_NAME"], row["PARTITION_DESCRIPTION"])
+        out.append((row[0], row[1]))
+    return out
+
+
+def _month_of(name: str) -> date | None:
+    try:
+        return datetime.strptime(name[1:], "%Y%m").date()
+    except ValueError:
+        return None
+
+
+def ensure_future_partitions(cursor, today: date, ahead: int = API_LOG_PARTITIONS_AHEAD) -> list[str]:
+    """Split months up to today + ahead off pmax. Returns the partitions created."""
+    months = {_month_of(name) for name, _ in list_partitions(cursor)}
+    months.discard(None)
+    if not months:
+        return []
+
+    target = add_months(today, ahead)
+    new = []
+    month = add_months(max(months), 1)
+    while month <= target:
+        new.append(month)
+        month = add_months(month, 1)
+    if not new:
+        return []
+
+    parts = ",\n    ".join(partition_def(m) for m in new)
+    cursor.execute(
+        f"ALTER TABLE {LOG_TABLE} REORGANIZE PARTITION {MAX_PARTITION} INTO (\n    {parts},\n"
+        f"    PARTITION {MAX_PARTITION} VALUES LESS THAN (MAXVALUE)\n)"
+    )
+    return [partition_name(m) for m in new]
+
+
+def archive_partition(cursor, name: str, archive_dir: str = API_LOG_ARCHIVE_DIR) -> tuple[str, int]:
+    """
+    Write every row of one partition to <archive_dir>/api_call_logs_<name>.ndjson.gz
+    (one JSON object per line), walking the primary key in batches so memory
+    stays flat. Written to a .part file and renamed once complete.
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{LOG_TABLE}_{name}.ndjson.gz")
+    tmp_path = path + ".part"
+
+    written = 0
+    last_id = 0
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as fh:
+        while True:
+            cursor.execute(
+                f"SELECT * FROM {LOG_TABLE} PARTITION ({name}) WHERE id > %s ORDER BY id LIMIT %s",
+                (last_id, API_LOG_ARCHIVE_BATCH),
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            columns = cursor.column_names
+            for row in rows:
+                record = row if isinstance(row, dict) else dict(zip(columns, row))
+                fh.write(json.dumps(record, default=str) + "\n")
+            written += len(rows)
+            last = rows[-1]
+            last_id = last["id"] if isinstance(last, dict) else last[columns.index("id")]
+            if len(rows) < API_LOG_ARCHIVE_BATCH:
+                break
+
+    os.replace(tmp_path, path)
+    return path, written
+
+
+def expired_partitions(cursor, today: date, keep_months: int = API_LOG_RETENTION_MONTHS) -> list[str]:
+    """Monthly partitions entirely older than the first day of (today's month - keep_months)."""
+    cutoff = add_months(today, -keep_months)
+    out = []
+    for name, _ in list_partitions(cursor):
+        month = _month_of(name)
+        if month is not None and add_months(month, 1) <= cutoff:
+            out.append(name)
+    return out
+
+
+def run_retention(today: date | None = None, keep_months: int = API_LOG_RETENTION_MONTHS,
+                  archive_dir: str = API_LOG_ARCHIVE_DIR, dry_run: bool = False) -> dict:
+    """
+    One retention pass: add future partitions, archive + drop expired ones.
+    A partition is only dropped after its archive file has been written.
+    Runs on its own pooled connection (scheduler thread, no request).
+    """
+    today = today or date.today()
+    summary = {"created": [], "archived": [], "dropped": [], "skipped": None}
+
+    conn = get_db_pool().connect()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        if not list_partitions(cursor):
+            summary["skipped"] = f"{LOG_TABLE} is not partitioned (run migrate_api_call_logs_partitions.py)"
+            return summary
+
+        if dry_run:
+            summary["dropped"] = expired_partitions(cursor, today, keep_months)
+            return summary
+
+        summary["created"] = ensure_future_partitions(cursor, today)
+
+        for name in expired_partitions(cursor, today, keep_months):
+            path, rows = archive_partition(cursor, name, archive_dir)
+            summary["archived"].append({"partition": name, "file": path, "rows": rows})
+            cursor.execute(f"ALTER TABLE {LOG_TABLE} DROP PARTITION {name}")
+            summary["dropped"].append(name)
+        return summary
+    finally:
+        cursor.close()
+        conn.close()
@@ -1,22 +1,194 @@
-from config import get_db_connection
+from config import get_db_connection, get_db_pool
 from datetime import datetime
+import atexit
+import os
+import queue
+import threading
+import time
 
-def log_api_call(api_name, user_id, device_id, device_type, api_call_time=None):
-    conn = get_db_connection()
+# Buffered api_call_logs writer settings
+API_LOG_ASYNC = os.getenv("API_LOG_ASYNC", "1").lower() in ("1", "true", "yes")
+API_LOG_BATCH_SIZE = int(os.getenv("API_LOG_BATCH_SIZE", "200"))
+API_LOG_FLUSH_MS = int(os.getenv("API_LOG_FLUSH_MS", "500"))
+API_LOG_QUEUE_SIZE = int(os.getenv("API_LOG_QUEUE_SIZE", "10000"))
+
+INSERT_API_LOG_SQL = """
+    INSERT INTO api_call_logs (api_name, user_id, device_id, device_type, timestamp)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+
+class ApiLogWriter:
+    """
+    In-process buffered writer for api_call_logs.
+
+    Requests only put a tuple on a bounded queue. A background thread drains
+    it and writes multi-row INSERTs every `batch_size` rows or `flush_ms`
+    milliseconds, whichever comes first. When the queue is full (DB slow or
+    down) new rows are dropped and counted instead of blocking the request.
+    """
+
+    def __init__(self, batch_size=200, flush_ms=500, queue_size=10000):
+        self.batch_size = max(int(batch_size), 1)
+        self.flush_interval = max(int(flush_ms), 1) / 1000.0
+        self._queue = queue.Queue(maxsize=max(int(queue_size), 1))
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "failed": 0,
+            "batches": 0,
+        }
+
+    def submit(self, row: tuple) -> bool:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self._bump("dropped")
+            return False
+        self._bump("enqueued")
+        return True
+
+    def flush(self) -> None:
+        """Write everything currently buffered (called on shutdown)."""
+        while True:
+            batch = self._drain(self.batch_size)
+            if not batch:
+                return
+            self._write(batch)
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and self._pid == os.getpid():
+            thread.join(timeout=self.flush_interval * 4)
+        self.flush()
+
+    def get_stats(self) -> dict:
+        with self._stats_lock:
+            out = dict(self.stats)
+        out["queued"] = self._queue.qsize()
+        out["queue_size"] = self._queue.maxsize
+        return out
+
+    # ------------------------
+    # INTERNALS
+    # ------------------------
+    def _bump(self, key: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def _ensure_started(self) -> None:
+        pid = os.getpid()
+        if self._thread is not None and self._pid == pid:
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == pid:
+                return
+            # after a gunicorn fork the parent's thread does not exist here
+            self._pid = pid
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="api-log-writer", daemon=True)
+            self._thread.start()
+
+    def _drain(self, limit: int) -> list:
+        rows = []
+        while len(rows) < limit:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._write(batch)
+
+    def _write(self, batch: list) -> None:
+        # Straight from the pool: the writer thread never owns a request connection.
+        # mysql.connector turns executemany() on INSERT ... VALUES into one multi-row INSERT.
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_pool().connect()
+            cursor = conn.cursor()
+            cursor.executemany(INSERT_API_LOG_SQL, batch)
+            conn.commit()
+            self._bump("written", len(batch))
+            self._bump("batches")
+        except Exception as e:
+            self._bump("failed", len(batch))
+            print(f"API log batch write error ({len(batch)} rows dropped): {e}")
+        finally:
+            try:
+                if cursor: cursor.close()
+                if conn: conn.close()
+            except Exception:
+                pass
+
+
+api_log_writer = ApiLogWriter(
+    batch_size=API_LOG_BATCH_SIZE,
+    flush_ms=API_LOG_FLUSH_MS,
+    queue_size=API_LOG_QUEUE_SIZE,
+)
+atexit.register(api_log_writer.shutdown)
+
+
+def get_api_log_stats() -> dict:
+    return api_log_writer.get_stats()
+
+
+def log_api_call(api_name, user_id, device_id, device_type, api_call_time=None, conn=None):
+    """
+    Records one api_call_logs row.
+
+    Default (API_LOG_ASYNC=1): the row is buffered and written in batches by a
+    background thread, so logging adds no DB round-trip to the request.
+    With API_LOG_ASYNC=0 the row is inserted synchronously; pass `conn` to write
+    inside the caller's open transaction (caller commits).
+    """
+    if api_call_time is None:
+        api_call_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    row = (api_name, user_id, device_id, device_type, api_call_time)
+
+    if API_LOG_ASYNC:
+        api_log_writer.submit(row)
+        return
+
+    own_tx = conn is None
+    if own_tx:
+        conn = get_db_connection()
     cursor = conn.cursor()
     try:
-        if api_call_time is None:
-            api_call_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        cursor.execute(
-            """
-            INSERT INTO api_call_logs (api_name, user_id, device_id, device_type, timestamp)
-            VALUES (%s, %s, %s, %s, %s)
-            """,
-            (api_name, user_id, device_id, device_type, api_call_time)
-        )
-        conn.commit()
+        cursor.execute(INSERT_API_LOG_SQL, row)
+        if own_tx:
+            conn.commit()
     except Exception as e:
         print(f"API log error: {e}")
     finally:
         cursor.close()
-        conn.close()
+        if own_tx:
+            conn.close()
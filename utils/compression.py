@@ -0,0 +1,124 @@
+import os
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# Negotiated response compression, applied in an after_request hook.
+#
+#   RESPONSE_COMPRESSION      1 / 0 switch (default on)
+#   COMPRESSION_MIN_SIZE      smaller bodies are sent as-is (default 1024 bytes)
+#   COMPRESSION_GZIP_LEVEL    zlib level (default 6)
+#   COMPRESSION_BROTLI_QUALITY brotli quality (default 5); br is used when the
+#                             `brotli` package is installed and the client accepts it
+#
+# Streamed responses (/tracker/view?stream=1 NDJSON) are compressed chunk by
+# chunk with a sync flush after each one, so clients still get rows as they
+# are produced.
+RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "1").lower() in ("1", "true", "yes")
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+
+COMPRESSIBLE_MIMETYPES = frozenset({
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "text/html",
+    "text/plain",
+    "text/csv",
+    "text/css",
+})
+
+
+def choose_encoding() -> str | None:
+    """'br' / 'gzip' from the request's Accept-Encoding, None when neither is acceptable."""
+    accept = request.accept_encodings
+    if brotli is not None and accept["br"]:
+        return "br"
+    if accept["gzip"]:
+        return "gzip"
+    return None
+
+
+def _compressor(encoding: str):
+    """Object with compress(chunk) -> bytes, flush(final) -> bytes."""
+    if encoding == "br":
+        c = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+
+        class _Br:
+            def compress(self, chunk):
+                return c.process(chunk)
+
+            def flush(self, final=False):
+                return c.finish() if final else c.flush()
+
+        return _Br()
+
+    z = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+
+    class _Gz:
+        def compress(self, chunk):
+            return z.compress(chunk)
+
+        def flush(self, final=False):
+            return z.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+    return _Gz()
+
+
+def compress_bytes(data: bytes, encoding: str) -> bytes:
+    c = _compressor(encoding)
+    return c.compress(data) + c.flush(final=True)
+
+
+def _compress_stream(chunks, encoding: str):
+    c = _compressor(encoding)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        out = c.compress(chunk) + c.flush()
+        if out:
+            yield out
+    yield c.flush(final=True)
+
+
+def compress_response(response):
+    """after_request hook: compress eligible responses in place."""
+    if not RESPONSE_COMPRESSION:
+        return response
+    if request.method == "HEAD" or response.status_code < 200 or response.status_code in (204, 304):
+        return response
+    if response.direct_passthrough or "Content-Encoding" in response.headers:
+        return response
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = choose_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESSION_MIN_SIZE:
+            return response
+        response.set_data(compress_bytes(data, encoding))
+
+    response.headers["Content-Encoding"] = encoding
+    # the bytes now differ per encoding: a strong validator would be wrong
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app) -> None:
+    app.after_request(compress_response)
@@ -0,0 +1,239 @@
+import threading
+import time
+from collections import deque
+
+import mysql.connector
+
+
+class PoolExhaustedError(Exception):
+    """Raised when no connection could be checked out within the pool timeout."""
+
+
+class PooledConnection:
+    """
+    Thin proxy around a mysql.connector connection handed out by ConnectionPool.
+
+    Everything (cursor, commit, rollback, start_transaction ...) is forwarded to
+    the real connection, except close(), which returns it to the pool instead of
+    tearing down the TCP session. Existing route code keeps calling conn.close()
+    in `finally` and gets pooling for free.
+    """
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+
+    def __getattr__(self, name):
+        raw = self.__dict__.get("_raw")
+        if raw is None:
+            raise AttributeError(f"Connection already returned to pool (accessing '{name}')")
+        return getattr(raw, name)
+
+    def close(self):
+        if self._raw is None:
+            return
+        raw, created_at = self._raw, self._created_at
+        self._raw = None
+        self._pool._release(raw, created_at)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class SharedConnection:
+    """
+    Handle on a connection owned by someone else (e.g. the current request).
+
+    close() is a no-op so helpers and routes can keep their usual
+    `finally: conn.close()`; the owner releases the real connection once.
+    start_transaction() joins an already open transaction instead of failing.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self.__dict__["_conn"], name)
+
+    def start_transaction(self, *args, **kwargs):
+        if self._conn.in_transaction:
+            return
+        return self._conn.start_transaction(*args, **kwargs)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class ConnectionPool:
+    """
+    Process-local MySQL connection pool.
+
+    - pool_size:    connections kept open while idle
+    - max_overflow: extra connections allowed under burst, closed when returned
+    - timeout:      seconds to wait for a free connection before giving up
+    - recycle:      max lifetime (seconds) of a physical connection, 0 = never
+    - pre_ping:     ping idle connections on checkout and replace dead ones
+    """
+
+    def __init__(self, connect_kwargs: dict, pool_size: int = 5, max_overflow: int = 10,
+                 timeout: float = 30, recycle: int = 3600, pre_ping: bool = True):
+        self._connect_kwargs = dict(connect_kwargs)
+        self._pool_size = max(int(pool_size), 1)
+        self._max_overflow = max(int(max_overflow), 0)
+        self._timeout = float(timeout)
+        self._recycle = int(recycle)
+        self._pre_ping = bool(pre_ping)
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (raw_conn, created_at)
+        self._total = 0       # physical connections open (idle + in use)
+
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time_total_ms": 0.0,
+            "wait_time_max_ms": 0.0,
+            "exhausted": 0,
+            "created": 0,
+            "recycled": 0,
+            "ping_failures": 0,
+            "discarded": 0,
+        }
+
+    # ------------------------
+    # PUBLIC API
+    # ------------------------
+    def connect(self) -> PooledConnection:
+        started = time.monotonic()
+        deadline = started + self._timeout
+        waited = False
+        raw, created_at = None, None
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    raw, created_at = self._idle.pop()
+                    break
+                if self._total < self._pool_size + self._max_overflow:
+                    self._total += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["exhausted"] += 1
+                    raise PoolExhaustedError(
+                        f"DB pool exhausted: {self._total} connections in use, waited {self._timeout}s"
+                    )
+                waited = True
+                self._cond.wait(remaining)
+
+        try:
+            if raw is None:
+                raw, created_at = self._new_raw()
+            else:
+                raw, created_at = self._validate(raw, created_at)
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+
+        wait_ms = (time.monotonic() - started) * 1000
+        with self._cond:
+            self._stats["checkouts"] += 1
+            if waited:
+                self._stats["waits"] += 1
+            self._stats["wait_time_total_ms"] += wait_ms
+            self._stats["wait_time_max_ms"] = max(self._stats["wait_time_max_ms"], wait_ms)
+
+        return PooledConnection(self, raw, created_at)
+
+    def stats(self) -> dict:
+        with self._cond:
+            out = dict(self._stats)
+            out["pool_size"] = self._pool_size
+            out["max_overflow"] = self._max_overflow
+            out["open"] = self._total
+            out["idle"] = len(self._idle)
+            out["in_use"] = self._total - len(self._idle)
+        checkouts = out["checkouts"] or 1
+        out["wait_time_avg_ms"] = round(out["wait_time_total_ms"] / checkouts, 3)
+        out["wait_time_total_ms"] = round(out["wait_time_total_ms"], 3)
+        out["wait_time_max_ms"] = round(out["wait_time_max_ms"], 3)
+        return out
+
+    def dispose(self) -> None:
+        """Close every idle connection (in-use ones are closed when returned)."""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for raw, _ in idle:
+            self._close_raw(raw)
+
+    # ------------------------
+    # INTERNALS
+    # ------------------------
+    def _new_raw(self):
+        raw = mysql.connector.connect(**self._connect_kwargs)
+        with self._cond:
+            self._stats["created"] += 1
+        return raw, time.monotonic()
+
+    def _validate(self, raw, created_at):
+        if self._recycle and time.monotonic() - created_at > self._recycle:
+            self._close_raw(raw)
+            with self._cond:
+                self._stats["recycled"] += 1
+            return self._new_raw()
+
+        if self._pre_ping:
+            try:
+                raw.ping(reconnect=False)
+            except Exception:
+                self._close_raw(raw)
+                with self._cond:
+                    self._stats["ping_failures"] += 1
+                return self._new_raw()
+
+        return raw, created_at
+
+    def _release(self, raw, created_at) -> None:
+        # End any open (implicit) transaction so the next borrower does not
+        # inherit locks or a stale REPEATABLE READ snapshot.
+        healthy = True
+        try:
+            raw.rollback()
+        except Exception:
+            healthy = False
+
+        with self._cond:
+            keep = healthy and len(self._idle) < self._pool_size
+            if keep:
+                self._idle.append((raw, created_at))
+            else:
+                self._total -= 1
+                if not healthy:
+                    self._stats["discarded"] += 1
+            self._cond.notify()
+
+        if not keep:
+            self._close_raw(raw)
+
+    @staticmethod
+    def _close_raw(raw) -> None:
+        try:
+            raw.close()
+        except Exception:
+            pass
@@ -0,0 +1,116 @@
+import os
+import threading
+import time
+
+# In-process cache of serialized /dropdown/get responses.
+#
+# Key: (dropdown_type, logged_in_user_id, user_id, project_id, team_id, month)
+# - the logged-in user stands in for the role scope, the month for the
+# deactivated_at window. Value: (body bytes, etag), so a hit costs neither a
+# query nor a JSON encode, and If-None-Match gets a 304.
+#
+# Routes that change a source table call invalidate_dropdowns(table) after
+# their commit; that drops every dropdown type reading it. The TTL bounds
+# staleness for writes made by other gunicorn workers.
+DROPDOWN_CACHE_TTL = int(os.getenv("DROPDOWN_CACHE_TTL", "300"))
+DROPDOWN_CACHE_MAX = int(os.getenv("DROPDOWN_CACHE_MAX", "2000"))
+
+USER_DROPDOWN_TABLES = frozenset({"tfs_user", "user_role", "project", "user_reporting_edge"})
+
+# dropdown_type -> tables its query reads
+DROPDOWN_TABLES = {
+    "designations": frozenset({"user_designation"}),
+    "user roles": frozenset({"user_role"}),
+    "teams": frozenset({"team"}),
+    "project categories": frozenset({"project_category"}),
+    "afd": frozenset({"afd"}),
+    "projects with tasks": frozenset({"project", "task", "tfs_user", "user_role"}),
+    "super admin": USER_DROPDOWN_TABLES,
+    "admin": USER_DROPDOWN_TABLES,
+    "project manager": USER_DROPDOWN_TABLES,
+    "assistant manager": USER_DROPDOWN_TABLES,
+    "qa": USER_DROPDOWN_TABLES,
+    "agent": USER_DROPDOWN_TABLES,
+}
+
+
+class DropdownCache:
+    """Thread-safe TTL cache of (body, etag) keyed by dropdown request."""
+
+    def __init__(self, ttl: int = 300, max_entries: int = 2000):
+        self.ttl = max(int(ttl), 0)
+        self.max_entries = max(int(max_entries), 1)
+        self._lock = threading.Lock()
+        self._data = {}  # key -> (expires_at, body, etag)
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, key: tuple):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry and entry[0] > now:
+                self.stats["hits"] += 1
+                return entry[1], entry[2]
+            if entry:
+                del self._data[key]
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: tuple, body: bytes, etag: str) -> None:
+        if not self.ttl:
+            return
+        with self._lock:
+            if len(self._data) >= self.max_entries:
+                now = time.monotonic()
+                for k in [k for k, (exp, _, _) in self._data.items() if exp <= now]:
+                    del self._data[k]
+                if len(self._data) >= self.max_entries:
+                    self._data.clear()
+            self._data[key] = (time.monotonic() + self.ttl, body, etag)
+
+    def invalidate(self, *tables: str) -> None:
+        """Drop dropdown types that read any of `tables` (everything when none given)."""
+        with self._lock:
+            self.stats["invalidations"] += 1
+            if not tables:
+                self._data.clear()
+                return
+            changed = set(tables)
+            stale = [
+                k for k in self._data
+                if changed & DROPDOWN_TABLES.get(k[0], changed)
+            ]
+            for k in stale:
+                del self._data[k]
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            out = dict(self.stats)
+            out["entries"] = len(self._data)
+        out["ttl"] = self.ttl
+        return out
+
+
+dropdown_cache = DropdownCache(ttl=DROPDOWN_CACHE_TTL, max_entries=DROPDOWN_CACHE_MAX)
+
+
+def dropdown_cache_key(dropdown_type: str, data: dict, month_start) -> tuple:
+    def norm(v):
+        return None if v in (None, "") else str(v).strip()
+
+    return (
+        dropdown_type,
+        norm(data.get("logged_in_user_id")),
+        norm(data.get("user_id")),
+        norm(data.get("project_id")),
+        norm(data.get("team_id")),
+        month_start.strftime("%Y-%m"),
+    )
+
+
+def invalidate_dropdowns(*tables: str) -> None:
+    dropdown_cache.invalidate(*tables)
+
+
+def get_dropdown_cache_stats() -> dict:
+    return dropdown_cache.get_stats()
@@ -0,0 +1,105 @@
+import os
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+# Runs independent read queries concurrently, each on its own connection, so
+# a view costs roughly its slowest query instead of the sum of all of them.
+#
+#   FANOUT_ENABLED      1 / 0 (0: same tasks, run one after another)
+#   FANOUT_MAX_WORKERS  threads shared by every request in the process
+#   FANOUT_DEADLINE     seconds a whole fan-out may take before FanoutTimeout
+#
+# Each task holds one pooled connection while it runs; size DB_POOL_SIZE /
+# DB_POOL_MAX_OVERFLOW for (concurrent requests x tasks per fan-out).
+FANOUT_ENABLED = os.getenv("FANOUT_ENABLED", "1").lower() in ("1", "true", "yes")
+FANOUT_MAX_WORKERS = int(os.getenv("FANOUT_MAX_WORKERS", "8"))
+FANOUT_DEADLINE = float(os.getenv("FANOUT_DEADLINE", "25"))
+
+
+class FanoutTimeout(Exception):
+    """Raised when the fanned-out tasks did not all finish before the deadline."""
+
+
+_lock = threading.Lock()
+_executor = None
+_executor_pid = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is not None and _executor_pid == pid:
+        return _executor
+    with _lock:
+        if _executor is None or _executor_pid != pid:
+            # after a gunicorn fork the parent's worker threads do not exist here
+            _executor = ThreadPoolExecutor(max_workers=max(FANOUT_MAX_WORKERS, 1), thread_name_prefix="fanout")
+            _executor_pid = pid
+    return _executor
+
+
+def _pool_connect():
+    from config import get_db_pool
+    return get_db_pool().connect()
+
+
+def _run_on_own_connection(fn, connect):
+    conn = connect()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        return fn(cursor)
+    finally:
+        try:
+            cursor.close()
+        finally:
+            conn.close()
+
+
+def run_parallel(tasks: dict, cursor=None, connect=None, deadline: float | None = None) -> dict:
+    """
+    tasks: {name: fn(cursor) -> result}, read-only and independent of each other.
+    Returns {name: result}.
+
+    Every task gets its own dictionary cursor on a connection from `connect`
+    (default: the app pool). When `cursor` is given, the first task runs on it
+    in the calling thread, so n tasks need n - 1 extra connections. The first
+    task error is re-raised; FanoutTimeout when the deadline passes first.
+    """
+    connect = connect or _pool_connect
+    deadline = FANOUT_DEADLINE if deadline is None else deadline
+    items = list(tasks.items())
+    if not items:
+        return {}
+
+    if not FANOUT_ENABLED or len(items) == 1:
+        if cursor is not None:
+            return {name: fn(cursor) for name, fn in items}
+        return {name: _run_on_own_connection(fn, connect) for name, fn in items}
+
+    started = time.monotonic()
+    inline = items[0] if cursor is not None else None
+    pooled = items[1:] if inline else items
+
+    executor = _get_executor()
+    futures = {executor.submit(_run_on_own_connection, fn, connect): name for name, fn in pooled}
+
+    results = {}
+    try:
+        if inline:
+            results[inline[0]] = inline[1](cursor)
+
+        remaining = max(deadline - (time.monotonic() - started), 0)
+        done, not_done = wait(futures, timeout=remaining, return_when=FIRST_EXCEPTION)
+        for future in done:
+            results[futures[future]] = future.result()  # re-raises the task's error
+        if not_done:
+            raise FanoutTimeout(
+                f"{len(not_done)} of {len(items)} queries still running after {deadline}s: "
+                + ", ".join(sorted(futures[f] for f in not_done))
+            )
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+    return results
@@ -0,0 +1,97 @@
+import dataclasses
+import decimal
+import os
+import uuid
+from datetime import date, datetime
+
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib provider
+    orjson = None
+
+# JSON_PROVIDER: "auto" (orjson when installed), "orjson" or "stdlib".
+JSON_PROVIDER = os.getenv("JSON_PROVIDER", "auto").strip().lower()
+
+
+_DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def _http_date(o: date) -> str:
+    """werkzeug.http.http_date for naive datetimes / dates (treated as UTC), without the email.utils detour."""
+    if isinstance(o, datetime):
+        if o.tzinfo is not None:
+            return http_date(o)
+        h, m, s = o.hour, o.minute, o.second
+    else:
+        h = m = s = 0
+    return f"{_DAYS[o.weekday()]}, {o.day:02d} {_MONTHS[o.month - 1]} {o.year:04d} {h:02d}:{m:02d}:{s:02d} GMT"
+
+
+def _orjson_default(o):
+    # Same conversions as Flask's DefaultJSONProvider, so payloads look identical:
+    # dates as HTTP dates, Decimal / UUID as strings.
+    if isinstance(o, date):
+        return _http_date(o)
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    DefaultJSONProvider with orjson doing the encoding.
+
+    datetime/date/time are passed through to _orjson_default (orjson would
+    otherwise write ISO strings), keys are sorted like Flask's default and
+    non-str keys are stringified like the stdlib encoder. Anything orjson
+    refuses (ints over 64 bits, ...) or calls with custom json.dumps
+    arguments go through the stdlib path. Decoding stays stdlib.
+    Output is UTF-8 rather than \\u-escaped ASCII; both are the same JSON.
+    """
+
+    def _options(self, indent: bool = False) -> int:
+        opts = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            opts |= orjson.OPT_SORT_KEYS
+        if indent:
+            opts |= orjson.OPT_INDENT_2
+        return opts
+
+    def dumps_bytes(self, obj, indent: bool = False) -> bytes | None:
+        try:
+            return orjson.dumps(obj, default=_orjson_default, option=self._options(indent))
+        except TypeError:
+            return None
+
+    def dumps(self, obj, **kwargs) -> str:
+        if not kwargs:
+            out = self.dumps_bytes(obj)
+            if out is not None:
+                return out.decode("utf-8")
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        out = self.dumps_bytes(obj, indent)
+        if out is None:
+            return super().response(obj)
+        return self._app.response_class(out + b"\n", mimetype=self.mimetype)
+
+
+def init_json_provider(app) -> str:
+    """Install the configured provider on `app`; returns the name in use."""
+    if JSON_PROVIDER in ("auto", "orjson") and orjson is not None:
+        app.json = OrjsonProvider(app)
+        return "orjson"
+    if JSON_PROVIDER == "orjson":
+        print("JSON_PROVIDER=orjson but orjson is not installed; using stdlib")
+    return "stdlib"
@@ -0,0 +1,105 @@
+import os
+
+from utils.tracker_dates import datetime_range_sql
+
+# Shared paging / filtering / child-row loading for the QC history endpoints
+# (/qc_rework/view_all_qc_history, /qc_history_user/view_qc_history_user_based).
+#
+# Pages are keyset on qc_records.id DESC: next_cursor is the last id of the
+# page and the next page asks for qr.id < cursor, so deep pages cost the same
+# as the first one. Rework / correction rows are only loaded for the ids of
+# the current page, QC_HISTORY_CHUNK_SIZE ids per IN list.
+QC_HISTORY_PAGE_SIZE = int(os.getenv("QC_HISTORY_PAGE_SIZE", "100"))
+QC_HISTORY_MAX_PAGE_SIZE = int(os.getenv("QC_HISTORY_MAX_PAGE_SIZE", "500"))
+QC_HISTORY_CHUNK_SIZE = int(os.getenv("QC_HISTORY_CHUNK_SIZE", "500"))
+
+
+def qc_page_size(data: dict) -> int:
+    """page_size from the request body, defaulted and capped."""
+    try:
+        size = int(data.get("page_size") or QC_HISTORY_PAGE_SIZE)
+    except (TypeError, ValueError):
+        raise ValueError("page_size must be an integer")
+    return max(1, min(size, QC_HISTORY_MAX_PAGE_SIZE))
+
+
+def qc_history_filters_sql(data: dict, params: list) -> str:
+    """
+    Optional body filters -> ' AND ...' fragment (extends params).
+
+      date_from / date_to : qr.date_of_file_submission (date-only date_to is inclusive)
+      project_id, task_id, agent_id : on the tracker the QC record belongs to
+      cursor              : next_cursor of the previous page
+    """
+    sql = datetime_range_sql(
+        params, "qr.date_of_file_submission", data.get("date_from"), data.get("date_to")
+    )
+
+    for key, col in (("project_id", "twt.project_id"), ("task_id", "twt.task_id"), ("agent_id", "twt.user_id")):
+        val = data.get(key)
+        if val in (None, ""):
+            continue
+        try:
+            params.append(int(val))
+        except (TypeError, ValueError):
+            raise ValueError(f"{key} must be an integer")
+        sql += f" AND {col} = %s"
+
+    cursor_token = data.get("cursor")
+    if cursor_token not in (None, ""):
+        try:
+            params.append(int(cursor_token))
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+        sql += " AND qr.id < %s"
+
+    return sql
+
+
+def split_page(rows: list, page_size: int, id_key: str) -> tuple[list, bool, int | None]:
+    """Rows fetched with LIMIT page_size + 1 -> (page, has_more, next_cursor)."""
+    has_more = len(rows) > page_size
+    page = rows[:page_size]
+    next_cursor = page[-1][id_key] if has_more and page else None
+    return page, has_more, next_cursor
+
+
+def _chunks(ids: list, size: int):
+    for i in range(0, len(ids), size):
+        yield ids[i:i + size]
+
+
+def fetch_qc_children(cursor, qc_record_ids) -> tuple[dict, dict]:
+    """
+    ({qc_record_id: [rework rows]}, {qc_record_id: [correction rows]}) for the
+    given ids, newest first, with review_status added like the old queries.
+    """
+    ids = sorted({int(i) for i in qc_record_ids if i is not None})
+    rework_map, correction_map = {}, {}
+
+    for chunk in _chunks(ids, QC_HISTORY_CHUNK_SIZE):
+        placeholders = ",".join(["%s"] * len(chunk))
+
+        cursor.execute(f"""
+            SELECT
+                *,
+                rework_status as review_status
+            FROM qc_rework_history
+            WHERE qc_record_id IN ({placeholders})
+            ORDER BY qc_rework_id DESC
+        """, tuple(chunk))
+        for r in cursor.fetchall():
+            rework_map.setdefault(r["qc_record_id"], []).append(r)
+
+        cursor.execute(f"""
+            SELECT
+                *,
+                correction_status as review_status
+            FROM qc_correction_history
+            WHERE qc_record_id IN ({placeholders})
+            ORDER BY qc_correction_id DESC
+        """, tuple(chunk))
+        for c in cursor.fetchall():
+            correction_map.setdefault(c["qc_record_id"], []).append(c)
+
+    return rework_map, correction_map
@@ -0,0 +1,216 @@
+import json
+
+# Normalized copy of tfs_user.project_manager_id / asst_manager_id / qa_id.
+# Those columns hold JSON ('[12,13]', '["12"]') or bracketed CSV strings, so
+# matching on them means string surgery on every row. user_reporting_edge has
+# one row per (manager, user, relation) and is indexed both ways:
+#
+#   PRIMARY KEY (manager_id, relation, user_id)   -> "who reports to me"
+#   KEY idx_ure_user (user_id, relation)          -> "who do I report to"
+#
+# The JSON columns stay the source of truth for reads/UI; writes to them go
+# through sync_user_edges() in the same transaction (see "table changes List.txt",
+# backfill with backfill_user_reporting_edge.py).
+EDGE_TABLE = "user_reporting_edge"
+
+# relation -> tfs_user column
+RELATION_COLUMNS = {
+    "project_manager": "project_manager_id",
+    "asst_manager": "asst_manager_id",
+    "qa": "qa_id",
+}
+
+# role_name -> relations that make a user visible to that role
+ROLE_RELATIONS = {
+    "qa": ("qa",),
+    "assistant manager": ("asst_manager",),
+    "project manager": ("project_manager",),
+    "manager": ("project_manager",),
+}
+
+
+def parse_id_list(val) -> list[int]:
+    """
+    Manager column value -> list of ints (order kept, duplicates removed).
+    Handles: None, '', 12, '12', '[12,13]', '["12","13"]', '12,13', '[12, 13]'
+    """
+    if val is None:
+        return []
+    if isinstance(val, bool):
+        return []
+    if isinstance(val, int):
+        return [val]
+
+    if isinstance(val, (bytes, bytearray)):
+        val = val.decode("utf-8", "ignore")
+    items = val
+    if isinstance(val, str):
+        s = val.strip()
+        if not s:
+            return []
+        try:
+            items = json.loads(s)
+        except Exception:
+            items = s.strip("[]").replace('"', "").split(",")
+
+    if not isinstance(items, (list, tuple)):
+        items = [items]
+
+    out = []
+    for x in items:
+        s = str(x).strip().strip('"')
+        if s.isdigit() and int(s) not in out:
+            out.append(int(s))
+    return out
+
+
+def sync_user_edges(cursor, user_id: int, values: dict) -> None:
+    """
+    Replace the edges of `user_id` for the relations present in `values`.
+
+    values: {relation: raw column value}, e.g. {"qa": '[12]'}.
+    Relations not in `values` are left alone (partial /user/update_user).
+    Runs on the caller's cursor, inside the caller's transaction.
+    """
+    relations = [r for r in values if r in RELATION_COLUMNS]
+    if not relations:
+        return
+
+    placeholders = ",".join(["%s"] * len(relations))
+    cursor.execute(
+        f"DELETE FROM {EDGE_TABLE} WHERE user_id = %s AND relation IN ({placeholders})",
+        (int(user_id), *relations),
+    )
+
+    rows = [
+        (manager_id, int(user_id), relation)
+        for relation in relations
+        for manager_id in parse_id_list(values[relation])
+    ]
+    if rows:
+        cursor.executemany(
+            f"INSERT IGNORE INTO {EDGE_TABLE} (manager_id, user_id, relation) VALUES (%s, %s, %s)",
+            rows,
+        )
+
+
+def sync_user_edges_from_columns(cursor, user_id: int, columns: dict) -> None:
+    """Same as sync_user_edges, keyed by tfs_user column name instead of relation."""
+    values = {
+        relation: columns[col]
+        for relation, col in RELATION_COLUMNS.items()
+        if col in columns
+    }
+    sync_user_edges(cursor, user_id, values)
+
+
+def relations_for_role(role: str) -> tuple:
+    return ROLE_RELATIONS.get((role or "").strip().lower(), ())
+
+
+def reports_to_sql(params: list, manager_id: int, relations=None, user_col: str = "u.user_id",
+                   include_deleted: bool = False) -> str:
+    """
+    `<user_col> IN (users reporting to manager_id)` as an index lookup.
+
+    relations=None matches any relation. Deleted users (is_delete=0) are
+    excluded, like the old tfs_user scans, unless include_deleted (history
+    views). Extends params, returns the SQL.
+    """
+    if include_deleted:
+        sql = f"""{user_col} IN (
+        SELECT ure.user_id
+        FROM {EDGE_TABLE} ure
+        WHERE ure.manager_id = %s"""
+    else:
+        sql = f"""{user_col} IN (
+        SELECT ure.user_id
+        FROM {EDGE_TABLE} ure
+        JOIN tfs_user ure_u ON ure_u.user_id = ure.user_id AND ure_u.is_delete = 1
+        WHERE ure.manager_id = %s"""
+    params.append(int(manager_id))
+
+    if relations:
+        sql += f" AND ure.relation IN ({','.join(['%s'] * len(relations))})"
+        params.extend(relations)
+
+    return sql + "\n    )"
+
+
+def get_reporting_user_ids(cursor, manager_id: int, relations=None, active_only: bool = True) -> list[int]:
+    """User ids reporting to manager_id (any relation when relations is None)."""
+    params: list = [int(manager_id)]
+    sql = f"""
+        SELECT DISTINCT ure.user_id
+        FROM {EDGE_TABLE} ure
+        JOIN tfs_user tu ON tu.user_id = ure.user_id
+        WHERE ure.manager_id = %s AND tu.is_delete = 1
+    """
+    if active_only:
+        sql += " AND tu.is_active = 1"
+    if relations:
+        sql += f" AND ure.relation IN ({','.join(['%s'] * len(relations))})"
+        params.extend(relations)
+
+    cursor.execute(sql, tuple(params))
+    rows = cursor.fetchall() or []
+    out = []
+    for r in rows:
+        uid = r["user_id"] if isinstance(r, dict) else r[0]
+        if uid is not None:
+            out.append(int(uid))
+    return out
+
+
+def rebuild_all_edges(cursor) -> int:
+    """Rebuild the whole table from tfs_user (backfill / repair). Returns edge count."""
+    cols = ", ".join(RELATION_COLUMNS.values())
+    cursor.execute(f"SELECT user_id, {cols} FROM tfs_user")
+    users = cursor.fetchall() or []
+
+    rows = []
+    for u in users:
+        if not isinstance(u, dict):
+            u = dict(zip(["user_id", *RELATION_COLUMNS.values()], u))
+        for relation, col in RELATION_COLUMNS.items():
+            for manager_id in parse_id_list(u.get(col)):
+                rows.append((manager_id, int(u["user_id"]), relation))
+
+    cursor.execute(f"DELETE FROM {EDGE_TABLE}")
+    for i in range(0, len(rows), 1000):
+        cursor.executemany(
+            f"INSERT IGNORE INTO {EDGE_TABLE} (manager_id, user_id, relation) VALUES (%s, %s, %s)",
+            rows[i:i + 1000],
+        )
+    return len(rows)
+
+
+def get_manager_map(cursor, user_ids, relation: str) -> dict:
+    """
+    {user_id: [{"user_id", "user_name", "user_email"}, ...]} for the managers
+    of each given user under `relation`, in one indexed query (idx_ure_user).
+    Users without managers are absent from the map.
+    """
+    ids = sorted({int(u) for u in user_ids if u is not None})
+    if not ids:
+        return {}
+
+    placeholders = ",".join(["%s"] * len(ids))
+    cursor.execute(
+        f"""
+        SELECT ure.user_id AS subordinate_id, m.user_id, m.user_name, m.user_email
+        FROM {EDGE_TABLE} ure
+        JOIN tfs_user m ON m.user_id = ure.manager_id
+        WHERE ure.relation = %s AND ure.user_id IN ({placeholders})
+        ORDER BY ure.user_id, m.user_id
+        """,
+        (relation, *ids),
+    )
+    out = {}
+    for r in cursor.fetchall() or []:
+        out.setdefault(int(r["subordinate_id"]), []).append({
+            "user_id": r["user_id"],
+            "user_name": r["user_name"],
+            "user_email": r["user_email"],
+        })
+    return out
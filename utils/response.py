@@ -1,4 +1,6 @@
-from flask import jsonify
+from flask import jsonify, request, Response
+import hashlib
+from datetime import datetime, timezone
 
 def api_response(status, message, data=None):
     response = {
@@ -9,3 +11,119 @@ def api_response(status, message, data=None):
         response["data"] = data
 
     return jsonify(response), status
+
+
+def body_etag(body: bytes) -> str:
+    """Content hash of a serialized response body (unquoted ETag value)."""
+    return hashlib.md5(body, usedforsecurity=False).hexdigest()
+
+
+def etag_json_response(body: bytes, etag: str, status: int = 200):
+    """
+    Pre-serialized JSON body with an ETag; 304 (no body) when the client's
+    If-None-Match already has it.
+    """
+    if request.if_none_match and request.if_none_match.contains_weak(etag):
+        resp = Response(status=304)
+    else:
+        resp = Response(body, status=status, mimetype="application/json")
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
+def data_version(cursor, tables: dict) -> tuple[tuple, datetime | None]:
+    """
+    Cheap version of the rows behind a list endpoint, in one round-trip.
+
+    tables: {table_name: timestamp column, tuple of columns, or None}. Per
+    table: COUNT(*) and
+      - timestamp column: MAX(<column>) - any insert, hard delete or update
+        that stamps the column changes the version
+      - tuple of columns: a checksum of those columns over every row, for
+        small lookup tables without a timestamp (a rename changes it too)
+    Returns (version tuple, newest timestamp or None). The timestamp is None
+    unless every table has a timestamp column, since If-Modified-Since could
+    not see a change in the others. Table/column names are code constants.
+    """
+    parts = []
+    for table, ts_col in tables.items():
+        parts.append(f"(SELECT COUNT(*) FROM {table})")
+        if isinstance(ts_col, (tuple, list)):
+            cols = ", ".join(ts_col)
+            parts.append(f"(SELECT COALESCE(BIT_XOR(CRC32(CONCAT_WS('|', {cols}))), 0) FROM {table})")
+        elif ts_col:
+            parts.append(f"(SELECT MAX({ts_col}) FROM {table})")
+    cursor.execute("SELECT " + ", ".join(parts))
+    row = cursor.fetchone()
+    values = tuple(row.values()) if isinstance(row, dict) else tuple(row or ())
+
+    last_modified = None
+    if not all(isinstance(c, str) and c for c in tables.values()):
+        return tuple(str(v) for v in values), None
+    for v in values:
+        if isinstance(v, str):
+            try:
+                v = datetime.strptime(v[:19], "%Y-%m-%d %H:%M:%S")
+            except ValueError:
+                continue
+        if isinstance(v, datetime) and (last_modified is None or v > last_modified):
+            last_modified = v
+    return tuple(str(v) for v in values), last_modified
+
+
+class ListValidators:
+    """
+    ETag / Last-Modified of a list endpoint's current data, known before the
+    list itself is queried:
+
+        validators = list_validators(cursor, {"project": "updated_date"}, scope)
+        if validators.not_modified():
+            return validators.not_modified_response()
+        ...
+        return validators.apply(api_response(200, "...", result))
+    """
+
+    __slots__ = ("etag", "last_modified")
+
+    def __init__(self, etag: str, last_modified: datetime | None):
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def not_modified(self) -> bool:
+        """If-None-Match wins; If-Modified-Since is only used when it is absent."""
+        if request.if_none_match:
+            return request.if_none_match.contains_weak(self.etag)
+        if request.if_modified_since and self.last_modified is not None:
+            return self.last_modified <= request.if_modified_since
+        return False
+
+    def _stamp(self, resp):
+        resp.set_etag(self.etag)
+        if self.last_modified is not None:
+            resp.last_modified = self.last_modified
+        resp.headers["Cache-Control"] = "no-cache"
+        return resp
+
+    def not_modified_response(self):
+        return self._stamp(Response(status=304)), 304
+
+    def apply(self, result):
+        """Adds the validators to an api_response(...) tuple when it is a 200."""
+        resp, status = result
+        if status == 200:
+            self._stamp(resp)
+        return resp, status
+
+
+def list_validators(cursor, tables: dict, scope=None) -> ListValidators:
+    """
+    Validators from data_version(tables) plus `scope` - whatever else the
+    payload depends on (request filters, logged-in user, month ...).
+    """
+    version, last_modified = data_version(cursor, tables)
+    etag = body_etag(repr((version, scope)).encode())
+    if last_modified is not None:
+        # column values are server-local time
+        last_modified = last_modified.replace(microsecond=0).astimezone(timezone.utc)
+    return ListValidators(etag, last_modified)
@@ -0,0 +1,99 @@
+import threading
+from types import MappingProxyType
+
+from config import get_db_pool
+
+
+class SchemaCapabilities:
+    """
+    Immutable snapshot of the current database's tables and columns.
+
+    Built from ONE INFORMATION_SCHEMA.COLUMNS query; lookups afterwards are
+    plain dict/set membership, so routes can ask "does tfs_user have X" on the
+    hot path for free. Names are compared lower-case.
+    """
+
+    __slots__ = ("_tables",)
+
+    def __init__(self, tables: dict):
+        self._tables = MappingProxyType({
+            t.lower(): frozenset(c.lower() for c in cols)
+            for t, cols in tables.items()
+        })
+
+    def has_table(self, table: str) -> bool:
+        return table.lower() in self._tables
+
+    def has_column(self, table: str, column: str) -> bool:
+        return column.lower() in self._tables.get(table.lower(), frozenset())
+
+    def columns(self, table: str) -> frozenset:
+        return self._tables.get(table.lower(), frozenset())
+
+    def counts(self) -> dict:
+        """Table / column totals only (safe to expose on /health/schema)."""
+        return {"tables": len(self._tables), "columns": sum(len(c) for c in self._tables.values())}
+
+    def as_dict(self) -> dict:
+        return {t: sorted(cols) for t, cols in sorted(self._tables.items())}
+
+
+class SchemaRegistry:
+    """
+    Process-wide holder of the current SchemaCapabilities.
+
+    Loaded lazily on first use; reload() swaps in a fresh
+    snapshot after a migration. Readers never see a half-built snapshot.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._caps = None
+
+    def get(self) -> SchemaCapabilities:
+        caps = self._caps
+        if caps is not None:
+            return caps
+        with self._lock:
+            if self._caps is None:
+                self._caps = self._load()
+            return self._caps
+
+    def reload(self) -> SchemaCapabilities:
+        caps = self._load()
+        with self._lock:
+            self._caps = caps
+        return caps
+
+    @staticmethod
+    def _load() -> SchemaCapabilities:
+        # straight from the pool: a request-scoped connection would be closed under the caller
+        conn = get_db_pool().connect()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                """
+                SELECT TABLE_NAME, COLUMN_NAME
+                FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE()
+                """
+            )
+            tables = {}
+            for table_name, column_name in cursor.fetchall() or []:
+                tables.setdefault(table_name, set()).add(column_name)
+            return SchemaCapabilities(tables)
+        finally:
+            cursor.close()
+            conn.close()
+
+
+schema_registry = SchemaRegistry()
+
+
+def get_schema() -> SchemaCapabilities:
+    return schema_registry.get()
+
+
+def reload_schema() -> SchemaCapabilities:
+    """Reload hook: call after running a migration (or an admin hits POST /health/schema/reload)."""
+    return schema_registry.reload()
@@ -0,0 +1,148 @@
+from datetime import date, datetime, timedelta
+
+# task_work_tracker.date_time is TEXT like "YYYY-MM-DD HH:MM:SS".
+# date_time_dt is its STORED generated DATETIME copy (see "table changes List.txt")
+# and is the column covered by (user_id, date_time_dt) / (project_id, date_time_dt).
+# Filter on it with plain range predicates only - wrapping it in DATE()/YEAR()/
+# DATE_FORMAT() makes MySQL scan the whole table again.
+TRACKER_DT_COL = "date_time_dt"
+
+
+def tracker_dt(alias: str = "twt") -> str:
+    return f"{alias}.{TRACKER_DT_COL}"
+
+
+def _parse_bound(val):
+    """'YYYY-MM-DD' -> (datetime, True) / 'YYYY-MM-DD HH:MM:SS' -> (datetime, False) / else None."""
+    if val is None:
+        return None
+    s = str(val).strip()
+    for fmt, date_only in (("%Y-%m-%d", True), ("%Y-%m-%d %H:%M:%S", False), ("%Y-%m-%d %H:%M", False)):
+        try:
+            return datetime.strptime(s, fmt), date_only
+        except ValueError:
+            continue
+    return None
+
+
+def tracker_work_date(value) -> date | None:
+    """task_work_tracker.date_time ('YYYY-MM-DD HH:MM:SS' text or datetime) -> date."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value).strip()[:10], "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def _fmt(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def month_bounds(year: int, month: int) -> tuple[datetime, datetime]:
+    """First instant of the month and first instant of the next month."""
+    start = datetime(int(year), int(month), 1)
+    next_start = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start, next_start
+
+
+def datetime_range_sql(params: list, col: str, date_from=None, date_to=None) -> str:
+    """
+    Half-open range on an indexed DATETIME column:
+        col >= date_from AND col < date_to_exclusive
+
+    - date-only date_to ('2026-03-31') includes the whole day
+    - date_to with a time keeps the old inclusive '<=' meaning
+    - unparseable values are passed through as before (>= / <=)
+    Returns the SQL fragment (starting with ' AND') and extends params.
+    """
+    sql = ""
+
+    if date_from:
+        parsed = _parse_bound(date_from)
+        sql += f" AND {col} >= %s"
+        params.append(_fmt(parsed[0]) if parsed else date_from)
+
+    if date_to:
+        parsed = _parse_bound(date_to)
+        if parsed:
+            dt, date_only = parsed
+            upper = dt + (timedelta(days=1) if date_only else timedelta(seconds=1))
+            sql += f" AND {col} < %s"
+            params.append(_fmt(upper))
+        else:
+            sql += f" AND {col} <= %s"
+            params.append(date_to)
+
+    return sql
+
+
+def tracker_range_sql(params: list, date_from=None, date_to=None, alias: str = "twt") -> str:
+    """datetime_range_sql on task_work_tracker's indexed date_time_dt."""
+    return datetime_range_sql(params, tracker_dt(alias), date_from, date_to)
+
+
+def tracker_day_sql(params: list, day, alias: str = "twt") -> str:
+    """Replaces DATE(twt.date_time) = %s."""
+    day = str(day).strip()[:10]
+    return tracker_range_sql(params, day, day, alias)
+
+
+def tracker_month_sql(params: list, year: int, month: int, alias: str = "twt") -> str:
+    """Replaces YEAR(...)=%s AND MONTH(...)=%s / DATE_FORMAT(..., '%b%Y')=%s."""
+    start, next_start = month_bounds(year, month)
+    col = tracker_dt(alias)
+    params.extend([_fmt(start), _fmt(next_start)])
+    return f" AND {col} >= %s AND {col} < %s"
+
+
+def date_month_sql(params: list, col: str, year: int, month: int) -> str:
+    """Month filter on a DATE column (e.g. temp_qc.date)."""
+    start, next_start = month_bounds(year, month)
+    params.extend([start.date(), next_start.date()])
+    return f" AND {col} >= %s AND {col} < %s"
+
+
+# user_monthly_tracker / project_monthly_tracker.month_year are 'JAN2026' /
+# 'Jan2026' strings; month_key is their STORED generated yyyymm integer
+# (see "table changes List.txt"), indexed with user_id / project_id.
+_MONTH_ABBRS = ("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC")
+
+
+def month_key(value) -> int | None:
+    """
+    yyyymm for 'JAN2026' / 'Jan2026' / 'jan2026' / '2026-01' / '202601' /
+    202601 / date / datetime; None when it cannot be read.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (date, datetime)):
+        return value.year * 100 + value.month
+    s = str(value).strip()
+    if len(s) == 7 and s[:3].upper() in _MONTH_ABBRS and s[3:].isdigit():
+        return int(s[3:]) * 100 + _MONTH_ABBRS.index(s[:3].upper()) + 1
+    if len(s) == 7 and s[4] == "-" and s[:4].isdigit() and s[5:].isdigit():
+        s = s[:4] + s[5:]
+    if len(s) == 6 and s.isdigit() and 1 <= int(s[4:]) <= 12:
+        return int(s)
+    return None
+
+
+def month_year_label(key: int, upper: bool = True) -> str:
+    """202601 -> 'JAN2026' (upper) / 'Jan2026'."""
+    abbr = _MONTH_ABBRS[key % 100 - 1]
+    return f"{abbr if upper else abbr.title()}{key // 100}"
+
+
+def month_key_sql(month_year_col: str) -> str:
+    """SQL twin of month_key() for 'MONYYYY' columns (the generated month_key expression)."""
+    col = f"TRIM({month_year_col})"
+    field = f"FIELD(UPPER(LEFT({col}, 3)), {', '.join(repr(m) for m in _MONTH_ABBRS)})"
+    return (
+        f"CASE WHEN CHAR_LENGTH({col}) = 7 AND RIGHT({col}, 4) REGEXP '^[0-9]{{4}}$' AND {field} > 0 "
+        f"THEN CAST(RIGHT({col}, 4) AS UNSIGNED) * 100 + {field} END"
+    )
@@ -0,0 +1,171 @@
+from datetime import datetime, timedelta
+
+from utils.tracker_dates import _parse_bound, month_bounds, tracker_dt, tracker_work_date
+
+# Per day / user / project / task / shift totals of the ACTIVE (is_active=1)
+# trackers, read by /tracker/view_daily, /dashboard/filter,
+# /project_monthly_tracker/list and /user_monthly_tracker/list instead of
+# scanning task_work_tracker (see "table changes List.txt").
+#
+#   tracker_count          number of trackers
+#   production             SUM(production)
+#   tenure_billable_hours  SUM(production / tenure_target)
+#   billable_hours         SUM(billable_hours)         } numeric text values only,
+#   actual_billable_hours  SUM(actual_billable_hours)  } anything else counts as 0
+#   non_numeric_billable   trackers whose billable_hours is set but not a number
+#                          (reported by /dashboard/filter, see numeric_sum_sql)
+#
+# Rows are recomputed per (user_id, work_date) on every tracker write, never
+# incremented. task_id is stored as 0 and shift as '' when the tracker has
+# none (both are part of the key). The worked-day weight comes from temp_qc
+# at read time (DAY_WEIGHT_SQL), so QC writes never touch this table.
+FACT_TABLE = "tracker_daily_fact"
+
+_NUMERIC_RE = "'^[0-9]+(\\\\.[0-9]+)?$'"
+
+# worked-day weight of a temp_qc row (alias q): 0.5 for a 4.5h day, 1 for any
+# other assigned_hours > 0, else 0
+DAY_WEIGHT_SQL = """
+    CASE
+        WHEN q.assigned_hours = 4.5 THEN 0.5
+        WHEN q.assigned_hours > 0 THEN 1
+        ELSE 0
+    END
+"""
+
+
+def numeric_sum_sql(col: str) -> str:
+    """SUM of a TEXT column counting only plain numbers ('12', '1.5'); anything else is 0."""
+    return f"SUM(CASE WHEN {col} REGEXP {_NUMERIC_RE} THEN CAST({col} AS DECIMAL(12,2)) ELSE 0 END)"
+
+
+def non_numeric_count_sql(col: str) -> str:
+    """Rows numeric_sum_sql(col) counted as 0 although the column was set."""
+    return f"SUM(CASE WHEN TRIM({col}) <> '' AND {col} NOT REGEXP {_NUMERIC_RE} THEN 1 ELSE 0 END)"
+
+
+_FACT_COLUMNS = "(work_date, user_id, project_id, task_id, shift, tracker_count, production, " \
+                "tenure_billable_hours, billable_hours, actual_billable_hours, non_numeric_billable)"
+
+_FACT_MEASURES = f"""
+    COUNT(*),
+    COALESCE(SUM(twt.production), 0),
+    COALESCE(SUM(COALESCE(twt.production, 0) / NULLIF(twt.tenure_target, 0)), 0),
+    {numeric_sum_sql("twt.billable_hours")},
+    {numeric_sum_sql("twt.actual_billable_hours")},
+    {non_numeric_count_sql("twt.billable_hours")}
+"""
+
+
+def refresh_fact_day(cursor, user_id, work_date) -> None:
+    """Recompute the fact rows of one user for one day (all projects / tasks / shifts)."""
+    day = tracker_work_date(work_date)
+    if user_id is None or day is None:
+        return
+    start = datetime(day.year, day.month, day.day)
+    end = start + timedelta(days=1)
+
+    cursor.execute(
+        f"DELETE FROM {FACT_TABLE} WHERE user_id = %s AND work_date = %s",
+        (int(user_id), day),
+    )
+    cursor.execute(
+        f"""
+        INSERT INTO {FACT_TABLE} {_FACT_COLUMNS}
+        SELECT
+            %s,
+            twt.user_id,
+            twt.project_id,
+            COALESCE(twt.task_id, 0),
+            COALESCE(twt.shift, ''),
+            {_FACT_MEASURES}
+        FROM task_work_tracker twt
+        WHERE twt.user_id = %s
+          AND twt.is_active = 1
+          AND twt.project_id IS NOT NULL
+          AND {tracker_dt()} >= %s AND {tracker_dt()} < %s
+        GROUP BY twt.user_id, twt.project_id, COALESCE(twt.task_id, 0), COALESCE(twt.shift, '')
+        """,
+        (day, int(user_id), start, end),
+    )
+
+
+def refresh_fact_days(cursor, pairs) -> None:
+    """refresh_fact_day for each distinct (user_id, date_time/work_date) pair."""
+    seen = set()
+    for user_id, when in pairs:
+        day = tracker_work_date(when)
+        if user_id is None or day is None or (int(user_id), day) in seen:
+            continue
+        seen.add((int(user_id), day))
+        refresh_fact_day(cursor, user_id, day)
+
+
+def rebuild_facts(cursor, date_from=None, date_to=None) -> int:
+    """
+    Rebuild the fact table from task_work_tracker, for all history or for
+    work dates in [date_from, date_to]. Returns rows written.
+    """
+    where = "WHERE twt.is_active = 1"
+    delete_where = ""
+    params, delete_params = [], []
+    if date_from:
+        d = tracker_work_date(date_from)
+        where += f" AND {tracker_dt()} >= %s"
+        params.append(datetime(d.year, d.month, d.day))
+        delete_where += " AND work_date >= %s"
+        delete_params.append(d)
+    if date_to:
+        d = tracker_work_date(date_to)
+        where += f" AND {tracker_dt()} < %s"
+        params.append(datetime(d.year, d.month, d.day) + timedelta(days=1))
+        delete_where += " AND work_date <= %s"
+        delete_params.append(d)
+
+    cursor.execute(f"DELETE FROM {FACT_TABLE} WHERE 1=1{delete_where}", tuple(delete_params))
+    cursor.execute(
+        f"""
+        INSERT INTO {FACT_TABLE} {_FACT_COLUMNS}
+        SELECT
+            DATE({tracker_dt()}) AS work_date,
+            twt.user_id,
+            twt.project_id,
+            COALESCE(twt.task_id, 0) AS task_key,
+            COALESCE(twt.shift, '') AS shift_key,
+            {_FACT_MEASURES}
+        FROM task_work_tracker twt
+        {where} AND twt.user_id IS NOT NULL AND twt.project_id IS NOT NULL AND {tracker_dt()} IS NOT NULL
+        GROUP BY DATE({tracker_dt()}), twt.user_id, twt.project_id, COALESCE(twt.task_id, 0), COALESCE(twt.shift, '')
+        """,
+        tuple(params),
+    )
+    return cursor.rowcount
+
+
+def fact_date_filters_ok(*values) -> bool:
+    """True when every given date filter is a plain 'YYYY-MM-DD' (facts have no time part)."""
+    for v in values:
+        if v:
+            parsed = _parse_bound(v)
+            if not parsed or not parsed[1]:
+                return False
+    return True
+
+
+def fact_range_sql(params: list, date_from=None, date_to=None, alias: str = "f") -> str:
+    """tracker_range_sql for the fact table: inclusive work_date bounds ('YYYY-MM-DD')."""
+    sql = ""
+    if date_from:
+        sql += f" AND {alias}.work_date >= %s"
+        params.append(str(date_from).strip()[:10])
+    if date_to:
+        sql += f" AND {alias}.work_date <= %s"
+        params.append(str(date_to).strip()[:10])
+    return sql
+
+
+def fact_month_sql(params: list, year: int, month: int, alias: str = "f") -> str:
+    """tracker_month_sql for the fact table."""
+    start, next_start = month_bounds(year, month)
+    params.extend([start.date(), next_start.date()])
+    return f" AND {alias}.work_date >= %s AND {alias}.work_date < %s"
@@ -0,0 +1,209 @@
+import os
+import threading
+import time
+
+from utils.reporting_edges import EDGE_TABLE, relations_for_role
+
+# How long a resolved visibility set may be served from memory. Writes in this
+# process (/auth/user, /user/update_user, /user/delete_user) invalidate at once;
+# the TTL bounds staleness for writes made by other gunicorn workers.
+VISIBILITY_CACHE_TTL = int(os.getenv("VISIBILITY_CACHE_TTL", "60"))
+VISIBILITY_CACHE_MAX = int(os.getenv("VISIBILITY_CACHE_MAX", "5000"))
+
+
+class Visibility:
+    """
+    Who a logged-in user is and which users they can see.
+
+    edges: ((user_id, relation, is_active, is_delete), ...) for every user
+    reporting to this one, straight from user_reporting_edge. Endpoints differ
+    in which relations / deleted / inactive users count, so they pick with
+    user_ids() instead of each running their own hierarchy query.
+    """
+
+    __slots__ = ("user_id", "role", "role_id", "is_active", "agent_role_id", "edges")
+
+    def __init__(self, user_id, role, role_id, is_active, agent_role_id, edges):
+        self.user_id = int(user_id)
+        self.role = role
+        self.role_id = role_id
+        self.is_active = is_active
+        self.agent_role_id = agent_role_id
+        self.edges = tuple(edges)
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role in ("admin", "super admin")
+
+    def role_relations(self) -> tuple:
+        return relations_for_role(self.role)
+
+    def user_ids(self, relations=None, include_self: bool = True,
+                 active_only: bool = False, include_deleted: bool = False) -> list[int]:
+        """Sorted ids reporting to this user (any relation when relations is None)."""
+        out = set()
+        for user_id, relation, is_active, is_delete in self.edges:
+            if relations is not None and relation not in relations:
+                continue
+            if not include_deleted and is_delete != 1:
+                continue
+            if active_only and is_active != 1:
+                continue
+            out.add(user_id)
+        if include_self:
+            out.add(self.user_id)
+        return sorted(out)
+
+    def as_role_context(self) -> dict:
+        """Shape returned by routes.tracker.get_role_context."""
+        return {
+            "user_role_id": self.role_id,
+            "user_role_name": self.role,
+            "agent_role_id": self.agent_role_id,
+        }
+
+
+class VisibilityCache:
+    """Thread-safe TTL cache of Visibility objects keyed by user_id."""
+
+    def __init__(self, ttl: int = 60, max_entries: int = 5000):
+        self.ttl = max(int(ttl), 0)
+        self.max_entries = max(int(max_entries), 1)
+        self._lock = threading.Lock()
+        self._data = {}  # user_id -> (expires_at, Visibility)
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, user_id: int):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(user_id)
+            if entry and entry[0] > now:
+                self.stats["hits"] += 1
+                return entry[1]
+            if entry:
+                del self._data[user_id]
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, user_id: int, value: Visibility) -> None:
+        if not self.ttl:
+            return
+        with self._lock:
+            if len(self._data) >= self.max_entries:
+                now = time.monotonic()
+                for k in [k for k, (exp, _) in self._data.items() if exp <= now]:
+                    del self._data[k]
+                if len(self._data) >= self.max_entries:
+                    self._data.clear()
+            self._data[user_id] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, user_id: int | None = None) -> None:
+        """
+        Drop cached entries. A user's row feeds both their own entry (role) and
+        their managers' entries (edges), so a targeted call also drops every
+        entry that lists them as a subordinate. It cannot see managers the user
+        was just *added* under - user writes call invalidate(None).
+        """
+        with self._lock:
+            self.stats["invalidations"] += 1
+            if user_id is None:
+                self._data.clear()
+                return
+            user_id = int(user_id)
+            stale = [
+                k for k, (_, vis) in self._data.items()
+                if k == user_id or any(e[0] == user_id for e in vis.edges)
+            ]
+            for k in stale:
+                del self._data[k]
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            out = dict(self.stats)
+            out["entries"] = len(self._data)
+        out["ttl"] = self.ttl
+        return out
+
+
+visibility_cache = VisibilityCache(ttl=VISIBILITY_CACHE_TTL, max_entries=VISIBILITY_CACHE_MAX)
+
+
+def _load_visibility(cursor, user_id: int) -> Visibility | None:
+    cursor.execute(
+        """
+        SELECT
+            u.role_id,
+            u.is_active,
+            LOWER(TRIM(r.role_name)) AS role_name,
+            (
+                SELECT ur2.role_id
+                FROM user_role ur2
+                WHERE LOWER(TRIM(ur2.role_name)) = 'agent'
+                LIMIT 1
+            ) AS agent_role_id
+        FROM tfs_user u
+        JOIN user_role r ON r.role_id = u.role_id
+        WHERE u.user_id = %s AND u.is_delete = 1
+        """,
+        (user_id,),
+    )
+    row = cursor.fetchone()
+    if not row:
+        return None
+
+    edges = ()
+    role = (row.get("role_name") or "").strip().lower()
+    if role not in ("admin", "super admin", "agent"):
+        cursor.execute(
+            f"""
+            SELECT ure.user_id, ure.relation, tu.is_active, tu.is_delete
+            FROM {EDGE_TABLE} ure
+            JOIN tfs_user tu ON tu.user_id = ure.user_id
+            WHERE ure.manager_id = %s
+            """,
+            (user_id,),
+        )
+        edges = [
+            (int(r["user_id"]), r["relation"], int(r["is_active"] or 0), int(r["is_delete"] or 0))
+            for r in (cursor.fetchall() or [])
+        ]
+
+    return Visibility(
+        user_id=user_id,
+        role=role,
+        role_id=row.get("role_id"),
+        is_active=int(row.get("is_active") or 0),
+        agent_role_id=row.get("agent_role_id"),
+        edges=edges,
+    )
+
+
+def get_visibility(cursor, logged_in_user_id) -> Visibility | None:
+    """
+    Role + reporting edges for logged_in_user_id, cached for VISIBILITY_CACHE_TTL
+    seconds. None when the user does not exist (or is deleted). `cursor` must
+    be a dictionary cursor; it is only used on a cache miss.
+    """
+    user_id = int(logged_in_user_id)
+    vis = visibility_cache.get(user_id)
+    if vis is None:
+        vis = _load_visibility(cursor, user_id)
+        if vis is not None:
+            visibility_cache.put(user_id, vis)
+    return vis
+
+
+def invalidate_visibility(user_id=None) -> None:
+    visibility_cache.invalidate(user_id)
+
+
+def get_visibility_stats() -> dict:
+    return visibility_cache.get_stats()
+
+
+def in_clause_int(ids, params: list) -> str:
+    """`IN (%s,...)` for a list of ints; `IN (NULL)` when empty (matches nothing)."""
+    if not ids:
+        return "IN (NULL)"
+    params.extend(int(i) for i in ids)
+    return f"IN ({','.join(['%s'] * len(ids))})"